@@ -0,0 +1,30 @@
+"""add memory summary to interview_sessions
+
+Revision ID: 8f3c1d2a9b47
+Revises: 6cb2e0fe5db5
+Create Date: 2026-10-19 10:12:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3c1d2a9b47'
+down_revision: Union[str, None] = '6cb2e0fe5db5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('interview_sessions', sa.Column('memory_summary', sa.Text(), nullable=True))
+    op.add_column('interview_sessions', sa.Column('summarized_through_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('interview_sessions', 'summarized_through_id')
+    op.drop_column('interview_sessions', 'memory_summary')
@@ -0,0 +1,38 @@
+"""add job postings listing indexes
+
+Revision ID: a3d6f2b8c910
+Revises: f5c3d8e07a41
+Create Date: 2026-10-19 17:02:14.305518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d6f2b8c910'
+down_revision: Union[str, None] = 'f5c3d8e07a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_job_postings_job_posting_date', 'job_postings', ['job_posting_date'], unique=False)
+    op.create_index('ix_job_postings_work_type_date', 'job_postings', ['work_type', 'job_posting_date'], unique=False)
+    op.create_index('ix_job_postings_country_date', 'job_postings', ['country', 'job_posting_date'], unique=False)
+    op.create_index('ix_job_postings_location_date', 'job_postings', ['location', 'job_posting_date'], unique=False)
+    op.create_index('ix_job_postings_company_date', 'job_postings', ['company', 'job_posting_date'], unique=False)
+    # Planner statistics, so multi-filter queries pick the most selective index
+    op.execute('ANALYZE job_postings')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_postings_company_date', table_name='job_postings')
+    op.drop_index('ix_job_postings_location_date', table_name='job_postings')
+    op.drop_index('ix_job_postings_country_date', table_name='job_postings')
+    op.drop_index('ix_job_postings_work_type_date', table_name='job_postings')
+    op.drop_index('ix_job_postings_job_posting_date', table_name='job_postings')
@@ -0,0 +1,28 @@
+"""add (session_id, id) index to interview_messages
+
+Revision ID: b7e2a4c19d05
+Revises: 8f3c1d2a9b47
+Create Date: 2026-10-19 11:02:17.334904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2a4c19d05'
+down_revision: Union[str, None] = '8f3c1d2a9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_interview_messages_session_id_id', 'interview_messages', ['session_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_interview_messages_session_id_id', table_name='interview_messages')
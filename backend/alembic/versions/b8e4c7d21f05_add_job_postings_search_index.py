@@ -0,0 +1,67 @@
+"""add job postings search index
+
+Revision ID: b8e4c7d21f05
+Revises: a3d6f2b8c910
+Create Date: 2026-10-19 18:21:47.119204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4c7d21f05'
+down_revision: Union[str, None] = 'a3d6f2b8c910'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Flattened skills (JSON list -> "a, b, c") for the row `{row}`
+FLAT_SKILLS = (
+    "CASE WHEN json_valid({row}.skills) "
+    "THEN (SELECT group_concat(value, ', ') FROM json_each({row}.skills)) "
+    "ELSE {row}.skills END"
+)
+FTS_INSERT = (
+    "INSERT INTO job_postings_fts (rowid, job_title, role, job_description, responsibilities, skills) "
+    "VALUES (new.id, new.job_title, new.role, new.job_description, new.responsibilities, "
+    + FLAT_SKILLS.format(row="new") + ");"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS job_postings_fts USING fts5("
+        "job_title, role, job_description, responsibilities, skills, "
+        "tokenize = 'porter unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS job_postings_fts_insert AFTER INSERT ON job_postings BEGIN "
+        + FTS_INSERT + " END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS job_postings_fts_update "
+        "AFTER UPDATE OF job_title, role, job_description, responsibilities, skills ON job_postings BEGIN "
+        "DELETE FROM job_postings_fts WHERE rowid = old.id; " + FTS_INSERT + " END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS job_postings_fts_delete AFTER DELETE ON job_postings BEGIN "
+        "DELETE FROM job_postings_fts WHERE rowid = old.id; END"
+    )
+    # Backfill existing postings, then merge the index into one segment
+    op.execute(
+        "INSERT INTO job_postings_fts (rowid, job_title, role, job_description, responsibilities, skills) "
+        "SELECT id, job_title, role, job_description, responsibilities, " + FLAT_SKILLS.format(row="job_postings")
+        + " FROM job_postings WHERE id NOT IN (SELECT rowid FROM job_postings_fts)"
+    )
+    op.execute("INSERT INTO job_postings_fts (job_postings_fts) VALUES ('optimize')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS job_postings_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS job_postings_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS job_postings_fts_insert")
+    op.execute("DROP TABLE IF EXISTS job_postings_fts")
@@ -0,0 +1,29 @@
+"""add sentiment_stats to interview_sessions
+
+Revision ID: c4f9e8a1d2b3
+Revises: b7e2a4c19d05
+Create Date: 2026-10-19 13:41:05.118230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f9e8a1d2b3'
+down_revision: Union[str, None] = 'b7e2a4c19d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Left NULL for existing sessions; they are rebuilt from messages on first write
+    op.add_column('interview_sessions', sa.Column('sentiment_stats', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('interview_sessions', 'sentiment_stats')
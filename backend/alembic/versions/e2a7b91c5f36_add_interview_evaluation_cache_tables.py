@@ -0,0 +1,51 @@
+"""add interview evaluation cache tables
+
+Revision ID: e2a7b91c5f36
+Revises: c4f9e8a1d2b3
+Create Date: 2026-10-19 14:27:52.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7b91c5f36'
+down_revision: Union[str, None] = 'c4f9e8a1d2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('interview_evaluations',
+    sa.Column('session_id', sa.String(), nullable=False),
+    sa.Column('last_message_id', sa.Integer(), nullable=True),
+    sa.Column('evaluation', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['interview_sessions.session_id'], ),
+    sa.PrimaryKeyConstraint('session_id')
+    )
+    op.create_table('interview_segment_critiques',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.String(), nullable=True),
+    sa.Column('start_message_id', sa.Integer(), nullable=True),
+    sa.Column('end_message_id', sa.Integer(), nullable=True),
+    sa.Column('digest', sa.String(), nullable=True),
+    sa.Column('critique', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['interview_sessions.session_id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_interview_segment_critiques_id'), 'interview_segment_critiques', ['id'], unique=False)
+    op.create_index('ix_interview_segment_critiques_session_start', 'interview_segment_critiques', ['session_id', 'start_message_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_interview_segment_critiques_session_start', table_name='interview_segment_critiques')
+    op.drop_index(op.f('ix_interview_segment_critiques_id'), table_name='interview_segment_critiques')
+    op.drop_table('interview_segment_critiques')
+    op.drop_table('interview_evaluations')
@@ -0,0 +1,35 @@
+"""add interview question banks
+
+Revision ID: f5c3d8e07a41
+Revises: e2a7b91c5f36
+Create Date: 2026-10-19 15:10:36.482915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c3d8e07a41'
+down_revision: Union[str, None] = 'e2a7b91c5f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('interview_question_banks',
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('job_digest', sa.String(), nullable=True),
+    sa.Column('openings', sa.JSON(), nullable=True),
+    sa.Column('follow_ups', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('job_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('interview_question_banks')
@@ -1,8 +1,14 @@
 # app/api/interview_train.py
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+import json
+import mimetypes
+import os
 
-from app.db.database import get_db
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import AsyncReadSessionLocal, AsyncSessionLocal, get_async_db, get_async_read_db
 from app.schemas.interview import (
     StartRequest,
     StartResponse,
@@ -12,29 +18,82 @@ from app.schemas.interview import (
     SentimentTimelineItem,
     SentimentSummary,
     EvaluationResponse,
+    AudioStatusResponse,
+    MessagePage,
+)
+from app.models.interview import InterviewMessage
+from app.services.audio import AUDIO_DIR, AudioDecodeError, AudioTooLargeError, transcribe_audio
+from app.services.tts_jobs import (
+    enqueue_reply_audio,
+    get_audio_status,
+    reply_audio_url,
+    wait_for_audio,
+    stream_reply_audio,
+    tts_cache,
 )
-from app.services.audio import transcribe_audio
+from app.services.inference import InferenceQueueFull
+from app.services.streaming_asr import StreamingTranscriber
+from app.services.unit_of_work import wait_for_writes
 from app.services.interview_service import (
     start_session,
     process_message,
+    message_page,
+    session_exists,
+    stream_message,
     evaluate_session,
+    session_sentiment_summary,
 )
 
 router = APIRouter(prefix="/interview", tags=["Interview"])
 
+MAX_AUDIO_WAIT_SECONDS = 30
+MAX_HISTORY_PAGE = 100
+
+
+def audio_status_for(m) -> str | None:
+    """TTS status for assistant turns; user turns have no audio."""
+    if m.role != "assistant" or not m.tts_url:
+        return None
+    return get_audio_status(m.id, m.tts_url)
+
+
+async def transcribe_upload(file: UploadFile) -> str:
+    try:
+        return await transcribe_audio(file)
+    except AudioTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except AudioDecodeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except InferenceQueueFull:
+        raise HTTPException(status_code=503, detail="Transcription is busy; try again shortly.")
+
+
+def to_message(m) -> Message:
+    return Message(
+        id=m.id,
+        role=m.role,
+        content=m.content,
+        modality=m.modality,
+        sentiment=SentimentResult.model_validate(m.sentiment) if m.sentiment else None,
+        tts_url=getattr(m, "tts_url", None),   # 🔊 history audio (assistant turns)
+        tts_status=audio_status_for(m),
+    )
+
 # ----------------------------
 # Start Session
 # ----------------------------
 @router.post("/start", response_model=StartResponse)
-async def start(data: StartRequest, db: Session = Depends(get_db)):
+async def start(data: StartRequest, db: AsyncSession = Depends(get_async_db)):
     session, first_msg = await start_session(db, data)
 
     first_message = Message(
+        id=first_msg.id,
         role=first_msg.role,
         content=first_msg.content,
         modality=first_msg.modality,
         sentiment=None,         # assistant greeting usually has no sentiment
         tts_url=getattr(first_msg, "tts_url", None),  # 🔊 expose audio to frontend
+        tts_status=audio_status_for(first_msg),       # usually "pending": poll /interview/audio/{id}
     )
 
     return StartResponse(
@@ -50,13 +109,19 @@ async def message(
     session_id: str = Form(...),
     text: str | None = Form(None),
     file: UploadFile | None = File(None),
-    db: Session = Depends(get_db),
+    since_message_id: int | None = Form(None),
+    db: AsyncSession = Depends(get_async_db),
 ):
+    """
+    chat_history holds only messages after `since_message_id` (just this
+    turn's messages when omitted); use GET /interview/sessions/{session_id}/messages
+    for the full history.
+    """
     if not text and not file:
         raise HTTPException(400, "Either text or audio file is required.")
 
     if file:
-        transcript = await transcribe_audio(file)
+        transcript = await transcribe_upload(file)
         user_text = transcript
         modality = "voice"
     else:
@@ -64,40 +129,286 @@ async def message(
         modality = "text"
 
     user_msg, assistant_msg, history = await process_message(
-        db, session_id, user_text, modality
+        db, session_id, user_text, modality, since_message_id=since_message_id
     )
 
     if user_msg is None or assistant_msg is None or history is None:
         raise HTTPException(status_code=404, detail="Session not found.")
 
-    msgs = [
-        Message(
-            role=m.role,
-            content=m.content,
-            modality=m.modality,
-            sentiment=SentimentResult.model_validate(m.sentiment) if m.sentiment else None,
-            tts_url=getattr(m, "tts_url", None),   # 🔊 history audio (assistant turns)
-        )
-        for m in history
-    ]
+    msgs = [to_message(m) for m in history]
 
     return ChatResponse(
         session_id=session_id,
         reply=Message(
+            id=assistant_msg.id,
             role="assistant",
             content=assistant_msg.content,
             modality="text",
             sentiment=None,
             tts_url=getattr(assistant_msg, "tts_url", None),  # 🔊 latest answer audio
+            tts_status=audio_status_for(assistant_msg),
         ),
         chat_history=msgs,
+        last_message_id=history[-1].id if history else assistant_msg.id,
+    )
+
+# ----------------------------
+# Paginated chat history
+# ----------------------------
+@router.get("/sessions/{session_id}/messages", response_model=MessagePage)
+async def history(
+    session_id: str,
+    before_id: int | None = Query(None, ge=1),
+    limit: int = Query(50, ge=1, le=MAX_HISTORY_PAGE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    if not await session_exists(db, session_id):
+        raise HTTPException(status_code=404, detail="Session not found.")
+
+    await wait_for_writes(session_id)
+    rows, has_more = await message_page(db, session_id, before_id, limit)
+    return MessagePage(
+        session_id=session_id,
+        messages=[to_message(m) for m in rows],
+        has_more=has_more,
+        next_before_id=rows[0].id if has_more and rows else None,
+    )
+
+# ----------------------------
+# Unified text + voice, reply streamed as server-sent events
+# ----------------------------
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/message/stream")
+async def message_stream(
+    session_id: str = Form(...),
+    text: str | None = Form(None),
+    file: UploadFile | None = File(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Same input as /message, but the reply arrives as `text/event-stream`:
+    `user` (echo of the candidate's message, not stored yet, so no id),
+    `token` (reply chunks), then `done` with `user_message_id`, the assistant
+    `message_id`, content, tts_url and tts_status once the turn is committed.
+    On failure, `error` carries `user_message_id` of the message stored alone.
+    """
+    if not text and not file:
+        raise HTTPException(400, "Either text or audio file is required.")
+
+    if not await session_exists(db, session_id):
+        raise HTTPException(status_code=404, detail="Session not found.")
+
+    if file:
+        user_text = await transcribe_upload(file)
+        modality = "voice"
+    else:
+        user_text = text
+        modality = "text"
+
+    async def events():
+        async for event, data in stream_message(session_id, user_text, modality):
+            yield _sse(event, data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
+# ----------------------------
+# Live voice over WebSocket
+# ----------------------------
+@router.websocket("/ws/{session_id}")
+async def voice_socket(websocket: WebSocket, session_id: str, sample_rate: int = Query(16000, ge=8000, le=48000)):
+    """
+    Client -> server: binary frames of 16-bit little-endian mono PCM at
+    `sample_rate`, plus optional JSON text frames {"type": "end"} to close
+    the utterance now.
+
+    Server -> client: {"type": "partial", "text"} while the candidate
+    speaks, {"type": "final", "text"} at end of utterance, then
+    {"type": "reply", "user_message", "reply"} once the turn is stored,
+    or {"type": "error", "detail"}.
+
+    Turns run as a task, one at a time, while frames keep flowing in; an
+    utterance that ends during a turn is taken next. A disconnect cancels
+    the turn in progress.
+    """
+    async with AsyncReadSessionLocal() as db:
+        exists = await session_exists(db, session_id)
+    if not exists:
+        await websocket.close(code=4404, reason="Session not found.")
+        return
+
+    await websocket.accept()
+    stt = StreamingTranscriber(sample_rate=sample_rate)
+    partial_task: asyncio.Task | None = None
+    turn_task: asyncio.Task | None = None
+    end_requested = False
+
+    async def send_partial():
+        try:
+            text = await stt.partial()
+            if text:
+                await websocket.send_json({"type": "partial", "text": text})
+        except Exception as e:
+            print(f"[ASR] Partial transcription failed for session {session_id}: {e}")
+
+    async def finish_turn() -> bool:
+        """Transcribe and answer one utterance; False once the session is gone."""
+        nonlocal partial_task, end_requested
+        if partial_task is not None:
+            await partial_task
+            partial_task = None
+
+        end_requested = False
+        try:
+            user_text = await stt.finish()
+        except Exception as e:
+            print(f"[ASR] Final transcription failed for session {session_id}: {e}")
+            await websocket.send_json({"type": "error", "detail": "Transcription failed"})
+            return True
+        if not user_text:
+            return True
+        await websocket.send_json({"type": "final", "text": user_text})
+
+        try:
+            async with AsyncSessionLocal() as turn_db:
+                user_msg, assistant_msg, _ = await process_message(turn_db, session_id, user_text, "voice")
+        except Exception as e:
+            print(f"[Voice] Turn failed for session {session_id}: {e}")
+            await websocket.send_json({"type": "error", "detail": "Reply generation failed"})
+            return True
+        if user_msg is None or assistant_msg is None:
+            await websocket.send_json({"type": "error", "detail": "Session not found."})
+            await websocket.close(code=4404, reason="Session not found.")
+            return False
+
+        await websocket.send_json({
+            "type": "reply",
+            "user_message": to_message(user_msg).model_dump(),
+            "reply": to_message(assistant_msg).model_dump(),
+        })
+        return True
+
+    async def run_turns():
+        # An utterance that ended while the previous turn ran goes next
+        while await finish_turn():
+            if not (end_requested or stt.end_of_utterance()):
+                return
+
+    def end_utterance():
+        nonlocal turn_task, end_requested
+        if turn_task is None or turn_task.done():
+            turn_task = asyncio.create_task(run_turns())
+        else:
+            end_requested = True
+
+    try:
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+
+            if frame.get("bytes"):
+                stt.feed(frame["bytes"])
+                if stt.end_of_utterance():
+                    end_utterance()
+                elif stt.partial_due() and (partial_task is None or partial_task.done()):
+                    # Decode in the background so frames keep flowing in
+                    partial_task = asyncio.create_task(send_partial())
+            elif frame.get("text"):
+                try:
+                    control = json.loads(frame["text"])
+                except ValueError:
+                    continue
+                if control.get("type") == "end":
+                    end_utterance()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in (turn_task, partial_task):
+            if task is not None:
+                task.cancel()
+
+# ----------------------------
+# Reply audio status (long-poll)
+# ----------------------------
+@router.get("/audio/{message_id}", response_model=AudioStatusResponse)
+async def audio_status(
+    message_id: int,
+    wait: float = Query(0, ge=0, le=MAX_AUDIO_WAIT_SECONDS),
+    regenerate: bool = Query(False),
+    db: AsyncSession = Depends(get_async_db),
+):
+    msg = await db.get(InterviewMessage, message_id)
+    if not msg or msg.role != "assistant":
+        raise HTTPException(status_code=404, detail="Message not found.")
+
+    # Audio removed by the media retention GC (or a failed render): render it again
+    if regenerate and get_audio_status(msg.id, msg.tts_url) == "failed":
+        # Commit the URL before queueing, like new replies: a render that fails
+        # right away then clears a URL that is already stored
+        msg.tts_url = reply_audio_url(msg.content)
+        await db.commit()
+        if msg.tts_url and not enqueue_reply_audio(msg.session_id, msg.id, msg.content):
+            msg.tts_url = None
+            await db.commit()
+
+    status = await wait_for_audio(msg.id, msg.tts_url, timeout=wait)
+    return AudioStatusResponse(
+        message_id=msg.id,
+        status=status,
+        tts_url=msg.tts_url if status != "failed" else None,
+    )
+
+# ----------------------------
+# Reply audio, streamed sentence by sentence
+# ----------------------------
+@router.get("/audio/{message_id}/stream")
+async def audio_stream(message_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    msg = await db.get(InterviewMessage, message_id)
+    if not msg or msg.role != "assistant":
+        raise HTTPException(status_code=404, detail="Message not found.")
+
+    # Already rendered: serve the finished file instead of synthesizing again
+    if msg.tts_url and get_audio_status(msg.id, msg.tts_url) == "ready":
+        path = AUDIO_DIR / os.path.basename(msg.tts_url)
+        return FileResponse(path, media_type=mimetypes.guess_type(path.name)[0] or "audio/wav")
+
+    return StreamingResponse(
+        stream_reply_audio(msg.content),
+        media_type="audio/wav",
+        headers={"Cache-Control": "no-store"},
+    )
+
+# ----------------------------
+# TTS cache metrics
+# ----------------------------
+@router.get("/tts-cache/stats")
+async def tts_cache_stats():
+    return tts_cache.stats()
+
+@router.get("/sessions/{session_id}/sentiment-summary", response_model=SentimentSummary)
+async def get_sentiment_summary(
+    session_id: str,
+    verify: bool = Query(False, description="Rebuild from messages and repair drift"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    summary = await session_sentiment_summary(db, session_id, verify=verify)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Session not found.")
+    return SentimentSummary(**summary)
+
+
 # ----------------------------
 # End Interview / Evaluation
 # ----------------------------
 @router.post("/evaluate", response_model=EvaluationResponse)
-async def evaluate(session_id: str = Form(...), db: Session = Depends(get_db)):
+async def evaluate(session_id: str = Form(...), db: AsyncSession = Depends(get_async_db)):
     try:
         evaluation, explanation, timeline_raw, summary_raw = await evaluate_session(
             db, session_id
@@ -134,6 +445,7 @@ async def evaluate(session_id: str = Form(...), db: Session = Depends(get_db)):
         avg_sentiment_score_by_label=summary_raw.get(
             "avg_sentiment_score_by_label", {}
         ),
+        avg_emotion_scores=summary_raw.get("avg_emotion_scores", {}),
     )
 
     return EvaluationResponse(
@@ -1,11 +1,13 @@
 # This file defines the API routes for job-related operations.
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.db.database import SessionLocal
-from app.schemas.job import JobOut, JobCreate, JobUpdate
-from app.services import job_crud
+from app.db.database import SessionLocal, get_read_db
+from app.schemas.job import JobOut, JobCreate, JobUpdate, JobPage, JobSearchHit
+from app.services import job_crud, job_search
+from app.services.question_bank import refresh_bank
 
 # The router is created with a prefix and tags for organization.
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
@@ -19,13 +21,42 @@ def get_db():
         db.close() # Close the session after use
 
 # Define the API routes for job operations
-@router.get("/", response_model=List[JobOut])
-def list_jobs(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return job_crud.get_jobs(db, skip, limit) # List all jobs with pagination
+@router.get("/", response_model=JobPage)
+def list_jobs(
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None, # nextCursor from the previous page
+    work_type: Optional[str] = None,
+    country: Optional[str] = None,
+    location: Optional[str] = None,
+    company: Optional[str] = None,
+    posted_from: Optional[date] = None, # inclusive posting-date range
+    posted_to: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+):
+    try:
+        jobs, next_cursor = job_crud.get_jobs_page(
+            db, limit, cursor,
+            work_type=work_type, country=country, location=location, company=company,
+            posted_from=posted_from, posted_to=posted_to,
+        ) # List jobs newest first with keyset pagination
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) # Malformed cursor
+    return JobPage(items=jobs, next_cursor=next_cursor)
+
+# Full-text search over title, role, description, responsibilities and skills
+# (declared before /{job_id} so "search" is not parsed as an ID)
+@router.get("/search", response_model=List[JobSearchHit])
+def search_jobs(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    prefix: bool = False, # also match the last word as a prefix (search-as-you-type)
+    db: Session = Depends(get_read_db),
+):
+    return job_search.search_jobs(db, q, limit, prefix) # Best matches first (BM25)
 
 # Get a specific job by ID
 @router.get("/{job_id}", response_model=JobOut)
-def get_job(job_id: int, db: Session = Depends(get_db)):
+def get_job(job_id: int, db: Session = Depends(get_read_db)):
     job = job_crud.get_job(db, job_id) # Retrieve a job by its ID
     if not job:
         raise HTTPException(status_code=404, detail="Job not found") # Raise an error if not found
@@ -38,10 +69,11 @@ def create_job(job_data: JobCreate, db: Session = Depends(get_db)):
 
 # Update an existing job
 @router.put("/{job_id}", response_model=JobOut)
-def update_job(job_id: int, job_data: JobUpdate, db: Session = Depends(get_db)):
+def update_job(job_id: int, job_data: JobUpdate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     job = job_crud.update_job(db, job_id, job_data) # Update a job with the provided data
     if not job:
         raise HTTPException(status_code=404, detail="Job not found") # Raise an error if not found
+    background_tasks.add_task(refresh_bank, job_id) # Regenerate interview questions if the job changed
     return job # Return the updated job details
 
 # Delete a job by ID
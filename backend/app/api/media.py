@@ -0,0 +1,31 @@
+# This file defines how generated media (TTS audio) is served under /media.
+import mimetypes
+import os
+
+from fastapi.responses import PlainTextResponse
+from fastapi.staticfiles import StaticFiles
+
+# Opus replies are written in an Ogg container with a .opus extension
+mimetypes.add_type("audio/ogg", ".opus")
+
+# Every file under /media has a unique or content-addressed name, so it never changes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class MediaFiles(StaticFiles):
+    """
+    StaticFiles with long-lived caching for generated media.
+
+    FileResponse already supplies ETag / Last-Modified, answers conditional
+    requests with 304 and serves HTTP Range requests (seeking in the audio
+    player, resumable mobile downloads); this adds immutable Cache-Control
+    and hides in-progress renders (dot-files).
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        if os.path.basename(full_path).startswith("."):
+            return PlainTextResponse("Not Found", status_code=404)
+
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
@@ -0,0 +1,22 @@
+# This file exposes runtime metrics (LLM latency, inference pools and batching, TTS cache, DB write batching).
+from fastapi import APIRouter
+
+from app.services.llm import gemini
+from app.services.audio import sentiment_batcher
+from app.services.inference import pool_stats
+from app.services.tts_jobs import tts_cache
+from app.services.unit_of_work import write_behind
+
+# The router is created with a prefix and tags for organization.
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+# All metrics in one payload for dashboards / quick curl checks
+@router.get("/")
+def get_metrics():
+    return {
+        "llm": gemini.stats(),
+        "inference": pool_stats(),
+        "sentiment": sentiment_batcher.stats(),
+        "tts_cache": tts_cache.stats(),
+        "write_behind": write_behind.stats() if write_behind is not None else None,
+    }
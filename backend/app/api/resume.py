@@ -1,6 +1,14 @@
 # This file defines the API routes for resume-related operations.
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from app.services.resume_matcher import process_resume_and_match_jobs
+from app.services.documents import (
+    DocumentTooLargeError,
+    DocumentExtractionError,
+    SUPPORTED_FORMATS,
+    is_supported_document,
+    read_upload_capped,
+)
 
 # The router is created with a prefix and tags for organization.
 router = APIRouter(prefix="/resume", tags=["Resume"])
@@ -8,13 +16,22 @@ router = APIRouter(prefix="/resume", tags=["Resume"])
 # Define the API route for resume matching
 @router.post("/match")
 async def match_resume(file: UploadFile = File(...)):
-    if not file.filename.endswith(".pdf"): # Check if the file is a PDF
-        raise HTTPException(status_code=400, detail="Only PDF resumes are supported.") # Raise an error if not a PDF
+    if not is_supported_document(file.filename): # Check if the file is a PDF, DOCX, TXT or RTF
+        supported = ", ".join(f".{ext}" for ext in SUPPORTED_FORMATS)
+        raise HTTPException(status_code=400, detail=f"Supported resume formats: {supported}.") # Raise an error otherwise
 
-    resume_bytes = await file.read() # Read the file content
+    try:
+        resume_bytes = await read_upload_capped(file) # Read in chunks, stopping once past MAX_DOCUMENT_BYTES
+    except DocumentTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e)) # Reject oversized uploads before reading the rest
 
     try:
-        result = process_resume_and_match_jobs(resume_bytes) # Process the resume and match jobs
+        # Run off the event loop: parsing, embeddings and Gemini calls are all blocking
+        result = await run_in_threadpool(process_resume_and_match_jobs, resume_bytes, file.filename) # Process the resume and match jobs
         return result # Return the matching jobs
+    except DocumentTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e)) # Reject oversized uploads
+    except DocumentExtractionError as e:
+        raise HTTPException(status_code=400, detail=str(e)) # Unreadable or corrupt document
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing resume: {e}") # Raise an error if processing fails
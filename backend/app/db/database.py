@@ -1,20 +1,154 @@
 # app/db/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import os
 
-DATABASE_URL = "sqlite:///./app.db"
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker, declarative_base
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Required for SQLite
+# ------------------------
+# Config
+# ------------------------
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+# Same database through an asyncio driver (aiosqlite for SQLite)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or (
+    make_url(DATABASE_URL).set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if DATABASE_URL.startswith("sqlite") else DATABASE_URL
 )
 
+# SQLite profile, applied to every new connection
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")                 # durable per checkpoint in WAL mode
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))       # bytes of the file read via mmap
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", 64 * 1024))       # page cache per connection
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))        # wait for a lock instead of failing
+
+# Pools are per process, so size them per uvicorn worker
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))            # general sessions (request handlers, tasks)
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", 8))  # read-only sessions
+DB_READ_MAX_OVERFLOW = int(os.getenv("DB_READ_MAX_OVERFLOW", 8))
+DB_WRITE_POOL_SIZE = int(os.getenv("DB_WRITE_POOL_SIZE", 1))  # SQLite has one writer at a time anyway
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+
+
+def apply_sqlite_pragmas(dbapi_connection) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        # WAL lets readers run alongside the writer instead of queueing on the
+        # rollback-journal lock; it is persistent, the rest are per connection
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")  # negative = KiB
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    finally:
+        cursor.close()
+
+
+def make_engine(
+    url: str = DATABASE_URL,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    read_only: bool = False,
+    immediate: bool = False,
+) -> Engine:
+    """
+    Engine with the SQLite profile above (other backends get just the pool).
+
+    read_only: connections refuse writes (PRAGMA query_only).
+    immediate: transactions start with BEGIN IMMEDIATE, taking the write lock
+    up front so busy_timeout applies; a deferred transaction that reads and
+    then writes can fail with SQLITE_BUSY as soon as another writer committed.
+    Use it only for short write transactions.
+    """
+    sqlite = url.startswith("sqlite")
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if sqlite else {},  # Required for SQLite
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_pre_ping=not sqlite,
+    )
+    if sqlite:
+        _install_sqlite_events(engine, read_only, immediate)
+    return engine
+
+
+def make_async_engine(
+    url: str = ASYNC_DATABASE_URL,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    read_only: bool = False,
+    immediate: bool = False,
+) -> AsyncEngine:
+    """Async counterpart of make_engine(): same pragmas, pool sizing and options."""
+    engine = create_async_engine(
+        url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_pre_ping=not url.startswith("sqlite"),
+    )
+    if url.startswith("sqlite"):
+        # Events live on the sync engine the async one wraps
+        _install_sqlite_events(engine.sync_engine, read_only, immediate)
+    return engine
+
+
+def _install_sqlite_events(engine: Engine, read_only: bool, immediate: bool) -> None:
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection)
+        if read_only:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA query_only=ON")
+            cursor.close()
+        if immediate:
+            # Let SQLAlchemy's "begin" event issue BEGIN itself
+            dbapi_connection.isolation_level = None
+
+    if immediate:
+        @event.listens_for(engine, "begin")
+        def _on_begin(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+engine = make_engine()
+read_engine = make_engine(pool_size=DB_READ_POOL_SIZE, max_overflow=DB_READ_MAX_OVERFLOW, read_only=True)
+write_engine = make_engine(pool_size=DB_WRITE_POOL_SIZE, max_overflow=0, immediate=True)
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine
 )
 
+# Read-only queries (job listings, matching, history pages)
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine
+)
+
+# Short write transactions (see app/services/unit_of_work.py)
+WriteSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=write_engine
+)
+
+# Async sessions for the async interview routes and services; the sync ones
+# above stay for sync routes (api/jobs.py), scripts and worker threads.
+# expire_on_commit=False: an AsyncSession cannot lazy-load after commit
+async_engine = make_async_engine()
+async_read_engine = make_async_engine(pool_size=DB_READ_POOL_SIZE, max_overflow=DB_READ_MAX_OVERFLOW, read_only=True)
+async_write_engine = make_async_engine(pool_size=DB_WRITE_POOL_SIZE, max_overflow=0, immediate=True)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+AsyncWriteSessionLocal = async_sessionmaker(async_write_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -23,3 +157,22 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+async def dispose_async_engines() -> None:
+    for engine in (async_engine, async_read_engine, async_write_engine):
+        await engine.dispose()
@@ -1,12 +1,15 @@
 # This file is the main entry point for the FastAPI application.
+import asyncio
 import os
 
 from fastapi import FastAPI
 from app.auth import auth_router
-from app.api import jobs, resume, interview_train
-from app.db.database import Base, engine
+from app.api import jobs, resume, interview_train, metrics
+from app.db.database import Base, dispose_async_engines, engine
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from app.api.media import MediaFiles
+from app.services.media_retention import periodic_media_gc
+from app.services.inference import shutdown_pools, start_pools
 
 # Create all tables in the database
 Base.metadata.create_all(bind=engine)
@@ -25,14 +28,33 @@ app.add_middleware(
 
 os.makedirs("media/audio", exist_ok=True)
 
-# 👇 Serve /media/audio/... URLs
-app.mount("/media", StaticFiles(directory="media"), name="media")
+# 👇 Serve /media/audio/... URLs (immutable caching, ETag and Range support)
+app.mount("/media", MediaFiles(directory="media"), name="media")
+
+# Periodically enforce age / disk quotas on media/audio
+@app.on_event("startup")
+async def start_media_gc():
+    app.state.media_gc_task = asyncio.create_task(periodic_media_gc())
+
+# Whisper, the text classifiers and TTS run in their own worker processes
+@app.on_event("startup")
+async def start_inference_workers():
+    start_pools()
+
+@app.on_event("shutdown")
+async def stop_inference_workers():
+    shutdown_pools()
+
+@app.on_event("shutdown")
+async def close_async_db():
+    await dispose_async_engines()
 
 # Include routers for different parts of the application
 app.include_router(auth_router.router)
 app.include_router(resume.router)
 app.include_router(jobs.router)
 app.include_router(interview_train.router)
+app.include_router(metrics.router)
 
 # Define a simple root endpoint for testing
 @app.get("/")
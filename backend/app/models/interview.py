@@ -1,5 +1,5 @@
 # app/models/interview.py
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, JSON, DateTime, Text
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, JSON, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
@@ -23,11 +23,22 @@ class InterviewSession(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Rolling conversation memory: summary of every message up to summarized_through_id
+    memory_summary = Column(Text, nullable=True)
+    summarized_through_id = Column(Integer, nullable=True)
+
+    # Running sentiment aggregates (see app/services/sentiment_stats.py)
+    sentiment_stats = Column(JSON, nullable=True)
+
     messages = relationship("InterviewMessage", back_populates="session")
 
 
 class InterviewMessage(Base):
     __tablename__ = "interview_messages"
+    __table_args__ = (
+        # Cursor reads: WHERE session_id = ? AND id > ? ORDER BY id
+        Index("ix_interview_messages_session_id_id", "session_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String, ForeignKey("interview_sessions.session_id"))
@@ -41,3 +52,51 @@ class InterviewMessage(Base):
     tts_url = Column(String, nullable=True)
 
     session = relationship("InterviewSession", back_populates="messages")
+
+
+class InterviewEvaluation(Base):
+    """Latest evaluation per session; reused while last_message_id is unchanged."""
+    __tablename__ = "interview_evaluations"
+
+    session_id = Column(String, ForeignKey("interview_sessions.session_id"), primary_key=True)
+    last_message_id = Column(Integer)
+    evaluation = Column(Text)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class InterviewSegmentCritique(Base):
+    """
+    Cached critique of one transcript segment (map step of long evaluations).
+    A segment is keyed by its first message; end_message_id and digest tell
+    whether it has grown or its sentiment annotations changed since.
+    """
+    __tablename__ = "interview_segment_critiques"
+    __table_args__ = (
+        Index("ix_interview_segment_critiques_session_start", "session_id", "start_message_id", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(String, ForeignKey("interview_sessions.session_id"))
+    start_message_id = Column(Integer)
+    end_message_id = Column(Integer)
+    digest = Column(String)    # sha256 of the annotated segment text
+    critique = Column(Text)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class InterviewQuestionBank(Base):
+    """
+    Pre-generated questions for one job posting (see app/services/question_bank.py).
+    job_digest fingerprints the job fields the questions were written from;
+    a bank whose digest no longer matches the job is stale.
+    """
+    __tablename__ = "interview_question_banks"
+
+    job_id = Column(Integer, primary_key=True, autoincrement=False)  # job_postings.id
+    job_digest = Column(String)
+    openings = Column(JSON)    # [{"text": ..., "tts_url": ...}], greeting + first question
+    follow_ups = Column(JSON)  # [str]
+
+    created_at = Column(DateTime, default=datetime.utcnow)
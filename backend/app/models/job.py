@@ -1,9 +1,19 @@
-from sqlalchemy import Column, String, Integer, Float, Date, JSON
+from sqlalchemy import Column, DDL, String, Integer, Float, Date, JSON, Index, event
 from app.db.database import Base
 
 # JobPosting model
 class JobPosting(Base):
     __tablename__ = "job_postings"
+    __table_args__ = (
+        # Listing (see job_crud.get_jobs_page): newest first, keyset on
+        # (job_posting_date, id). SQLite appends the rowid (= id) to every index,
+        # so each one covers "filter = ? [AND date range] ORDER BY date, id".
+        Index("ix_job_postings_job_posting_date", "job_posting_date"),
+        Index("ix_job_postings_work_type_date", "work_type", "job_posting_date"),
+        Index("ix_job_postings_country_date", "country", "job_posting_date"),
+        Index("ix_job_postings_location_date", "location", "job_posting_date"),
+        Index("ix_job_postings_company_date", "company", "job_posting_date"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     experience = Column(String)
@@ -28,4 +38,44 @@ class JobPosting(Base):
     responsibilities = Column(String)
     company = Column(String)
     company_profile = Column(JSON)  # <- parsed dict
-    embedding = Column(JSON, nullable=True)
\ No newline at end of file
+    embedding = Column(JSON, nullable=True)
+
+# Full-text search index (see app/services/job_search.py): an FTS5 table keyed
+# by job id, kept in sync by triggers so every writer (API, loaders, scripts)
+# updates it. Skills are flattened from their JSON list into one text column.
+# The update trigger only fires for indexed columns, so embedding backfills
+# do not touch the index.
+_FLAT_SKILLS = (
+    "CASE WHEN json_valid({row}.skills) "
+    "THEN (SELECT group_concat(value, ', ') FROM json_each({row}.skills)) "
+    "ELSE {row}.skills END"
+)
+_FTS_INSERT = (
+    "INSERT INTO job_postings_fts (rowid, job_title, role, job_description, responsibilities, skills) "
+    "VALUES (new.id, new.job_title, new.role, new.job_description, new.responsibilities, "
+    + _FLAT_SKILLS.format(row="new") + ");"
+)
+SEARCH_INDEX_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS job_postings_fts USING fts5("
+    "job_title, role, job_description, responsibilities, skills, "
+    "tokenize = 'porter unicode61 remove_diacritics 2', prefix = '2 3')",
+    "CREATE TRIGGER IF NOT EXISTS job_postings_fts_insert AFTER INSERT ON job_postings BEGIN "
+    + _FTS_INSERT + " END",
+    "CREATE TRIGGER IF NOT EXISTS job_postings_fts_update "
+    "AFTER UPDATE OF job_title, role, job_description, responsibilities, skills ON job_postings BEGIN "
+    "DELETE FROM job_postings_fts WHERE rowid = old.id; " + _FTS_INSERT + " END",
+    "CREATE TRIGGER IF NOT EXISTS job_postings_fts_delete AFTER DELETE ON job_postings BEGIN "
+    "DELETE FROM job_postings_fts WHERE rowid = old.id; END",
+    # Index rows that existed before the table (no-op on a fresh table)
+    "INSERT INTO job_postings_fts (rowid, job_title, role, job_description, responsibilities, skills) "
+    "SELECT id, job_title, role, job_description, responsibilities, " + _FLAT_SKILLS.format(row="job_postings")
+    + " FROM job_postings WHERE id NOT IN (SELECT rowid FROM job_postings_fts)",
+]
+
+# create_all / drop_all manage the index with the table (SQLite only)
+for _statement in SEARCH_INDEX_DDL:
+    event.listen(JobPosting.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    JobPosting.__table__, "after_drop",
+    DDL("DROP TABLE IF EXISTS job_postings_fts").execute_if(dialect="sqlite"),
+)
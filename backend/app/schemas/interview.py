@@ -11,14 +11,27 @@ class SentimentResult(BaseModel):
     sentiment_score: float
     emotions: List[EmotionScore]
 
+AudioStatus = Literal["pending", "ready", "failed"]
+
 class Message(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
+    id: Optional[int] = None
     role: Literal["user", "assistant"]
     content: str
     modality: Literal["text", "voice"] = "text"
     sentiment: Optional[SentimentResult] = None
     tts_url: Optional[str] = None
+    tts_status: Optional[AudioStatus] = None
+
+class AudioStatusResponse(BaseModel):
+    """
+    Returned by /interview/audio/{message_id}.
+    tts_url is only playable once status == "ready".
+    """
+    message_id: int
+    status: AudioStatus
+    tts_url: Optional[str] = None
 
 class StartRequest(BaseModel):
     job_id: int
@@ -35,9 +48,26 @@ class StartResponse(BaseModel):
     first_message: Message
 
 class ChatResponse(BaseModel):
+    """
+    Returned by /interview/message.
+    chat_history only holds messages newer than the request's since_message_id
+    (or this turn's messages when no cursor was sent); last_message_id is the
+    cursor for the next call.
+    """
     session_id: str
     reply: Message
     chat_history: List[Message]
+    last_message_id: Optional[int] = None
+
+class MessagePage(BaseModel):
+    """
+    Returned by /interview/sessions/{session_id}/messages, oldest first.
+    Pass next_before_id as before_id to fetch the previous page.
+    """
+    session_id: str
+    messages: List[Message]
+    has_more: bool
+    next_before_id: Optional[int] = None
 
 class SentimentTimelineItem(BaseModel):
     """
@@ -59,6 +89,7 @@ class SentimentSummary(BaseModel):
     assistant_messages: int
     counts_by_label: Dict[str, int]
     avg_sentiment_score_by_label: Dict[str, float]
+    avg_emotion_scores: Dict[str, float] = {}
 
 
 class EvaluationResponse(BaseModel):
@@ -40,3 +40,26 @@ class JobOut(JobBase):
         alias_generator=to_camel,
         populate_by_name=True
     )
+
+# One page of the job listing (keyset pagination)
+class JobPage(BaseModel):
+    items: List[JobOut]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page; None on the last page
+
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+# One full-text search hit (see app/services/job_search.py)
+class JobSearchHit(BaseModel):
+    job: JobOut
+    score: float                    # BM25, higher is better
+    title_highlight: Optional[str]  # HTML-escaped job title, matches wrapped in <mark></mark>
+    snippet: Optional[str]          # best-matching fragment, same markup
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
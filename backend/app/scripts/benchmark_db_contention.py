@@ -0,0 +1,144 @@
+# This script measures SQLite lock contention: writer processes commit small
+# interview-turn-sized transactions while reader processes run /resume/match-style
+# scans, first with a plain engine (rollback journal, default pool) and then with
+# the engines from app/db/database.py (WAL + pragmas, read / write engines).
+# Workers are processes, like uvicorn workers, so they contend on SQLite's file
+# locks rather than on the GIL. Each profile runs on its own throwaway database.
+#
+# Usage (from backend/):
+#   python -m app.scripts.benchmark_db_contention [--writers 4] [--readers 8] [--seconds 10]
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.db.database import DB_READ_POOL_SIZE, DB_READ_MAX_OVERFLOW, make_engine
+
+# Constants
+SEED_ROWS = 20000  # rows scanned by each read
+PAYLOAD = "x" * 400
+
+
+def _arg(args: list[str], name: str, default: float) -> float:
+    return float(args[args.index(name) + 1]) if name in args else default
+
+
+def _seed(engine) -> None:
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE jobs (id INTEGER PRIMARY KEY, title TEXT, body TEXT)")
+        conn.exec_driver_sql("CREATE TABLE sessions (id INTEGER PRIMARY KEY, turns INTEGER)")
+        conn.exec_driver_sql("CREATE TABLE messages (id INTEGER PRIMARY KEY, session_id INTEGER, body TEXT)")
+        conn.execute(
+            text("INSERT INTO jobs (title, body) VALUES (:t, :b)"),
+            [{"t": f"job {i}", "b": PAYLOAD} for i in range(SEED_ROWS)],
+        )
+        conn.execute(text("INSERT INTO sessions (id, turns) VALUES (:i, 0)"), [{"i": i} for i in range(64)])
+
+
+def _write(engine, worker: int, n: int) -> None:
+    # One interview turn: two messages plus a counter update on the session row
+    with engine.begin() as conn:
+        sid = (worker * 7 + n) % 64
+        conn.execute(text("SELECT turns FROM sessions WHERE id = :i"), {"i": sid}).scalar()
+        conn.execute(
+            text("INSERT INTO messages (session_id, body) VALUES (:s, :b), (:s, :b)"),
+            {"s": sid, "b": PAYLOAD},
+        )
+        conn.execute(text("UPDATE sessions SET turns = turns + 1 WHERE id = :i"), {"i": sid})
+
+
+def _read(engine, worker: int, n: int) -> None:
+    with engine.connect() as conn:
+        conn.execute(text("SELECT id, length(body) FROM jobs WHERE title LIKE :p"), {"p": f"%{n % 10}"}).fetchall()
+
+
+def _engines(profile: str, url: str):
+    """(write engine, read engine) for a profile, built inside the worker process."""
+    if profile == "legacy":
+        # Baseline: what app/db/database.py used to build
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        return engine, engine
+    write = make_engine(url, pool_size=1, max_overflow=0, immediate=True)
+    read = make_engine(url, pool_size=DB_READ_POOL_SIZE, max_overflow=DB_READ_MAX_OVERFLOW, read_only=True)
+    return write, read
+
+
+def _hammer(profile: str, url: str, kind: str, worker: int, seconds: float, start, results) -> None:
+    write_engine, read_engine = _engines(profile, url)
+    fn, engine = (_write, write_engine) if kind == "write" else (_read, read_engine)
+    out = {"kind": kind, "latencies": [], "errors": 0, "locked": 0}
+    start.wait()  # every worker is up and connected-ready
+    deadline = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < deadline:
+        began = time.perf_counter()
+        try:
+            fn(engine, worker, n)
+            out["latencies"].append(time.perf_counter() - began)
+        except OperationalError as e:
+            out["errors"] += 1
+            if "locked" in str(e):
+                out["locked"] += 1
+        n += 1
+    results.put(out)
+
+
+def run_profile(name: str, profile: str, url: str, writers: int, readers: int, seconds: float) -> dict:
+    _seed(_engines(profile, url)[0])
+
+    ctx = multiprocessing.get_context("spawn")
+    jobs = [("write", i) for i in range(writers)] + [("read", i) for i in range(readers)]
+    start, results = ctx.Barrier(len(jobs)), ctx.Queue()
+    workers = [
+        ctx.Process(target=_hammer, args=(profile, url, kind, i, seconds, start, results))
+        for kind, i in jobs
+    ]
+    for w in workers:
+        w.start()
+    collected = [results.get() for _ in workers]
+    for w in workers:
+        w.join()
+
+    print(f"\n📊 {name}")
+    summary = {}
+    for kind in ("write", "read"):
+        per_worker = [r for r in collected if r["kind"] == kind]
+        latencies = sorted(l for r in per_worker for l in r["latencies"])
+        errors = sum(r["errors"] for r in per_worker)
+        locked = sum(r["locked"] for r in per_worker)
+        p95 = latencies[int(0.95 * (len(latencies) - 1))] * 1000 if latencies else 0.0
+        p50 = statistics.median(latencies) * 1000 if latencies else 0.0
+        summary[kind] = len(latencies) / seconds
+        print(f"   {kind:5s} {len(latencies) / seconds:8.1f} ops/s  p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  "
+              f"errors {errors} (database is locked: {locked})")
+    return summary
+
+
+def main(args: list[str]):
+    writers = int(_arg(args, "--writers", 4))
+    readers = int(_arg(args, "--readers", 8))
+    seconds = _arg(args, "--seconds", 10)
+    print(f"⚙️  {writers} writers, {readers} readers, {seconds:.0f}s per profile")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = run_profile(
+            "legacy (rollback journal, one engine)", "legacy",
+            f"sqlite:///{os.path.join(tmp, 'legacy.db')}", writers, readers, seconds,
+        )
+        after = run_profile(
+            "tuned (WAL + pragmas, read / write engines)", "tuned",
+            f"sqlite:///{os.path.join(tmp, 'tuned.db')}", writers, readers, seconds,
+        )
+
+    for kind in ("write", "read"):
+        if before[kind]:
+            print(f"   {kind} throughput: {after[kind] / before[kind]:.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
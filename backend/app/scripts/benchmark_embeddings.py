@@ -0,0 +1,63 @@
+# This script compares the torch and ONNX embedding backends:
+# import/load time, sentences per second and cosine agreement.
+#
+# Usage (from backend/):
+#   python -m app.scripts.benchmark_embeddings
+import time
+import numpy as np
+
+from app.scripts.export_onnx_encoder import SAMPLE_TEXTS, COSINE_TOLERANCE
+
+# Constants
+N_SENTENCES = 2000
+BATCH_SIZE = 32
+
+# Time the import of the heavy module plus model construction
+def timed_load(label, loader):
+    start = time.perf_counter()
+    model = loader()
+    elapsed = time.perf_counter() - start
+    print(f"⏱  {label:<6} import + load: {elapsed:.2f}s")
+    return model
+
+
+def load_torch():
+    from app.services.embeddings import load_torch_encoder
+    return load_torch_encoder()
+
+
+def load_onnx():
+    from app.services.embeddings import OnnxSentenceEncoder
+    return OnnxSentenceEncoder()
+
+# Throughput over a repeated corpus
+def throughput(label, model, texts):
+    model.encode(texts[:BATCH_SIZE], batch_size=BATCH_SIZE)  # warm-up
+    start = time.perf_counter()
+    model.encode(texts, batch_size=BATCH_SIZE)
+    elapsed = time.perf_counter() - start
+    rate = len(texts) / elapsed
+    print(f"🚀 {label:<6} {rate:,.0f} sentences/sec ({len(texts)} in {elapsed:.2f}s)")
+    return rate
+
+
+def main():
+    texts = (SAMPLE_TEXTS * (N_SENTENCES // len(SAMPLE_TEXTS) + 1))[:N_SENTENCES]
+
+    # ONNX first so its import time is not flattered by torch already being loaded
+    onnx_model = timed_load("onnx", load_onnx)
+    torch_model = timed_load("torch", load_torch)
+
+    onnx_rate = throughput("onnx", onnx_model, texts)
+    torch_rate = throughput("torch", torch_model, texts)
+    print(f"📈 Speed-up: {onnx_rate / torch_rate:.2f}x")
+
+    ref = np.asarray(torch_model.encode(SAMPLE_TEXTS, normalize_embeddings=True), dtype=np.float32)
+    got = onnx_model.encode(SAMPLE_TEXTS)
+    cosines = (ref * got).sum(axis=1)
+    status = "✅" if cosines.min() >= COSINE_TOLERANCE else "❌"
+    print(f"{status} cosine(torch, onnx): min={cosines.min():.4f} mean={cosines.mean():.4f} "
+          f"(tolerance {COSINE_TOLERANCE})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# This script measures /jobs/search latency (app/services/job_search.py) on a
+# throwaway SQLite database filled with synthetic postings. Postings are
+# inserted through the job_postings triggers, like the loaders do, then the
+# index is optimized. Each query is run --repeat times; prints p50 / p95 and the
+# number of matching postings. Latency grows with the match count up to
+# JOB_SEARCH_MAX_CANDIDATES, then mostly with the cost of BM25's document
+# frequency count, which always covers every match.
+#
+# Usage (from backend/):
+#   python -m app.scripts.benchmark_job_search [--rows 1000000] [--repeat 20] [--limit 20]
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, make_engine
+from app.models.job import JobPosting
+from app.services.job_search import optimize_search_index, search_jobs, to_match_query
+
+# Constants
+BATCH = 20000
+TITLES = [
+    "Software Engineer", "Data Scientist", "Nurse", "Accountant", "Sales Manager", "UX Designer",
+    "Mechanical Engineer", "Teacher", "Marketing Specialist", "DevOps Engineer", "Pharmacist",
+    "Financial Analyst", "Project Manager", "Electrician", "Chef", "Lawyer", "Recruiter",
+]
+SKILLS = [
+    "Python", "SQL", "Excel", "Kubernetes", "Docker", "React", "Negotiation", "Patient Care",
+    "Accounting", "Figma", "AutoCAD", "Leadership", "Rust", "Tableau", "Salesforce", "Go",
+]
+# (query, prefix) pairs; "{wN}" is the N-th most frequent description word
+QUERIES = [
+    ("{w0}", False),                      # in every description, like a stop word
+    ("{w30}", False),                     # in about 1 in 15
+    ("{w300}", False),                    # in about 1 in 1,700
+    ("kubernetes", False),                # skill, in 1 in 4
+    ("python data scientist", False),     # several words, AND-ed
+    ("pharmacist", False),                # title, in 1 in 9
+    ("pharmac", True),                    # prefix (search-as-you-type)
+    ("vorblaxe", False),                  # no match
+]
+
+
+def _arg(args: list[str], name: str, default: int) -> int:
+    return int(args[args.index(name) + 1]) if name in args else default
+
+
+def _words(rng: random.Random, vocab: list[str], n: int) -> str:
+    # Zipf-like draw, so some words are everywhere and most are rare
+    return " ".join(vocab[min(int(rng.paretovariate(1.1)) - 1, len(vocab) - 1)] for _ in range(n))
+
+
+def _seed(engine, rows: int) -> list[str]:
+    """Insert `rows` synthetic postings; returns the description vocabulary, most frequent first."""
+    rng = random.Random(0)
+    syllables = ["ba", "lo", "ri", "xe", "vor", "ka", "mi", "tun", "de", "sa", "pel", "qu", "on", "zi"]
+    vocab = [w for w in {"".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(30000)}]
+    rng.shuffle(vocab)
+    table = JobPosting.__table__
+    started = time.perf_counter()
+    for start in range(0, rows, BATCH):
+        with engine.begin() as conn:
+            conn.execute(
+                table.insert(),
+                [
+                    {
+                        "job_title": rng.choice(TITLES),
+                        "role": rng.choice(TITLES),
+                        "job_description": _words(rng, vocab, 60),
+                        "responsibilities": _words(rng, vocab, 25),
+                        "skills": rng.sample(SKILLS, 4),
+                    }
+                    for _ in range(min(BATCH, rows - start))
+                ],
+            )
+        print(f"   {start + BATCH:>9,} / {rows:,} postings", end="\r")
+    print(f"\n⚙️  Inserted {rows:,} postings in {time.perf_counter() - started:.0f}s")
+    return vocab
+
+
+def main(args: list[str]):
+    rows = _arg(args, "--rows", 1_000_000)
+    repeat = _arg(args, "--repeat", 20)
+    limit = _arg(args, "--limit", 20)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'search.db')}")
+        Base.metadata.create_all(engine, tables=[JobPosting.__table__])
+        vocab = _seed(engine, rows)
+
+        db = sessionmaker(bind=engine)()
+        try:
+            started = time.perf_counter()
+            optimize_search_index(db)
+            db.commit()
+            print(f"⚙️  Optimized the index in {time.perf_counter() - started:.0f}s")
+
+            print(f"\n📊 {rows:,} postings, top {limit}, {repeat} runs per query")
+            for template, prefix in QUERIES:
+                q = template.format(**{f"w{i}": vocab[i] for i in (0, 30, 300)})
+                matches = db.execute(
+                    text("SELECT count(*) FROM job_postings_fts WHERE job_postings_fts MATCH :q"),
+                    {"q": to_match_query(q, prefix)},
+                ).scalar()
+                search_jobs(db, q, limit, prefix)  # warm the page cache
+                latencies = []
+                for _ in range(repeat):
+                    began = time.perf_counter()
+                    search_jobs(db, q, limit, prefix)
+                    latencies.append((time.perf_counter() - began) * 1000)
+                latencies.sort()
+                p95 = latencies[int(0.95 * (len(latencies) - 1))]
+                label = f"{q}*" if prefix else q
+                print(f"   {label!r:26s} {matches:>9,} matches  p50 {statistics.median(latencies):8.2f} ms  "
+                      f"p95 {p95:8.2f} ms")
+        finally:
+            db.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
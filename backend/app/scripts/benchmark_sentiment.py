@@ -0,0 +1,68 @@
+# This script measures sentiment + emotion throughput for many concurrent
+# interview sessions: one-at-a-time inference vs the micro-batching worker.
+#
+# Usage (from backend/):
+#   python -m app.scripts.benchmark_sentiment
+import asyncio
+import time
+
+from app.services.audio import (
+    analyze_text_sentiment,
+    sentiment_batcher,
+)
+
+# Constants
+CONCURRENT_SESSIONS = 50
+TURNS_PER_SESSION = 4
+
+ANSWERS = [
+    "I led a team of four engineers to migrate our billing system to the cloud.",
+    "Honestly I was nervous, but I asked for help and we shipped on time.",
+    "I don't have much experience with Kubernetes yet.",
+    "My biggest strength is turning vague requirements into a concrete plan.",
+    "We disagreed about the design, so I wrote up both options and we voted.",
+]
+
+# Baseline: every session pays two full forward passes per turn, serialized
+async def run_serial() -> float:
+    lock = asyncio.Lock()
+
+    async def session(idx: int):
+        for turn in range(TURNS_PER_SESSION):
+            async with lock:
+                analyze_text_sentiment(ANSWERS[(idx + turn) % len(ANSWERS)])
+            await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session(i) for i in range(CONCURRENT_SESSIONS)))
+    return time.perf_counter() - start
+
+# Batched: concurrent turns share padded batches
+async def run_batched() -> float:
+    async def session(idx: int):
+        for turn in range(TURNS_PER_SESSION):
+            await sentiment_batcher.run(ANSWERS[(idx + turn) % len(ANSWERS)])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session(i) for i in range(CONCURRENT_SESSIONS)))
+    return time.perf_counter() - start
+
+
+def report(label: str, elapsed: float):
+    total = CONCURRENT_SESSIONS * TURNS_PER_SESSION
+    print(f"🚀 {label:<8} {total / elapsed:,.1f} texts/sec ({total} texts in {elapsed:.2f}s)")
+
+
+async def main():
+    analyze_text_sentiment("warm-up")
+    await sentiment_batcher.run("warm-up")
+
+    serial = await run_serial()
+    report("serial", serial)
+    batched = await run_batched()
+    report("batched", batched)
+    print(f"📈 Speed-up: {serial / batched:.2f}x")
+    print(f"📊 Batcher stats: {sentiment_batcher.stats()}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
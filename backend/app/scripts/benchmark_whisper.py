@@ -0,0 +1,85 @@
+# This script reports Whisper real-time factor (processing seconds per second
+# of audio; lower is better) on sample clips, comparing the old upload path
+# (temp file, beam_size=5, no VAD) with the current one (in-memory decode,
+# WHISPER_BEAM_SIZE, VAD filter).
+#
+# Usage (from backend/):
+#   python -m app.scripts.benchmark_whisper clip1.wav clip2.webm ...
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from app.services.audio import (
+    WHISPER_BEAM_SIZE,
+    WHISPER_CPU_THREADS,
+    WHISPER_SAMPLE_RATE,
+    WHISPER_VAD_FILTER,
+    decode_pcm,
+    transcribe_pcm,
+    get_whisper_model,
+)
+
+# Constants
+RUNS = 3
+
+
+# Baseline: what transcribe_audio used to do
+def run_legacy(data: bytes) -> str:
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        tmp.write(data)
+        tmp_path = tmp.name
+    try:
+        segments, _ = get_whisper_model().transcribe(tmp_path, language="en")
+        return " ".join(seg.text for seg in segments).strip()
+    finally:
+        os.remove(tmp_path)
+
+
+# Current: decode in memory, greedy/small beam, skip silence
+def run_current(data: bytes) -> str:
+    return transcribe_pcm(decode_pcm(data, max_seconds=float("inf")))
+
+
+def measure(fn, data: bytes) -> tuple[float, str]:
+    times, text = [], ""
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        text = fn(data)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), text
+
+
+def main(paths: list[str]):
+    if not paths:
+        print("Usage: python -m app.scripts.benchmark_whisper <clip> [<clip> ...]")
+        sys.exit(1)
+
+    print(f"⚙️  beam_size={WHISPER_BEAM_SIZE} vad_filter={WHISPER_VAD_FILTER} cpu_threads={WHISPER_CPU_THREADS}")
+    run_current(open(paths[0], "rb").read())  # warm-up
+
+    totals = {"legacy": 0.0, "current": 0.0}
+    total_audio = 0.0
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        seconds = len(decode_pcm(data, max_seconds=float("inf"))) / WHISPER_SAMPLE_RATE
+        total_audio += seconds
+
+        legacy, legacy_text = measure(run_legacy, data)
+        current, current_text = measure(run_current, data)
+        totals["legacy"] += legacy
+        totals["current"] += current
+
+        print(f"\n🎧 {os.path.basename(path)} ({seconds:.1f}s)")
+        print(f"   legacy  RTF {legacy / seconds:.3f}  | {legacy_text[:80]}")
+        print(f"   current RTF {current / seconds:.3f}  | {current_text[:80]}")
+
+    print(f"\n📊 Overall RTF: legacy {totals['legacy'] / total_audio:.3f}, "
+          f"current {totals['current'] / total_audio:.3f} "
+          f"({totals['legacy'] / totals['current']:.2f}x faster)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
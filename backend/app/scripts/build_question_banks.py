@@ -0,0 +1,49 @@
+# This script pre-generates interview question banks (openings with pre-rendered
+# TTS + follow-up questions) so /interview/start can greet without calling Gemini.
+# The API builds missing or stale banks on demand; use this to warm them up front.
+#
+# Usage (from backend/):
+#   python -m app.scripts.build_question_banks                # missing or stale banks only
+#   python -m app.scripts.build_question_banks --all          # rebuild every bank
+#   python -m app.scripts.build_question_banks --job-id 42    # one job
+#   python -m app.scripts.build_question_banks --no-audio     # skip TTS pre-rendering
+import asyncio
+import sys
+
+from app.db.database import SessionLocal, dispose_async_engines
+from app.models.job import JobPosting
+from app.services.question_bank import build_bank, fresh_bank
+
+
+def _job_ids(rebuild_all: bool, only: int | None) -> list[int]:
+    db = SessionLocal()
+    try:
+        if only is not None:
+            return [only]
+        ids = [job_id for (job_id,) in db.query(JobPosting.id).order_by(JobPosting.id)]
+        return ids if rebuild_all else [i for i in ids if fresh_bank(db, i) is None]
+    finally:
+        db.close()
+
+
+async def main(args: list[str]):
+    only = int(args[args.index("--job-id") + 1]) if "--job-id" in args else None
+    with_audio = "--no-audio" not in args
+
+    job_ids = _job_ids("--all" in args, only)
+    print(f"🧠 Building question banks for {len(job_ids)} jobs" + ("" if with_audio else " (no audio)") + "...")
+
+    built = 0
+    try:
+        for job_id in job_ids:
+            try:
+                built += await build_bank(job_id, with_audio=with_audio)
+            except Exception as e:
+                print(f"❌ Job {job_id}: {e}")
+    finally:
+        await dispose_async_engines()  # close aiosqlite connections before the loop ends
+    print(f"✅ Built {built}/{len(job_ids)} question banks.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,16 @@
+# This script enforces the media retention policy (age + disk quota) on media/audio.
+# The API also runs it periodically; use this for cron jobs or a one-off cleanup.
+#
+# Usage (from backend/):
+#   python -m app.scripts.cleanup_media            # delete
+#   python -m app.scripts.cleanup_media --dry-run  # only report
+import sys
+
+from app.services.media_retention import run_collect_garbage
+
+if __name__ == "__main__":
+    dry_run = "--dry-run" in sys.argv
+    print("🧹 Running media retention" + (" (dry run)" if dry_run else "") + "...")
+    report = run_collect_garbage(dry_run=dry_run)
+    print(f"✅ Freed {report['freed_bytes'] / 1024 / 1024:.1f} MB from {report['deleted']} files; "
+          f"cleared {report['cleared_urls']} tts_url values.")
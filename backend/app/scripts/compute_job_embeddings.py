@@ -2,10 +2,10 @@
 from sqlalchemy.orm import Session
 from app.db.database import SessionLocal
 from app.models.job import JobPosting
-from sentence_transformers import SentenceTransformer
+from app.services.embeddings import get_embedding_model
 
-# Load the pre-trained model
-model = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
+# Load the configured encoder (torch or ONNX, see EMBEDDING_BACKEND)
+model = get_embedding_model()
 
 # Function to compute embeddings for job postings
 def compute_embeddings():
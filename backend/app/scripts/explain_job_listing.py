@@ -0,0 +1,114 @@
+# This script prints SQLite's EXPLAIN QUERY PLAN for every /jobs listing query:
+# all combinations of the filters (work_type, country, location, company,
+# posting-date range) on the first page and after a dated / undated cursor.
+# Each query must search an index and read it in order; a full table scan or a
+# temp B-tree sort is flagged and makes the script exit with status 1.
+#
+# By default it runs on a throwaway database seeded with synthetic postings and
+# ANALYZEd, so it checks the indexes in app/models/job.py. Pass --url to check a
+# real database instead (run `alembic upgrade head` on it first).
+#
+# Usage (from backend/):
+#   python -m app.scripts.explain_job_listing [--rows 20000] [--verbose]
+#   python -m app.scripts.explain_job_listing --url sqlite:///./app.db
+import itertools
+import random
+import sys
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.job import JobPosting
+from app.services import job_crud
+
+# Constants
+FILTERS = {
+    "work_type": "Full-Time",
+    "country": "France",
+    "location": "Paris",
+    "company": "Acme",
+    "date_range": {"posted_from": date(2023, 1, 1), "posted_to": date(2023, 6, 30)},
+}
+CURSORS = {
+    "first page": None,
+    "after dated": job_crud.encode_cursor(JobPosting(id=1000, job_posting_date=date(2023, 3, 1))),
+    "after undated": job_crud.encode_cursor(JobPosting(id=1000, job_posting_date=None)),
+}
+BAD_PLANS = ("USE TEMP B-TREE", "SCAN job_postings\n", "SCAN TABLE job_postings\n")
+
+
+def _arg(args: list[str], name: str, default):
+    return type(default)(args[args.index(name) + 1]) if name in args else default
+
+
+def _seed(engine, rows: int) -> None:
+    Base.metadata.create_all(engine, tables=[JobPosting.__table__])
+    rng = random.Random(0)
+    work_types = ["Full-Time", "Part-Time", "Contract", "Intern", "Temporary"]
+    places = [(f"Country {i}", f"City {i}-{j}") for i in range(60) for j in range(5)] + [("France", "Paris")]
+    start = date(2021, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            JobPosting.__table__.insert(),
+            [
+                {
+                    "work_type": rng.choice(work_types),
+                    "country": country,
+                    "location": location,
+                    "company": f"Company {rng.randrange(2000)}" if i % 500 else "Acme",
+                    # A few postings have no date, like some scraped datasets
+                    "job_posting_date": start + timedelta(days=rng.randrange(900)) if i % 50 else None,
+                    "job_title": f"Job {i}",
+                }
+                for i, (country, location) in enumerate(rng.choice(places) for _ in range(rows))
+            ],
+        )
+        conn.exec_driver_sql("ANALYZE")
+
+
+def _plan(db, query) -> str:
+    sql = query.statement.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return "".join(f"{detail}\n" for *_, detail in rows)
+
+
+def main(args: list[str]):
+    url = _arg(args, "--url", "")
+    verbose = "--verbose" in args
+    engine = create_engine(url or "sqlite://")
+    if not url:
+        rows = _arg(args, "--rows", 20000)
+        print(f"⚙️  Seeding {rows} synthetic postings in memory")
+        _seed(engine, rows)
+
+    db = sessionmaker(bind=engine)()
+    checked, bad = 0, 0
+    try:
+        names = list(FILTERS)
+        for n in range(len(names) + 1):
+            for combo in itertools.combinations(names, n):
+                filters = {}
+                for name in combo:
+                    value = FILTERS[name]
+                    filters.update(value if isinstance(value, dict) else {name: value})
+                for cursor_name, cursor in CURSORS.items():
+                    for query in job_crud.page_queries(db, 10, cursor, **filters):
+                        plan = _plan(db, query)
+                        checked += 1
+                        flagged = any(p in plan for p in BAD_PLANS)
+                        bad += flagged
+                        if flagged or verbose:
+                            label = " + ".join(combo) or "no filters"
+                            print(f"{'❌' if flagged else '✅'} {label} ({cursor_name})")
+                            print("".join(f"     {line}\n" for line in plan.splitlines()), end="")
+    finally:
+        db.close()
+
+    print(f"\n📊 {checked} queries checked, {bad} without an ordered index search")
+    sys.exit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
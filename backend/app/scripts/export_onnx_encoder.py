@@ -0,0 +1,116 @@
+# This script exports all-MiniLM-L6-v2 to ONNX, applies dynamic int8 quantization
+# and checks that the quantized vectors stay close to the PyTorch ones.
+#
+# Usage (from backend/):
+#   python -m app.scripts.export_onnx_encoder
+#   EMBEDDING_BACKEND=onnx uvicorn app.main:app
+import sys
+import numpy as np
+
+from app.services.embeddings import (
+    MAX_SEQ_LENGTH,
+    ONNX_MODEL_DIR,
+    ONNX_MODEL_FILE,
+    OnnxSentenceEncoder,
+    load_torch_encoder,
+)
+
+# Constants
+FP32_MODEL_FILE = "model.fp32.onnx"
+COSINE_TOLERANCE = 0.98  # minimum cosine(torch, onnx) accepted for any sample
+OPSET = 14
+
+SAMPLE_TEXTS = [
+    "python, sql, data analysis",
+    "machine learning, pytorch, computer vision, docker",
+    "customer service, communication, conflict resolution",
+    "react, typescript, css, html, rest apis",
+    "financial modeling, excel, forecasting, budgeting",
+    "Tell me about a time you handled a difficult stakeholder.",
+    "I led the migration of our billing system to AWS and cut costs by 30%.",
+    "registered nurse, patient care, electronic health records",
+]
+
+# Export the underlying transformer (pooling is done in numpy at inference time)
+def export_fp32(model, out_dir):
+    import torch
+
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    tokenizer.save_pretrained(str(out_dir))
+
+    dummy = tokenizer(["export sample"], return_tensors="pt", padding=True,
+                      truncation=True, max_length=MAX_SEQ_LENGTH)
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            (dummy["input_ids"], dummy["attention_mask"], dummy["token_type_ids"]),
+            str(out_dir / FP32_MODEL_FILE),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=OPSET,
+        )
+
+# Dynamic int8 quantization of the weights (activations stay float)
+def quantize_int8(out_dir):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(
+        model_input=str(out_dir / FP32_MODEL_FILE),
+        model_output=str(out_dir / ONNX_MODEL_FILE),
+        weight_type=QuantType.QInt8,
+    )
+
+# Compare torch and ONNX vectors on the same inputs
+def validate(torch_model, onnx_model, texts, tolerance=COSINE_TOLERANCE) -> bool:
+    ref = np.asarray(torch_model.encode(texts, normalize_embeddings=True), dtype=np.float32)
+    got = onnx_model.encode(texts)
+    cosines = (ref * got).sum(axis=1)
+
+    print(f"🔎 cosine(torch, onnx) over {len(texts)} texts: "
+          f"min={cosines.min():.4f} mean={cosines.mean():.4f}")
+    bad = [(t, c) for t, c in zip(texts, cosines) if c < tolerance]
+    for text, cos in bad:
+        print(f"❌ {cos:.4f} < {tolerance}: {text[:60]!r}")
+    return not bad
+
+# Pull some real skill strings so validation covers the production distribution
+def load_job_texts(limit: int = 200) -> list[str]:
+    try:
+        from app.db.database import SessionLocal
+        from app.models.job import JobPosting
+
+        db = SessionLocal()
+        jobs = db.query(JobPosting.skills).filter(JobPosting.skills != None).limit(limit).all()
+        db.close()
+        return [", ".join(skills) for (skills,) in jobs if skills]
+    except Exception as e:
+        print(f"⚠️ Could not load job skills for validation: {e}")
+        return []
+
+
+def main():
+    out_dir = ONNX_MODEL_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"📦 Exporting to {out_dir}")
+    torch_model = load_torch_encoder()
+    export_fp32(torch_model, out_dir)
+    quantize_int8(out_dir)
+    (out_dir / FP32_MODEL_FILE).unlink(missing_ok=True)
+    print(f"✅ Wrote {out_dir / ONNX_MODEL_FILE}")
+
+    onnx_model = OnnxSentenceEncoder(out_dir)
+    if not validate(torch_model, onnx_model, SAMPLE_TEXTS + load_job_texts()):
+        print("❌ Quantized encoder is outside the cosine tolerance; do not enable EMBEDDING_BACKEND=onnx.")
+        sys.exit(1)
+    print("🎉 ONNX encoder validated. Set EMBEDDING_BACKEND=onnx to use it.")
+
+# Run the function if this script is executed directly
+if __name__ == "__main__":
+    main()
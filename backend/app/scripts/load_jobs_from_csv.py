@@ -6,6 +6,7 @@ import pandas as pd
 from sqlalchemy.orm import Session
 
 from app.db.database import engine, SessionLocal
+from app.services.job_search import optimize_search_index
 from app.models.job import JobPosting
 from app.services.parser import smart_split_skills
 
@@ -80,6 +81,10 @@ def load_jobs_from_csv(csv_path: str):
         print(f"Processing chunk {i+1}")
         process_chunk(chunk, db)
 
+    # Triggers indexed each chunk for search; merge the index segments once at the end
+    optimize_search_index(db)
+    db.commit()
+
     # Close the database session
     db.close()
 
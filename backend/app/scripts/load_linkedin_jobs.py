@@ -5,10 +5,10 @@ import numpy as np
 from faker import Faker
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sentence_transformers import SentenceTransformer
 import ollama
 from app.db.database import SessionLocal
 from app.models.job import JobPosting
+from app.services.embeddings import get_embedding_model
 
 # Constants
 CSV_PATH = "data/postings.csv"
@@ -17,7 +17,7 @@ END_ROW = 1000  # Adjust for batch size
 
 # Global variables
 fake = Faker()
-embedder = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
+embedder = get_embedding_model()
 df = pd.read_csv(CSV_PATH).iloc[START_ROW:END_ROW].copy()
 
 # Call to Mistral model
@@ -1,53 +1,213 @@
 # app/services/audio.py
-from faster_whisper import WhisperModel
-from transformers import pipeline
-import tempfile, os
+import av
+import io, os, re, shutil, struct, subprocess, threading, wave
+from functools import lru_cache
 from pathlib import Path
-from TTS.api import TTS
+from typing import Callable
+import numpy as np
+
+from app.services.batching import MicroBatcher
+from app.services.inference import BULK, INTERACTIVE, asr_pool, sentiment_pool
+
+# Models load lazily: each one lives only in its inference worker process
+# (app/services/inference.py), never in the API process. Their libraries are
+# imported inside the getters too, so each worker imports only its own stack.
 
 # ------------------------
 # Whisper (ASR)
 # ------------------------
-whisper_model = WhisperModel("small", device="cpu", compute_type="int8")
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "small")
+WHISPER_BEAM_SIZE = int(os.getenv("WHISPER_BEAM_SIZE", 1))          # 1 = greedy; library default is 5
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", 4))      # per transcription
+WHISPER_VAD_FILTER = os.getenv("WHISPER_VAD_FILTER", "1") == "1"    # skip silence before decoding
+WHISPER_VAD_MIN_SILENCE_MS = int(os.getenv("WHISPER_VAD_MIN_SILENCE_MS", 500))
+
+MAX_AUDIO_UPLOAD_BYTES = int(os.getenv("MAX_AUDIO_UPLOAD_BYTES", 10 * 1024 * 1024))  # 10 MB
+MAX_AUDIO_SECONDS = float(os.getenv("MAX_AUDIO_SECONDS", 120))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+WHISPER_SAMPLE_RATE = 16000
+
+@lru_cache(maxsize=None)
+def get_whisper_model():
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(
+        WHISPER_MODEL_SIZE,
+        device="cpu",
+        compute_type="int8",
+        cpu_threads=WHISPER_CPU_THREADS,
+    )
+
+
+class AudioTooLargeError(ValueError):
+    """Upload exceeds MAX_AUDIO_UPLOAD_BYTES or MAX_AUDIO_SECONDS."""
+
+
+class AudioDecodeError(ValueError):
+    """Upload could not be decoded as audio."""
 
 # ------------------------
 # Sentiment + Emotion
 # ------------------------
-sentiment_pipe = pipeline(
-    "sentiment-analysis",
-    model="distilbert-base-uncased-finetuned-sst-2-english",
-)
+@lru_cache(maxsize=None)
+def get_sentiment_pipes():
+    """(sentiment_pipe, emotion_pipe)"""
+    from transformers import pipeline
+
+    sentiment_pipe = pipeline(
+        "sentiment-analysis",
+        model="distilbert-base-uncased-finetuned-sst-2-english",
+    )
+    emotion_pipe = pipeline(
+        "text-classification",
+        model="j-hartmann/emotion-english-distilroberta-base",
+        return_all_scores=True,
+    )
+    return sentiment_pipe, emotion_pipe
+
+
+SENTIMENT_MAX_BATCH = int(os.getenv("SENTIMENT_MAX_BATCH", 16))
+SENTIMENT_BATCH_WINDOW_MS = float(os.getenv("SENTIMENT_BATCH_WINDOW_MS", 5))
+SENTIMENT_LATENCY_SLO_MS = float(os.getenv("SENTIMENT_LATENCY_SLO_MS", 250))
+
+
+def analyze_texts_sentiment(texts: list[str]) -> list[dict]:
+    """Run both classifiers over a padded batch; one result dict per text."""
+    if not texts:
+        return []
+    sentiment_pipe, emotion_pipe = get_sentiment_pipes()
+    sentiments = sentiment_pipe(texts, batch_size=len(texts), truncation=True)
+    emotions = emotion_pipe(texts, batch_size=len(texts), truncation=True)
+    return [
+        {
+            "sentiment_label": s["label"],
+            "sentiment_score": float(s["score"]),
+            "emotions": [{"label": x["label"], "score": float(x["score"])} for x in e],
+        }
+        for s, e in zip(sentiments, emotions)
+    ]
 
-emotion_pipe = pipeline(
-    "text-classification",
-    model="j-hartmann/emotion-english-distilroberta-base",
-    return_all_scores=True,
-)
 
 def analyze_text_sentiment(text: str):
     """Return sentiment + emotion scores for a piece of text."""
-    s = sentiment_pipe(text)[0]
-    e = emotion_pipe(text)[0]
-    return {
-        "sentiment_label": s["label"],
-        "sentiment_score": float(s["score"]),
-        "emotions": [{"label": x["label"], "score": float(x["score"])} for x in e],
-    }
+    return analyze_texts_sentiment([text])[0]
 
 
-async def transcribe_audio(file):
-    """Save uploaded audio to a temp file and transcribe with Whisper."""
-    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-        tmp.write(await file.read())
-        tmp_path = tmp.name
+def _analyze_batch_in_pool(texts: list[str]) -> list[dict]:
+    return sentiment_pool.call(analyze_texts_sentiment, texts, priority=INTERACTIVE)
+
+
+# Concurrent turns are coalesced into one batch per window, then run in the sentiment worker
+sentiment_batcher = MicroBatcher(
+    _analyze_batch_in_pool,
+    max_batch_size=SENTIMENT_MAX_BATCH,
+    max_wait_ms=SENTIMENT_BATCH_WINDOW_MS,
+    latency_slo_ms=SENTIMENT_LATENCY_SLO_MS,
+    name="sentiment",
+)
+
+
+async def analyze_text_sentiment_async(text: str):
+    """Batched, non-blocking variant of analyze_text_sentiment."""
+    return await sentiment_batcher.run(text)
+
+
+async def analyze_texts_sentiment_bulk(texts: list[str]) -> list[dict]:
+    """Low-priority batch (e.g. evaluation backfill); yields to live turns."""
+    return await sentiment_pool.run(analyze_texts_sentiment, texts, priority=BULK)
+
 
+async def read_upload_capped(file, max_bytes: int = MAX_AUDIO_UPLOAD_BYTES) -> bytes:
+    """Read an UploadFile in chunks, failing as soon as it passes max_bytes."""
+    buf = bytearray()
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            return bytes(buf)
+        buf += chunk
+        if len(buf) > max_bytes:
+            raise AudioTooLargeError(f"Audio upload exceeds {max_bytes // (1024 * 1024)} MB")
+
+
+def decode_pcm(data: bytes, max_seconds: float = MAX_AUDIO_SECONDS) -> np.ndarray:
+    """
+    Decode any container/codec in memory to 16 kHz mono float32.
+
+    Decodes frame by frame and stops as soon as max_seconds is exceeded, so a
+    small, highly compressed upload cannot expand into gigabytes of PCM.
+    A container that declares a longer duration is rejected before decoding.
+    """
+    max_samples = int(max_seconds * WHISPER_SAMPLE_RATE) if max_seconds != float("inf") else None
+    chunks: list[np.ndarray] = []
+    total = 0
     try:
-        segments, _ = whisper_model.transcribe(tmp_path, language="en")
-        transcript = " ".join([seg.text for seg in segments]).strip()
-    finally:
-        os.remove(tmp_path)
+        with av.open(io.BytesIO(data), mode="r", metadata_errors="ignore") as container:
+            if not container.streams.audio:
+                raise AudioDecodeError("Could not decode audio: no audio stream")
+            declared = container.duration / av.time_base if container.duration else 0.0
+            if max_samples is not None and declared > max_seconds + 1:
+                raise AudioTooLargeError(f"Audio is {declared:.0f}s long; the limit is {max_seconds:.0f}s")
+
+            # Same output as faster_whisper.decode_audio: s16 mono at 16 kHz
+            resampler = av.AudioResampler(format="s16", layout="mono", rate=WHISPER_SAMPLE_RATE)
+            frames = container.decode(container.streams.audio[0])
+            for frame in _with_flush(frames):
+                for out in resampler.resample(frame):
+                    chunk = out.to_ndarray().reshape(-1)
+                    total += len(chunk)
+                    if max_samples is not None and total > max_samples:
+                        raise AudioTooLargeError(f"Audio exceeds the {max_seconds:.0f}s limit")
+                    chunks.append(chunk)
+    except (AudioTooLargeError, AudioDecodeError):
+        raise
+    except Exception as e:
+        raise AudioDecodeError(f"Could not decode audio: {e}") from e
+
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks).astype(np.float32) / 32768.0
+
+
+def _with_flush(frames):
+    # A trailing None flushes the resampler's buffered samples
+    yield from frames
+    yield None
+
+
+def transcribe_segments(
+    samples: np.ndarray, beam_size: int = WHISPER_BEAM_SIZE, vad_filter: bool = WHISPER_VAD_FILTER
+) -> list[tuple[float, float, str]]:
+    """Blocking Whisper pass over 16 kHz float32 samples -> [(start_s, end_s, text)]."""
+    segments, _ = get_whisper_model().transcribe(
+        samples,
+        language="en",
+        beam_size=beam_size,
+        vad_filter=vad_filter,
+        vad_parameters={"min_silence_duration_ms": WHISPER_VAD_MIN_SILENCE_MS},
+    )
+    # segments is lazy: decoding happens while iterating, so keep this in the worker thread
+    return [(seg.start, seg.end, seg.text.strip()) for seg in segments]
+
+
+def transcribe_pcm(samples: np.ndarray, beam_size: int = WHISPER_BEAM_SIZE, vad_filter: bool = WHISPER_VAD_FILTER) -> str:
+    return " ".join(text for _, _, text in transcribe_segments(samples, beam_size, vad_filter) if text)
+
 
-    return transcript
+def transcribe_bytes(data: bytes) -> str:
+    return transcribe_pcm(decode_pcm(data))
+
+
+async def transcribe_audio(file):
+    """
+    Transcribe an uploaded audio file with Whisper.
+
+    The upload is read in chunks under MAX_AUDIO_UPLOAD_BYTES, then decoded
+    in memory (no temp file) and transcribed in the ASR worker process, so
+    neither the event loop nor the GIL is held. Raises AudioTooLargeError /
+    AudioDecodeError.
+    """
+    data = await read_upload_capped(file)
+    return await asr_pool.run(transcribe_bytes, data, priority=INTERACTIVE)
 
 
 # ------------------------
@@ -66,10 +226,146 @@ AUDIO_DIR = MEDIA_DIR / "audio"
 AUDIO_DIR.mkdir(parents=True, exist_ok=True)
 
 # Coqui TTS model (same as you had, just moved below)
-tts = TTS(
-    model_name="tts_models/en/ljspeech/tacotron2-DDC",
-    progress_bar=False,
-)
+TTS_MODEL_NAME = os.getenv("TTS_MODEL_NAME", "tts_models/en/ljspeech/tacotron2-DDC")
+TTS_VOICE = os.getenv("TTS_VOICE", "default")  # single-speaker model; part of the cache key
+@lru_cache(maxsize=None)
+def get_tts():
+    from TTS.api import TTS
+
+    return TTS(
+        model_name=TTS_MODEL_NAME,
+        progress_bar=False,
+    )
+
+
+# The model is not thread-safe; callers sharing one process take turns per call
+tts_lock = threading.Lock()
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?;:])\s+|\n+")
+MIN_SENTENCE_CHARS = 20  # tiny fragments ("Great!") are merged into the next sentence
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split a reply into speakable sentences, merging very short fragments."""
+    sentences: list[str] = []
+    carry = ""
+    for part in SENTENCE_SPLIT.split(text or ""):
+        part = part.strip()
+        if not part:
+            continue
+        carry = f"{carry} {part}".strip()
+        if len(carry) >= MIN_SENTENCE_CHARS:
+            sentences.append(carry)
+            carry = ""
+    if carry:
+        sentences.append(carry)
+    return sentences
+
+
+def tts_sample_rate() -> int:
+    return int(get_tts().synthesizer.output_sample_rate)
+
+
+def synthesize_pcm(text: str) -> bytes:
+    """Render one sentence to 16-bit mono PCM at tts_sample_rate()."""
+    with tts_lock:
+        samples = get_tts().tts(text=text)
+    wav = np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0)
+    return (wav * 32767).astype("<i2").tobytes()
+
+
+def streaming_wav_header(sample_rate: int) -> bytes:
+    """
+    WAV header for a stream of unknown length.
+
+    Sizes are set to the maximum so players keep reading until the
+    connection closes, the usual trick for live PCM over HTTP.
+    """
+    channels, bits = 1, 16
+    byte_rate = sample_rate * channels * bits // 8
+    block_align = channels * bits // 8
+    unknown = 0xFFFFFFFF
+    return (
+        b"RIFF" + struct.pack("<I", unknown) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, byte_rate, block_align, bits)
+        + b"data" + struct.pack("<I", unknown - 36)
+    )
+
+
+def render_wav(
+    text: str,
+    filepath: Path,
+    synthesize: Callable[[str], bytes] = synthesize_pcm,
+    sample_rate: int | None = None,
+) -> None:
+    """
+    Render `text` to a WAV file at `filepath`.
+
+    Sentences are rendered one at a time through `synthesize` (so live
+    streams can interleave with background renders) into a temp name that
+    is renamed at the end, so /media never serves a half-written WAV.
+    """
+    partial = filepath.with_name(f".{filepath.name}.part")
+    with wave.open(str(partial), "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(sample_rate or tts_sample_rate())
+        for sentence in split_sentences(text):
+            out.writeframes(synthesize(sentence))
+    os.replace(partial, filepath)
+
+
+# ------------------------
+# Compressed output (ffmpeg)
+# ------------------------
+# TTS_AUDIO_FORMAT=mp3 (default) | opus | wav. Speech at 22 kHz mono WAV is ~350 kbps;
+# these settings are ~24-32 kbps, i.e. 10-15x fewer bytes per reply.
+TTS_AUDIO_FORMAT = os.getenv("TTS_AUDIO_FORMAT", "mp3").lower()
+FFMPEG = shutil.which("ffmpeg")
+
+AUDIO_CODECS = {
+    "mp3": ["-c:a", "libmp3lame", "-b:a", "32k", "-f", "mp3"],
+    "opus": ["-c:a", "libopus", "-b:a", "24k", "-ar", "24000", "-application", "voip", "-f", "ogg"],
+}
+
+
+def audio_output_ext() -> str:
+    """File extension for rendered replies; WAV when ffmpeg or the codec is unavailable."""
+    if TTS_AUDIO_FORMAT in AUDIO_CODECS:
+        if FFMPEG:
+            return TTS_AUDIO_FORMAT
+        print(f"⚠️ ffmpeg not found; writing WAV instead of {TTS_AUDIO_FORMAT}")
+    return "wav"
+
+
+def render_audio(
+    text: str,
+    filepath: Path,
+    synthesize: Callable[[str], bytes] = synthesize_pcm,
+    sample_rate: int | None = None,
+) -> None:
+    """Render `text` to `filepath`, encoding with ffmpeg when the extension asks for it."""
+    fmt = filepath.suffix.lstrip(".").lower()
+    if fmt not in AUDIO_CODECS:
+        render_wav(text, filepath, synthesize, sample_rate)
+        return
+
+    source = filepath.with_name(f".{filepath.stem}.src.wav")
+    partial = filepath.with_name(f".{filepath.name}.part")
+    try:
+        render_wav(text, source, synthesize, sample_rate)
+        subprocess.run(
+            [FFMPEG or "ffmpeg", "-nostdin", "-y", "-loglevel", "error",
+             "-i", str(source), "-ac", "1", *AUDIO_CODECS[fmt], str(partial)],
+            check=True,
+            capture_output=True,
+        )
+        os.replace(partial, filepath)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"ffmpeg failed: {e.stderr.decode(errors='ignore').strip()}") from e
+    finally:
+        for leftover in (source, partial):
+            leftover.unlink(missing_ok=True)
 
 
 def synthesize_reply_audio(session_id: str, message_id: int, text: str) -> str:
@@ -81,6 +377,9 @@ def synthesize_reply_audio(session_id: str, message_id: int, text: str) -> str:
 
     And exposed via:
         /media/audio/<session_id>_reply_<message_id>.wav
+
+    Interview replies go through the content-addressed cache in
+    app/services/tts_cache.py instead; this stays for one-off renders.
     """
     if not text or not text.strip():
         return ""
@@ -89,11 +388,7 @@ def synthesize_reply_audio(session_id: str, message_id: int, text: str) -> str:
     filepath = AUDIO_DIR / filename
 
     print(f"[TTS] Synthesizing audio to: {filepath}")
-
-    tts.tts_to_file(
-        text=text,
-        file_path=str(filepath),
-    )
+    render_wav(text, filepath)
 
     url_path = f"/media/audio/{filename}"
     print(f"[TTS] Exposed URL path: {url_path}")
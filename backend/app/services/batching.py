@@ -0,0 +1,144 @@
+# app/services/batching.py
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Generic, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Collects single-item requests from many callers and runs them as one batch.
+
+    A worker thread waits for the first request, then keeps collecting for up
+    to `max_wait_ms` (or until `max_batch_size` items are queued) and calls
+    `batch_fn(items)` once. Each caller gets its own Future, so concurrent
+    interview turns share a single forward pass instead of paying one each.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[T]], List[R]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        latency_slo_ms: float = 250.0,
+        name: str = "batcher",
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.latency_slo = latency_slo_ms / 1000.0
+        self.name = name
+
+        self._queue: "queue.Queue[tuple[T, Future, float]]" = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+        # Metrics
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.slo_violations = 0
+        self._latencies: List[float] = []
+
+    # ---------- submission ----------
+    def submit(self, item: T) -> Future:
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    async def run(self, item: T) -> R:
+        """Await a single result without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(item))
+
+    def __call__(self, item: T) -> R:
+        return self.submit(item).result()
+
+    # ---------- worker ----------
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._loop, name=f"{self.name}-worker", daemon=True
+                )
+                self._worker.start()
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]  # block until there is work
+        # Never hold the oldest request past the window, even if the SLO is generous
+        deadline = batch[0][2] + min(self.max_wait, self.latency_slo)
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    # Window is over: take whatever backlog is already queued, don't wait
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._collect()
+            items = [item for item, _, _ in batch]
+            try:
+                results = self.batch_fn(items)
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"{self.name}: batch_fn returned {len(results)} results for {len(items)} items"
+                    )
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            done = time.perf_counter()
+            for (_, future, enqueued), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+                self._record(done - enqueued)
+
+            with self._stats_lock:
+                self.batches += 1
+                self.items += len(batch)
+
+    # ---------- metrics ----------
+    def _record(self, latency: float) -> None:
+        with self._stats_lock:
+            self._latencies.append(latency)
+            if len(self._latencies) > 1000:
+                del self._latencies[:500]
+            if latency > self.latency_slo:
+                self.slo_violations += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            batches, items, violations = self.batches, self.items, self.slo_violations
+
+        def pct(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        return {
+            "name": self.name,
+            "batches": batches,
+            "items": items,
+            "avg_batch_size": round(items / batches, 2) if batches else 0.0,
+            "queue_depth": self._queue.qsize(),
+            "p50_latency_ms": round(pct(0.50), 1),
+            "p95_latency_ms": round(pct(0.95), 1),
+            "latency_slo_ms": self.latency_slo * 1000,
+            "slo_violations": violations,
+        }
@@ -0,0 +1,274 @@
+# app/services/documents.py
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# ------------------------
+# Limits
+# ------------------------
+MAX_DOCUMENT_BYTES = int(os.getenv("MAX_DOCUMENT_BYTES", 10 * 1024 * 1024))  # 10 MB
+MAX_DOCUMENT_PAGES = int(os.getenv("MAX_DOCUMENT_PAGES", 40))
+MAX_DOCUMENT_CHARS = int(os.getenv("MAX_DOCUMENT_CHARS", 60_000))  # plenty for any real resume
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+# Documents with more pages than this are split across worker processes
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("PARALLEL_PAGE_THRESHOLD", 12))
+PAGES_PER_CHUNK = 4
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+
+TEXT_CACHE_SIZE = int(os.getenv("TEXT_CACHE_SIZE", 256))
+
+
+class DocumentTooLargeError(ValueError):
+    """Raised when an upload exceeds MAX_DOCUMENT_BYTES."""
+
+
+class DocumentExtractionError(ValueError):
+    """Raised when a document cannot be opened or parsed."""
+
+
+class UnsupportedDocumentError(DocumentExtractionError):
+    """Raised when the upload is not one of SUPPORTED_FORMATS."""
+
+
+SUPPORTED_FORMATS = ("pdf", "docx", "txt", "rtf")
+
+
+# ------------------------
+# Text cache (content hash -> text)
+# ------------------------
+_cache: "OrderedDict[str, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _cache_get(key: str) -> str | None:
+    with _cache_lock:
+        text = _cache.get(key)
+        if text is not None:
+            _cache.move_to_end(key)
+        return text
+
+
+def _cache_put(key: str, text: str) -> None:
+    with _cache_lock:
+        _cache[key] = text
+        _cache.move_to_end(key)
+        while len(_cache) > TEXT_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+# ------------------------
+# PDF extraction
+# ------------------------
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: workers import only this module, not the torch models loaded by the API
+            _pool = ProcessPoolExecutor(
+                max_workers=EXTRACT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _collect_pages(doc, start: int, end: int, max_chars: int) -> list[str]:
+    pages: list[str] = []
+    collected = 0
+    for page_no in range(start, min(end, doc.page_count)):
+        text = doc.load_page(page_no).get_text()
+        pages.append(text)
+        collected += len(text)
+        if collected >= max_chars:
+            break
+    return pages
+
+
+def _extract_page_range(pdf_bytes: bytes, start: int, end: int, max_chars: int) -> list[str]:
+    """Extract pages [start, end) inside a pool worker."""
+    import fitz
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return _collect_pages(doc, start, end, max_chars)
+
+
+def _extract_pdf(pdf_bytes: bytes, max_pages: int, max_chars: int) -> str:
+    import fitz
+
+    try:
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            page_count = min(doc.page_count, max_pages)
+            if page_count <= PARALLEL_PAGE_THRESHOLD:
+                # Small documents: a pool round-trip costs more than it saves
+                return "".join(_collect_pages(doc, 0, page_count, max_chars))
+    except Exception as e:
+        raise DocumentExtractionError(f"Could not read PDF: {e}") from e
+
+    # Large documents: fan page chunks out to worker processes, gather in order
+    pool = _get_pool()
+    futures = [
+        pool.submit(_extract_page_range, pdf_bytes, start, start + PAGES_PER_CHUNK, max_chars)
+        for start in range(0, page_count, PAGES_PER_CHUNK)
+    ]
+
+    pages = []
+    collected = 0
+    try:
+        for future in futures:
+            for text in future.result():
+                pages.append(text)
+                collected += len(text)
+                if collected >= max_chars:
+                    return "".join(pages)
+    except Exception as e:
+        raise DocumentExtractionError(f"Could not read PDF: {e}") from e
+    finally:
+        # Early stop: drop chunks that have not started yet
+        for future in futures:
+            future.cancel()
+
+    return "".join(pages)
+
+
+# ------------------------
+# Other formats (all in memory, no temp files)
+# ------------------------
+def _extract_docx(data: bytes, max_pages: int, max_chars: int) -> str:
+    import docx
+
+    try:
+        doc = docx.Document(io.BytesIO(data))
+    except Exception as e:
+        raise DocumentExtractionError(f"Could not read DOCX: {e}") from e
+
+    lines: list[str] = []
+    collected = 0
+    # Paragraphs first, then tables (many resume templates lay out sections in tables)
+    cells = (
+        cell.text
+        for table in doc.tables
+        for row in table.rows
+        for cell in row.cells
+    )
+    for text in (*(p.text for p in doc.paragraphs), *cells):
+        if not text.strip():
+            continue
+        lines.append(text)
+        collected += len(text)
+        if collected >= max_chars:
+            break
+    return "\n".join(lines)
+
+
+def _decode_text(data: bytes) -> str:
+    if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return data.decode("utf-16", errors="replace")
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+def _extract_txt(data: bytes, max_pages: int, max_chars: int) -> str:
+    return _decode_text(data)
+
+
+def _extract_rtf(data: bytes, max_pages: int, max_chars: int) -> str:
+    from striprtf.striprtf import rtf_to_text
+
+    try:
+        return rtf_to_text(_decode_text(data), errors="ignore")
+    except Exception as e:
+        raise DocumentExtractionError(f"Could not read RTF: {e}") from e
+
+
+EXTRACTORS = {
+    "pdf": _extract_pdf,
+    "docx": _extract_docx,
+    "txt": _extract_txt,
+    "rtf": _extract_rtf,
+}
+
+
+def detect_format(data: bytes, filename: str | None = None) -> str:
+    """Identify the document format from magic bytes, falling back to the extension."""
+    head = data[:8]
+    if head.startswith(b"%PDF"):
+        return "pdf"
+    if head.startswith(b"{\\rtf"):
+        return "rtf"
+    if head.startswith(b"PK\x03\x04"):
+        return "docx"  # zip container; python-docx rejects other zips with a clear error
+
+    ext = Path(filename or "").suffix.lower().lstrip(".")
+    if ext in SUPPORTED_FORMATS:
+        return ext
+    raise UnsupportedDocumentError(
+        f"Unsupported document type {ext or 'unknown'!r}; expected one of {', '.join(SUPPORTED_FORMATS)}."
+    )
+
+
+def is_supported_document(filename: str | None) -> bool:
+    return Path(filename or "").suffix.lower().lstrip(".") in SUPPORTED_FORMATS
+
+
+async def read_upload_capped(file, max_bytes: int = MAX_DOCUMENT_BYTES) -> bytes:
+    """Read an UploadFile in chunks, failing as soon as it passes max_bytes."""
+    buf = bytearray()
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            return bytes(buf)
+        buf += chunk
+        if len(buf) > max_bytes:
+            raise DocumentTooLargeError(f"Document exceeds {max_bytes // (1024 * 1024)} MB")
+
+
+def extract_document_text(
+    data: bytes,
+    filename: str | None = None,
+    max_pages: int = MAX_DOCUMENT_PAGES,
+    max_chars: int = MAX_DOCUMENT_CHARS,
+) -> str:
+    """
+    Extract text from a PDF, DOCX, TXT or RTF upload within a page/byte/character budget.
+
+    Results are cached by content hash, so re-uploading the same file
+    skips the parser entirely.
+    """
+    if len(data) > MAX_DOCUMENT_BYTES:
+        raise DocumentTooLargeError(
+            f"Document is {len(data)} bytes; the limit is {MAX_DOCUMENT_BYTES}."
+        )
+
+    fmt = detect_format(data, filename)
+    key = f"{fmt}:{max_pages}:{max_chars}:{content_hash(data)}"
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    text = EXTRACTORS[fmt](data, max_pages, max_chars)[:max_chars].strip()
+    _cache_put(key, text)
+    return text
+
+
+def extract_pdf_text(
+    pdf_bytes: bytes,
+    max_pages: int = MAX_DOCUMENT_PAGES,
+    max_chars: int = MAX_DOCUMENT_CHARS,
+) -> str:
+    """Extract text from a PDF; see extract_document_text."""
+    return extract_document_text(pdf_bytes, "document.pdf", max_pages, max_chars)
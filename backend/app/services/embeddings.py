@@ -0,0 +1,124 @@
+# app/services/embeddings.py
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+# ------------------------
+# Config
+# ------------------------
+# EMBEDDING_BACKEND=torch  -> SentenceTransformer on PyTorch (default)
+# EMBEDDING_BACKEND=onnx   -> int8-quantized ONNX export run with onnxruntime
+#                             (build it with `python -m app.scripts.export_onnx_encoder`)
+MODEL_NAME = "all-MiniLM-L6-v2"
+MAX_SEQ_LENGTH = 256  # same truncation SentenceTransformer uses for MiniLM
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+ONNX_MODEL_DIR = Path(os.getenv("EMBEDDING_ONNX_DIR", BASE_DIR / "data" / "onnx" / MODEL_NAME))
+ONNX_MODEL_FILE = "model.int8.onnx"
+ONNX_THREADS = int(os.getenv("EMBEDDING_ONNX_THREADS", min(4, os.cpu_count() or 1)))
+
+
+class OnnxSentenceEncoder:
+    """
+    Drop-in replacement for SentenceTransformer.encode() backed by onnxruntime.
+
+    Reproduces the MiniLM pipeline: tokenize -> transformer -> mean pooling
+    -> L2 normalize, so vectors are comparable with the stored torch ones.
+    """
+
+    def __init__(self, model_dir: Path = ONNX_MODEL_DIR, threads: int = ONNX_THREADS):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.session = ort.InferenceSession(
+            str(Path(model_dir) / ONNX_MODEL_FILE),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(str(Path(model_dir) / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+
+    def encode(self, sentences, batch_size: int = 32, **_ignored):
+        """Encode a string or list of strings into normalized float32 vectors."""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        chunks = []
+        for start in range(0, len(sentences), batch_size):
+            batch = self.tokenizer.encode_batch(list(sentences[start:start + batch_size]))
+            input_ids = np.array([e.ids for e in batch], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in batch], dtype=np.int64)
+
+            feed = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                feed["token_type_ids"] = np.zeros_like(input_ids)
+
+            token_embeddings = self.session.run(None, feed)[0]
+
+            # Mean pooling over real tokens only
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            chunks.append(pooled.astype(np.float32))
+
+        vectors = np.vstack(chunks) if chunks else np.zeros((0, 384), dtype=np.float32)
+        return vectors[0] if single else vectors
+
+
+def load_torch_encoder():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(MODEL_NAME, device="cpu")
+
+
+@lru_cache(maxsize=1)
+def get_embedding_model():
+    """
+    Return the process-wide sentence encoder selected by EMBEDDING_BACKEND.
+
+    Falls back to the torch model if the ONNX export is missing or broken.
+    """
+    if EMBEDDING_BACKEND == "onnx":
+        try:
+            encoder = OnnxSentenceEncoder()
+            print(f"[Embeddings] Using ONNX int8 encoder ({ONNX_THREADS} threads) from {ONNX_MODEL_DIR}")
+            return encoder
+        except Exception as e:
+            print(f"⚠️ ONNX encoder unavailable, falling back to torch: {e}")
+
+    return load_torch_encoder()
+
+
+def encode_text(text: str) -> np.ndarray:
+    """Encode a single string with the configured backend."""
+    return np.asarray(get_embedding_model().encode(text), dtype=np.float32)
+
+
+def as_keybert_backend(model):
+    """KeyBERT understands SentenceTransformer natively; wrap anything else."""
+    if not isinstance(model, OnnxSentenceEncoder):
+        return model
+
+    from keybert.backend import BaseEmbedder
+
+    class _OnnxKeyBERTBackend(BaseEmbedder):
+        def __init__(self, encoder):
+            super().__init__()
+            self.encoder = encoder
+
+        def embed(self, documents, verbose=False):
+            return self.encoder.encode(list(documents))
+
+    return _OnnxKeyBERTBackend(model)
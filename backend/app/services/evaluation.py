@@ -0,0 +1,232 @@
+# app/services/evaluation.py
+import asyncio
+import hashlib
+import os
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.interview import (
+    InterviewEvaluation,
+    InterviewMessage,
+    InterviewSegmentCritique,
+    InterviewSession,
+)
+from app.services.llm import ask_gemini
+from app.services.unit_of_work import commit_unit
+
+# ------------------------
+# Config
+# ------------------------
+# Transcripts longer than one segment are evaluated map-reduce: one cached
+# critique per segment, then a short synthesis over the critiques
+EVAL_SEGMENT_MESSAGES = int(os.getenv("EVAL_SEGMENT_MESSAGES", 12))
+
+
+def format_sentiment_for_llm(sent: Any) -> str:
+    if not sent:
+        return "none"
+    try:
+        label = sent.get("sentiment_label")
+        score = sent.get("sentiment_score")
+        emotions = sent.get("emotions", [])
+        top_emotions = ", ".join(
+            f"{e.get('label')} ({e.get('score'):.2f})"
+            for e in emotions[:3]
+            if isinstance(e, dict) and "label" in e and "score" in e
+        )
+        return f"label={label}, score={score:.2f}, emotions=[{top_emotions}]"
+    except Exception:
+        return str(sent)
+
+
+def annotate(messages: List[InterviewMessage]) -> str:
+    """One line per message: role, content and sentiment."""
+    return "\n".join(
+        f"{m.role.upper()}: {m.content} [sentiment={format_sentiment_for_llm(m.sentiment)}]"
+        for m in messages
+    )
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _segments(history: List[InterviewMessage]) -> List[List[InterviewMessage]]:
+    # Fixed boundaries by position: messages are append-only, so every
+    # segment but the last stays identical as the session grows
+    return [history[i:i + EVAL_SEGMENT_MESSAGES] for i in range(0, len(history), EVAL_SEGMENT_MESSAGES)]
+
+
+# ---------- Prompts ----------
+def _full_prompt(session: InterviewSession, transcript: str) -> str:
+    return f"""
+You are an interview evaluator.
+
+Evaluate this mock interview:
+
+Job: {session.job_title} at {session.company}
+Matched skills: {session.matched_skills}
+
+Full annotated transcript (each line shows role, content, and sentiment):
+{transcript}
+
+Provide:
+- An overall numeric score out of 10 (e.g., "Overall score: 7.5/10")
+- Key strengths (bullet list)
+- Key weaknesses (bullet list)
+- 3–5 concrete improvement suggestions
+- A transparent explanation that explicitly references sentiment/emotion patterns
+  (e.g., "Your answers started confident but became more negative when discussing X...").
+
+Use **plain text** with markdown-style headings and bullet points.
+Do NOT wrap the answer in code fences.
+"""
+
+
+def _segment_prompt(session: InterviewSession, transcript: str, index: int, count: int) -> str:
+    return f"""
+You are an interview evaluator reviewing part {index + 1} of {count} of a mock interview.
+
+Job: {session.job_title} at {session.company}
+Matched skills: {session.matched_skills}
+
+Annotated transcript excerpt (each line shows role, content, and sentiment):
+{transcript}
+
+Write a short critique of the candidate in this excerpt only (under 150 words):
+- Topics covered and how well they were answered
+- Strengths and weaknesses, with brief quotes
+- How sentiment/emotion shifted across the excerpt
+
+Plain text bullet points. Do NOT give an overall score.
+"""
+
+
+def _synthesis_prompt(session: InterviewSession, critiques: List[str], summary: Dict[str, Any]) -> str:
+    parts = "\n\n".join(f"Part {i + 1}:\n{c}" for i, c in enumerate(critiques))
+    return f"""
+You are an interview evaluator.
+
+Combine these critiques of consecutive parts of one mock interview into a final evaluation.
+
+Job: {session.job_title} at {session.company}
+Matched skills: {session.matched_skills}
+
+Sentiment summary for the whole interview:
+- Label counts: {summary.get("counts_by_label", {})}
+- Average score by label: {summary.get("avg_sentiment_score_by_label", {})}
+- Average emotion scores: {summary.get("avg_emotion_scores", {})}
+
+Critiques, in order:
+{parts}
+
+Provide:
+- An overall numeric score out of 10 (e.g., "Overall score: 7.5/10")
+- Key strengths (bullet list)
+- Key weaknesses (bullet list)
+- 3–5 concrete improvement suggestions
+- A transparent explanation that explicitly references sentiment/emotion patterns
+  and how they changed over the interview.
+
+Use **plain text** with markdown-style headings and bullet points.
+Do NOT wrap the answer in code fences.
+"""
+
+
+# ---------- Map / reduce ----------
+async def _critique_segments(
+    db: AsyncSession, session: InterviewSession, history: List[InterviewMessage]
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Critique of every segment, reusing cached ones whose text is unchanged.
+    Returns (critiques in order, fresh rows to store).
+    """
+    segments = _segments(history)
+    cached = {
+        c.start_message_id: c
+        for c in await db.scalars(
+            select(InterviewSegmentCritique).where(InterviewSegmentCritique.session_id == session.session_id)
+        )
+    }
+
+    async def critique(index: int, segment: List[InterviewMessage]) -> Tuple[str, Dict[str, Any] | None]:
+        transcript = annotate(segment)
+        digest = _digest(transcript)
+        hit = cached.get(segment[0].id)
+        if hit is not None and hit.end_message_id == segment[-1].id and hit.digest == digest:
+            return hit.critique, None
+        text = await ask_gemini(
+            _segment_prompt(session, transcript, index, len(segments)), user_key=session.session_id
+        )
+        return text, {
+            "start_message_id": segment[0].id,
+            "end_message_id": segment[-1].id,
+            "digest": digest,
+            "critique": text,
+        }
+
+    # Misses run concurrently (bounded per session by LLM_MAX_CONCURRENCY_PER_USER)
+    results = await asyncio.gather(*(critique(i, seg) for i, seg in enumerate(segments)))
+    return [text for text, _ in results], [row for _, row in results if row is not None]
+
+
+def _store_unit(session_id: str, last_message_id: int, evaluation: str, critiques: List[Dict[str, Any]]):
+    def unit(db: Session) -> None:
+        for row in critiques:
+            existing = (
+                db.query(InterviewSegmentCritique)
+                .filter_by(session_id=session_id, start_message_id=row["start_message_id"])
+                .first()
+            )
+            if existing is None:
+                db.add(InterviewSegmentCritique(session_id=session_id, **row))
+            else:
+                for key, value in row.items():
+                    setattr(existing, key, value)
+
+        cached = db.get(InterviewEvaluation, session_id)
+        if cached is None:
+            cached = InterviewEvaluation(session_id=session_id)
+            db.add(cached)
+        cached.last_message_id = last_message_id
+        cached.evaluation = evaluation
+    return unit
+
+
+async def evaluate_transcript(
+    db: AsyncSession,
+    session: InterviewSession,
+    history: List[InterviewMessage],
+    summary: Dict[str, Any],
+    reuse: bool = True,
+) -> str:
+    """
+    Evaluation text for `history` (id order), cached per (session, last message id).
+
+    Short transcripts get a single full-transcript call. Longer ones are
+    map-reduced: each EVAL_SEGMENT_MESSAGES segment is critiqued (in parallel,
+    cached by content digest) and a final call synthesizes the critiques, so
+    one extra turn costs one segment critique plus the synthesis.
+    `reuse=False` skips the evaluation cache (segment critiques still apply).
+    """
+    session_id = session.session_id
+    last_message_id = history[-1].id if history else 0
+
+    if reuse:
+        cached = await db.get(InterviewEvaluation, session_id)
+        if cached is not None and cached.last_message_id == last_message_id:
+            return cached.evaluation
+
+    if len(history) <= EVAL_SEGMENT_MESSAGES:
+        fresh: List[Dict[str, Any]] = []
+        evaluation = await ask_gemini(_full_prompt(session, annotate(history)), user_key=session_id)
+    else:
+        critiques, fresh = await _critique_segments(db, session, history)
+        evaluation = await ask_gemini(_synthesis_prompt(session, critiques, summary), user_key=session_id)
+        print(f"[Eval] Session {session_id}: {len(fresh)}/{len(critiques)} segments critiqued")
+
+    await commit_unit(session_id, _store_unit(session_id, last_message_id, evaluation, fresh))
+    return evaluation
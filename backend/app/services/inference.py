@@ -0,0 +1,249 @@
+# app/services/inference.py
+#
+# Keep this module free of ML imports: worker processes import it first and
+# must pin their thread counts before torch / ctranslate2 are loaded.
+import asyncio
+import heapq
+import importlib
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable
+
+# ------------------------
+# Config
+# ------------------------
+# INFERENCE_PROCESSES=1 -> models live in spawned worker processes (default)
+# INFERENCE_PROCESSES=0 -> same pools on threads inside the API process (dev / low memory)
+INFERENCE_PROCESSES = os.getenv("INFERENCE_PROCESSES", "1") == "1"
+
+ASR_WORKERS = int(os.getenv("ASR_WORKERS", os.getenv("WHISPER_WORKERS", 1)))
+ASR_THREADS = int(os.getenv("ASR_THREADS", os.getenv("WHISPER_CPU_THREADS", 4)))
+ASR_MAX_QUEUE = int(os.getenv("ASR_MAX_QUEUE", 16))
+
+SENTIMENT_WORKERS = int(os.getenv("SENTIMENT_WORKERS", 1))
+SENTIMENT_THREADS = int(os.getenv("SENTIMENT_THREADS", 2))
+SENTIMENT_MAX_QUEUE = int(os.getenv("SENTIMENT_MAX_QUEUE", 64))
+
+TTS_PROCESSES = int(os.getenv("TTS_PROCESSES", 1))
+TTS_THREADS = int(os.getenv("TTS_THREADS", 2))
+TTS_MAX_QUEUE = int(os.getenv("TTS_MAX_QUEUE", 256))  # queued sentences, not replies
+
+# Lower runs first
+INTERACTIVE = 0  # a candidate is waiting on it (live turn, streamed reply audio)
+BULK = 10        # background renders, evaluation backfill, scripts
+
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+class InferenceQueueFull(RuntimeError):
+    """Raised when a pool already has max_queue requests waiting."""
+
+
+def _load(target: str | None) -> None:
+    """Import 'module:function' and call it (used to load a model up front)."""
+    if target:
+        module, attr = target.split(":")
+        getattr(importlib.import_module(module), attr)()
+
+
+def _init_worker(name: str, threads: int, warmup: str | None) -> None:
+    # Runs in the child before any model module is imported
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+    _load(warmup)
+    print(f"[Inference] {name} worker {os.getpid()} ready ({threads} threads)")
+
+
+class InferencePool:
+    """
+    One pool per model type, hosting the model in its own worker processes.
+
+    Requests wait in a bounded priority queue in the API process and are
+    dispatched only when a worker is idle, so an interactive request never
+    sits behind a backlog of bulk work already handed to the workers.
+    Functions must be module-level (they are pickled by reference) and the
+    model should be loaded lazily in that module, e.g. via lru_cache.
+    """
+
+    def __init__(self, name: str, workers: int, threads: int, max_queue: int, warmup: str | None = None):
+        self.name = name
+        self.workers = workers
+        self.threads = threads
+        self.max_queue = max_queue
+        self.warmup = warmup
+
+        self._executor = None
+        self._lock = threading.RLock()  # completion callbacks can re-enter _pump
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._inflight = 0
+
+        # Metrics
+        self.completed = 0
+        self.errors = 0
+        self.rejected = 0
+        self._waits: list[float] = []
+        self._service: list[float] = []
+
+    # ---------- executor ----------
+    def _ensure_executor(self) -> None:
+        # Caller holds _lock
+        if self._executor is not None:
+            return
+        if INFERENCE_PROCESSES:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.name, self.threads, self.warmup),
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix=self.name,
+                initializer=_load,
+                initargs=(self.warmup,),
+            )
+
+    def start(self) -> None:
+        """Spawn the workers and load the model now instead of on first use."""
+        with self._lock:
+            self._ensure_executor()
+            self._executor.submit(_load, None)  # forces process start-up
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    # ---------- submission ----------
+    def submit(self, fn: Callable, *args, priority: int = INTERACTIVE) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if len(self._heap) >= self.max_queue:
+                self.rejected += 1
+                raise InferenceQueueFull(f"{self.name}: {self.max_queue} requests already queued")
+            heapq.heappush(self._heap, (priority, next(self._seq), time.perf_counter(), fn, args, future))
+            self._pump()
+        return future
+
+    async def run(self, fn: Callable, *args, priority: int = INTERACTIVE) -> Any:
+        return await asyncio.wrap_future(self.submit(fn, *args, priority=priority))
+
+    def call(self, fn: Callable, *args, priority: int = INTERACTIVE) -> Any:
+        """Blocking variant for code already running on a worker thread."""
+        return self.submit(fn, *args, priority=priority).result()
+
+    def _pump(self) -> None:
+        with self._lock:
+            while self._inflight < self.workers and self._heap:
+                _, _, enqueued, fn, args, future = heapq.heappop(self._heap)
+                if not future.set_running_or_notify_cancel():
+                    continue  # caller gave up while it was queued
+                self._ensure_executor()
+                started = time.perf_counter()
+                try:
+                    inner = self._executor.submit(fn, *args)
+                except BrokenProcessPool as e:
+                    self._executor = None  # a worker died; respawn on the next request
+                    self.errors += 1
+                    future.set_exception(e)
+                    continue
+                self._inflight += 1
+                inner.add_done_callback(partial(self._finished, future, enqueued, started))
+
+    def _finished(self, future: Future, enqueued: float, started: float, inner: Future) -> None:
+        done = time.perf_counter()
+        exc = inner.exception()
+        with self._lock:
+            self._inflight -= 1
+            self._record(self._waits, started - enqueued)
+            self._record(self._service, done - started)
+            if exc is None:
+                self.completed += 1
+            else:
+                self.errors += 1
+                if isinstance(exc, BrokenProcessPool):
+                    self._executor = None
+
+        if exc is None:
+            future.set_result(inner.result())
+        else:
+            future.set_exception(exc)
+        self._pump()
+
+    # ---------- metrics ----------
+    @staticmethod
+    def _record(samples: list[float], value: float) -> None:
+        samples.append(value)
+        if len(samples) > 1000:
+            del samples[:500]
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits, service = sorted(self._waits), sorted(self._service)
+            queue_depth, inflight = len(self._heap), self._inflight
+            completed, errors, rejected = self.completed, self.errors, self.rejected
+
+        def pct(samples: list[float], p: float) -> float:
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 1)
+
+        return {
+            "name": self.name,
+            "mode": "process" if INFERENCE_PROCESSES else "thread",
+            "workers": self.workers,
+            "threads_per_worker": self.threads,
+            "queue_depth": queue_depth,
+            "max_queue": self.max_queue,
+            "inflight": inflight,
+            "completed": completed,
+            "errors": errors,
+            "rejected": rejected,
+            "p50_queue_wait_ms": pct(waits, 0.50),
+            "p95_queue_wait_ms": pct(waits, 0.95),
+            "p50_service_ms": pct(service, 0.50),
+            "p95_service_ms": pct(service, 0.95),
+        }
+
+
+asr_pool = InferencePool(
+    "asr", ASR_WORKERS, ASR_THREADS, ASR_MAX_QUEUE, warmup="app.services.audio:get_whisper_model"
+)
+sentiment_pool = InferencePool(
+    "sentiment", SENTIMENT_WORKERS, SENTIMENT_THREADS, SENTIMENT_MAX_QUEUE,
+    warmup="app.services.audio:get_sentiment_pipes",
+)
+tts_pool = InferencePool(
+    "tts", TTS_PROCESSES, TTS_THREADS, TTS_MAX_QUEUE, warmup="app.services.audio:get_tts"
+)
+
+POOLS = (asr_pool, sentiment_pool, tts_pool)
+
+
+def start_pools() -> None:
+    for pool in POOLS:
+        pool.start()
+
+
+def shutdown_pools() -> None:
+    for pool in POOLS:
+        pool.shutdown()
+
+
+def pool_stats() -> dict:
+    return {pool.name: pool.stats() for pool in POOLS}
@@ -1,33 +1,125 @@
 # app/services/interview_service.py
-from collections import Counter, defaultdict
+import asyncio
+from collections import defaultdict
 from typing import List, Dict, Any, Tuple
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.models.interview import InterviewSession, InterviewMessage
-from app.services.llm import ask_gemini
-from app.services.audio import analyze_text_sentiment, synthesize_reply_audio
+from app.db.database import AsyncSessionLocal
+from app.models.interview import InterviewSession, InterviewMessage, gen_id
+from app.services.llm import ask_gemini, stream_gemini
+from app.services.audio import analyze_text_sentiment_async, analyze_texts_sentiment_bulk
+from app.services.evaluation import evaluate_transcript
+from app.services.question_bank import (
+    follow_up_hints,
+    fresh_bank,
+    pick_opening,
+    schedule_bank_build,
+)
+from app.services.memory import build_context, schedule_summary_update, unsummarized_messages
+from app.services.sentiment_stats import (
+    ensure_stats,
+    record_messages,
+    record_sentiment,
+    empty_stats,
+    summary_from_stats,
+    verify_stats,
+)
+from app.services.tts_jobs import enqueue_reply_audio, get_audio_status, reply_audio_url
+from app.services.unit_of_work import commit_unit, wait_for_writes
 
 
 # ----------------------------
-# Start Session
+# Background sentiment
 # ----------------------------
-async def start_session(db: Session, data):
-    session = InterviewSession(
-        job_id=data.job_id,
-        job_title=data.job_title,
-        company=data.company,
-        match_score=data.match_score,
-        resume_skills=data.resume_skills,
-        matched_skills=data.matched_skills,
-        resume_profile=data.resume_profile,
-        trainee_name=data.trainee_name,
-    )
+# session_id -> sentiment tasks that have not written their result yet
+_pending_sentiment: Dict[str, set[asyncio.Task]] = defaultdict(set)
+
+
+def _sentiment_unit(message_id: int, sentiment: Dict[str, Any]):
+    # Message sentiment and the session aggregates move together in one commit
+    def unit(db: Session) -> None:
+        msg = db.get(InterviewMessage, message_id)
+        if msg is None:
+            return
+        session = db.get(InterviewSession, msg.session_id)
+        if session is None:
+            msg.sentiment = sentiment
+            return
+        ensure_stats(db, session)
+        record_sentiment(session, msg, sentiment)
+    return unit
+
+
+async def _analyze_and_store(session_id: str, message_id: int, text: str) -> None:
+    try:
+        sentiment = await analyze_text_sentiment_async(text)
+        await commit_unit(session_id, _sentiment_unit(message_id, sentiment))
+    except Exception as e:
+        print(f"[Sentiment] Error analyzing message {message_id}: {e}")
+
+
+def schedule_sentiment(session_id: str, message_id: int, text: str) -> None:
+    """Analyze a stored user message in the background and write the result back."""
+    task = asyncio.create_task(_analyze_and_store(session_id, message_id, text))
+    pending = _pending_sentiment[session_id]
+    pending.add(task)
+
+    def _done(t: asyncio.Task) -> None:
+        pending.discard(t)
+        if not pending:
+            _pending_sentiment.pop(session_id, None)
+
+    task.add_done_callback(_done)
+
+
+async def wait_for_pending_sentiment(session_id: str) -> None:
+    """Block until every sentiment task for this session has been stored."""
+    pending = list(_pending_sentiment.get(session_id, ()))
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+# ----------------------------
+# Background TTS
+# ----------------------------
+def _stage_reply_audio(msg: InterviewMessage) -> None:
+    """
+    Stage the reply's audio URL so it lands in the same commit as the message.
+    The render is queued only after that commit (_queue_reply_audio): a job for
+    a rolled-back id could otherwise attach to the next message given that id.
+    """
+    msg.tts_url = reply_audio_url(msg.content)
+
+
+def _clear_audio_unit(message_id: int):
+    def unit(db: Session) -> None:
+        msg = db.get(InterviewMessage, message_id)
+        if msg is not None:
+            msg.tts_url = None
+    return unit
 
-    db.add(session)
-    db.commit()
-    db.refresh(session)
 
-    # First message
+async def _queue_reply_audio(session_id: str, msg: InterviewMessage) -> None:
+    """Queue TTS for a committed reply; if it can't be queued, the reply stays text-only."""
+    if not msg.tts_url:
+        return
+    try:
+        url = enqueue_reply_audio(session_id, msg.id, msg.content)
+    except Exception as e:
+        # Don't break the flow if TTS can't be queued
+        print(f"[TTS] Error queueing audio for message {msg.id}: {e}")
+        url = None
+    if url is None:
+        msg.tts_url = None
+        await commit_unit(session_id, _clear_audio_unit(msg.id))
+
+
+# ----------------------------
+# Start Session
+# ----------------------------
+async def _generate_greeting(session_id: str, data) -> str:
     prompt = f"""
 You are an interview assistant helping the candidate practice for:
 - Job: {data.job_title} at {data.company}
@@ -37,62 +129,75 @@ You are an interview assistant helping the candidate practice for:
 Greet them and ask the first interview question.
 Make it short and friendly.
 """
-    reply_text = await ask_gemini(prompt)
-
-    msg = InterviewMessage(
-        session_id=session.session_id,
-        role="assistant",
-        modality="text",
-        content=reply_text,
-    )
-    db.add(msg)
-    db.commit()
-    db.refresh(msg)
-
-    # 🔊 Generate TTS for the first assistant reply
-    try:
-        tts_url = synthesize_reply_audio(
-            session_id=session.session_id,
-            message_id=msg.id,
-            text=msg.content,
+    return await ask_gemini(prompt, user_key=session_id)
+
+
+async def start_session(db: AsyncSession, data):
+    # Nothing is written until the greeting exists: session + greeting + TTS URL commit once,
+    # then the greeting's TTS is queued
+    session_id = gen_id()
+
+    # ⚡ Greeting from the job's question bank; its audio is already in the TTS cache
+    bank = await db.run_sync(fresh_bank, data.job_id)
+    if bank is not None:
+        reply_text = pick_opening(bank)
+    else:
+        reply_text = await _generate_greeting(session_id, data)
+        if data.job_id is not None:
+            schedule_bank_build(data.job_id)  # next session for this job starts instantly
+
+    def unit(udb: Session):
+        session = InterviewSession(
+            session_id=session_id,
+            job_id=data.job_id,
+            job_title=data.job_title,
+            company=data.company,
+            match_score=data.match_score,
+            resume_skills=data.resume_skills,
+            matched_skills=data.matched_skills,
+            resume_profile=data.resume_profile,
+            trainee_name=data.trainee_name,
+            sentiment_stats=empty_stats(),
         )
-        msg.tts_url = tts_url
-        db.commit()
-        db.refresh(msg)
-    except Exception as e:
-        # Optional: log error, but don't break the flow if TTS fails
-        print(f"[TTS] Error generating audio for greeting: {e}")
-
+        msg = InterviewMessage(
+            session_id=session_id,
+            role="assistant",
+            modality="text",
+            content=reply_text,
+        )
+        udb.add(session)
+        udb.add(msg)
+        record_messages(session, [msg])
+        _stage_reply_audio(msg)
+        return session, msg
+
+    session, msg = await commit_unit(session_id, unit)
+    # 🔊 Queue TTS for the greeting; the client polls /interview/audio/{id}
+    await _queue_reply_audio(session_id, msg)
     return session, msg
 
 # ----------------------------
 # Handle message
 # ----------------------------
-async def process_message(db: Session, session_id: str, user_text: str, modality: str):
-    session = db.query(InterviewSession).filter_by(session_id=session_id).first()
-    if not session:
-        return None, None, None
-
-    # Sentiment
-    sentiment = analyze_text_sentiment(user_text)
-
-    # Store user message
-    user_msg = InterviewMessage(
+def _new_user_message(session_id: str, user_text: str, modality: str) -> InterviewMessage:
+    # Sentiment is filled in by a background task once the turn is committed
+    return InterviewMessage(
         session_id=session_id,
         role="user",
         modality=modality,
         content=user_text,
-        sentiment=sentiment,
     )
-    db.add(user_msg)
-    db.commit()
-    db.refresh(user_msg)
 
-    # Build context
-    history = db.query(InterviewMessage).filter_by(session_id=session_id).all()
-    hist_str = "\n".join([f"{m.role}: {m.content}" for m in history])
 
-    prompt = f"""
+def _reply_prompt(db: Session, session: InterviewSession, user_msg: InterviewMessage) -> str:
+    # Summary of older turns + the last few verbatim, within MEMORY_TOKEN_BUDGET;
+    # this turn's message is not stored yet, so it is appended here
+    context = build_context(session, unsummarized_messages(db, session) + [user_msg])
+    hints = follow_up_hints(fresh_bank(db, session.job_id))
+    bank_lines = "\n".join(f"- {q}" for q in hints)
+    suggestions = f"\nQuestions you may draw on for this role:\n{bank_lines}\n" if hints else ""
+
+    return f"""
 You are an interview assistant.
 
 Job: {session.job_title}
@@ -100,49 +205,236 @@ Company: {session.company}
 Matched skills: {session.matched_skills[:8]}
 
 Chat history:
-{hist_str}
-
+{context}
+{suggestions}
 Respond to the candidate.
 Ask exactly one follow-up question.
 Be concise.
 """
-    reply = await ask_gemini(prompt)
 
-    a_msg = InterviewMessage(
-        session_id=session_id,
-        role="assistant",
-        modality="text",
-        content=reply,
-    )
-    db.add(a_msg)
-    db.commit()
-    db.refresh(a_msg)
 
-    # 🔊 Generate TTS for assistant reply
-    try:
-        tts_url = synthesize_reply_audio(
-            session_id=session.session_id,
-            message_id=a_msg.id,
-            text=a_msg.content,
+async def _commit_turn(
+    session_id: str, draft: InterviewMessage, reply: str
+) -> Tuple[InterviewMessage, InterviewMessage]:
+    """One unit of work per turn: user message, reply and TTS URL in a single commit, then TTS is queued."""
+    def unit(db: Session) -> Tuple[InterviewMessage, InterviewMessage]:
+        # Fresh rows on every call: the buffer may retry a unit after a failed group commit
+        user_msg = _new_user_message(session_id, draft.content, draft.modality)
+        a_msg = InterviewMessage(
+            session_id=session_id,
+            role="assistant",
+            modality="text",
+            content=reply,
         )
-        a_msg.tts_url = tts_url
-        db.commit()
-        db.refresh(a_msg)
+        session = db.get(InterviewSession, session_id)
+        ensure_stats(db, session)  # before the new rows are flushed
+        db.add(user_msg)
+        db.add(a_msg)
+        record_messages(session, [user_msg, a_msg])
+        _stage_reply_audio(a_msg)
+        return user_msg, a_msg
+
+    user_msg, a_msg = await commit_unit(session_id, unit)
+    # 🔊 Queue TTS for the assistant reply
+    await _queue_reply_audio(session_id, a_msg)
+
+    schedule_sentiment(session_id, user_msg.id, user_msg.content)
+    # Fold turns that left the verbatim window into the session summary
+    schedule_summary_update(session_id)
+    return user_msg, a_msg
+
+
+async def _keep_user_message(session_id: str, draft: InterviewMessage) -> InterviewMessage | None:
+    """No reply was generated: commit the candidate's message on its own so the answer isn't lost."""
+    def unit(db: Session) -> InterviewMessage:
+        user_msg = _new_user_message(session_id, draft.content, draft.modality)
+        session = db.get(InterviewSession, session_id)
+        ensure_stats(db, session)
+        db.add(user_msg)
+        record_messages(session, [user_msg])
+        return user_msg
+
+    try:
+        user_msg = await commit_unit(session_id, unit)
     except Exception as e:
-        print(f"[TTS] Error generating audio for reply: {e}")
+        # The caller re-raises the LLM error; don't mask it
+        print(f"[Interview] Could not store the message for session {session_id}: {e}")
+        return None
+    schedule_sentiment(session_id, user_msg.id, user_msg.content)
+    return user_msg
+
+
+async def messages_after(db: AsyncSession, session_id: str, after_id: int) -> List[InterviewMessage]:
+    """Messages with id > after_id, oldest first (served by the (session_id, id) index)."""
+    rows = await db.scalars(
+        select(InterviewMessage)
+        .where(InterviewMessage.session_id == session_id, InterviewMessage.id > after_id)
+        .order_by(InterviewMessage.id.asc())
+    )
+    return list(rows)
+
+
+async def message_page(
+    db: AsyncSession, session_id: str, before_id: int | None, limit: int
+) -> Tuple[List[InterviewMessage], bool]:
+    """
+    Up to `limit` messages older than `before_id` (newest page when None),
+    returned oldest first, plus whether older messages remain.
+    """
+    q = select(InterviewMessage).where(InterviewMessage.session_id == session_id)
+    if before_id is not None:
+        q = q.where(InterviewMessage.id < before_id)
+    rows = list(await db.scalars(q.order_by(InterviewMessage.id.desc()).limit(limit + 1)))
+    has_more = len(rows) > limit
+    return list(reversed(rows[:limit])), has_more
+
+
+async def session_exists(db: AsyncSession, session_id: str) -> bool:
+    return await db.scalar(
+        select(InterviewSession.session_id).where(InterviewSession.session_id == session_id)
+    ) is not None
+
+
+async def process_message(
+    db: AsyncSession,
+    session_id: str,
+    user_text: str,
+    modality: str,
+    since_message_id: int | None = None,
+):
+    """
+    Store the candidate's message, generate and store the reply.
+
+    Both are committed together once the reply exists. If generation fails
+    (or the caller is cancelled), the message is committed alone and the
+    error propagates.
+
+    The returned history is the delta after `since_message_id`; without a
+    cursor it is just this turn's messages. Full history is paged through
+    message_page().
+    """
+    await wait_for_writes(session_id)
+    session = await db.get(InterviewSession, session_id)
+    if not session:
+        return None, None, None
+
+    draft = _new_user_message(session_id, user_text, modality)
+
+    prompt = await db.run_sync(_reply_prompt, session, draft)
+    try:
+        reply = await ask_gemini(prompt, user_key=session_id)
+    except (Exception, asyncio.CancelledError):
+        await asyncio.shield(_keep_user_message(session_id, draft))
+        raise
+
+    user_msg, a_msg = await _commit_turn(session_id, draft, reply)
 
+    after_id = since_message_id if since_message_id is not None else user_msg.id - 1
+    history = await messages_after(db, session_id, after_id)
     return user_msg, a_msg, history
 
+
+async def stream_message(session_id: str, user_text: str, modality: str):
+    """
+    Streaming variant of process_message.
+
+    Yields (event, data) pairs: "user" echoing the candidate's message,
+    "token" for each chunk of the reply as Gemini produces it, then "done"
+    with the stored message ids and audio status. The turn is committed as
+    one unit only when the reply is complete; if generation fails, the
+    candidate's message is committed alone and "error" carries its id.
+
+    Uses its own DB session because it outlives the request handler.
+    """
+    await wait_for_writes(session_id)
+    async with AsyncSessionLocal() as db:
+        session = await db.get(InterviewSession, session_id)
+        if not session:
+            yield "error", {"detail": "Session not found"}
+            return
+        draft = _new_user_message(session_id, user_text, modality)
+        prompt = await db.run_sync(_reply_prompt, session, draft)
+    # Nothing else is read; don't hold a connection while streaming
+
+    chunks: List[str] = []
+    try:
+        yield "user", {"role": "user", "content": draft.content}
+        async for chunk in stream_gemini(prompt, user_key=session_id):
+            chunks.append(chunk)
+            yield "token", {"text": chunk}
+    except Exception as e:
+        print(f"[LLM] Streaming reply failed for session {session_id}: {e}")
+        user_msg = await _keep_user_message(session_id, draft)
+        yield "error", {
+            "detail": "Reply generation failed",
+            "user_message_id": user_msg.id if user_msg is not None else None,
+        }
+        return
+    except (GeneratorExit, asyncio.CancelledError):
+        # Client went away mid-reply: still keep the answer
+        await asyncio.shield(_keep_user_message(session_id, draft))
+        raise
+
+    user_msg, a_msg = await _commit_turn(session_id, draft, "".join(chunks))
+    yield "done", {
+        "user_message_id": user_msg.id,
+        "message_id": a_msg.id,
+        "content": a_msg.content,
+        "tts_url": a_msg.tts_url,
+        "tts_status": get_audio_status(a_msg.id, a_msg.tts_url) if a_msg.tts_url else None,
+    }
+
+# ----------------------------
+# Sentiment summary
+# ----------------------------
+async def repair_sentiment_stats(session_id: str) -> bool:
+    """
+    Rebuild the session's aggregates from its messages if they have drifted.
+    Returns True when they were already consistent.
+    """
+    def unit(db: Session) -> bool:
+        consistent, rebuilt = verify_stats(db, session_id)
+        if not consistent:
+            session = db.query(InterviewSession).filter_by(session_id=session_id).first()
+            if session is not None:
+                session.sentiment_stats = rebuilt
+        return consistent
+
+    consistent = await commit_unit(session_id, unit)
+    if not consistent:
+        print(f"[Sentiment] Rebuilt aggregates for session {session_id}")
+    return consistent
+
+
+async def session_sentiment_summary(
+    db: AsyncSession, session_id: str, verify: bool = False
+) -> Dict[str, Any] | None:
+    """
+    Chart summary straight from the session row; the transcript is only read
+    when `verify` asks for a consistency check (or the row predates aggregates).
+    """
+    await wait_for_writes(session_id)
+    # Re-read: the caller may hold a copy from before its latest commit_unit
+    session = await db.get(InterviewSession, session_id, populate_existing=True)
+    if not session:
+        return None
+    if verify or session.sentiment_stats is None:
+        await repair_sentiment_stats(session_id)
+        await db.refresh(session)
+    return summary_from_stats(session.sentiment_stats)
+
+
 # ----------------------------
 # Evaluation
 # ----------------------------
 async def evaluate_session(
-    db: Session, session_id: str
+    db: AsyncSession, session_id: str
 ) -> Tuple[str, str, List[Dict[str, Any]], Dict[str, Any]]:
     """
     Evaluate a full mock interview session:
     - Builds an annotated transcript with sentiment
-    - Asks Gemini for a markdown-style evaluation
+    - Asks Gemini for a markdown-style evaluation (cached; map-reduce for
+      long sessions, see app/services/evaluation.py)
     - Computes structured sentiment stats for visualizations
 
     Returns:
@@ -151,68 +443,40 @@ async def evaluate_session(
         sentiment_timeline (list[dict])
         sentiment_summary (dict)
     """
-    session: InterviewSession | None = (
-        db.query(InterviewSession).filter_by(session_id=session_id).first()
-    )
+    session: InterviewSession | None = await db.get(InterviewSession, session_id)
     if not session:
         raise ValueError("Session not found")
 
-    history: List[InterviewMessage] = (
-        db.query(InterviewMessage)
-        .filter_by(session_id=session_id)
-        .order_by(InterviewMessage.created_at.asc())
-        .all()
-    )
-
-    # ---------- Build annotated transcript for Gemini ----------
-    def format_sentiment_for_llm(sent: Any) -> str:
-        if not sent:
-            return "none"
-        try:
-            label = sent.get("sentiment_label")
-            score = sent.get("sentiment_score")
-            emotions = sent.get("emotions", [])
-            top_emotions = ", ".join(
-                f"{e.get('label')} ({e.get('score'):.2f})"
-                for e in emotions[:3]
-                if isinstance(e, dict) and "label" in e and "score" in e
-            )
-            return f"label={label}, score={score:.2f}, emotions=[{top_emotions}]"
-        except Exception:
-            return str(sent)
-
-    annotated_lines: List[str] = []
-    for m in history:
-        ann = format_sentiment_for_llm(m.sentiment)
-        annotated_lines.append(f"{m.role.upper()}: {m.content} [sentiment={ann}]")
-
-    hist_str = "\n".join(annotated_lines)
-
-    # ---------- Call Gemini for qualitative evaluation ----------
-    prompt = f"""
-You are an interview evaluator.
-
-Evaluate this mock interview:
+    # Only wait for sentiment that is still in flight for this session
+    await wait_for_pending_sentiment(session_id)
+    await wait_for_writes(session_id)
+    db.expire_all()
 
-Job: {session.job_title} at {session.company}
-Matched skills: {session.matched_skills}
+    session = await db.get(InterviewSession, session_id)
+    history: List[InterviewMessage] = await messages_after(db, session_id, 0)
 
-Full annotated transcript (each line shows role, content, and sentiment):
-{hist_str}
-
-Provide:
-- An overall numeric score out of 10 (e.g., "Overall score: 7.5/10")
-- Key strengths (bullet list)
-- Key weaknesses (bullet list)
-- 3–5 concrete improvement suggestions
-- A transparent explanation that explicitly references sentiment/emotion patterns
-  (e.g., "Your answers started confident but became more negative when discussing X...").
-
-Use **plain text** with markdown-style headings and bullet points.
-Do NOT wrap the answer in code fences.
-"""
-
-    evaluation_text = await ask_gemini(prompt)
+    # Backfill anything missed (e.g. tasks lost on a restart)
+    missing = [m for m in history if m.role == "user" and m.sentiment is None and m.content]
+    backfilled = False
+    if missing:
+        try:
+            results = await analyze_texts_sentiment_bulk([m.content for m in missing])
+        except Exception as e:
+            print(f"[Sentiment] Backfill failed for session {session_id}: {e}")
+            results = []
+        updates = [_sentiment_unit(m.id, result) for m, result in zip(missing, results)]
+        if updates:
+            await commit_unit(session_id, lambda udb: [update(udb) for update in updates])
+            backfilled = True
+        for m, result in zip(missing, results):
+            m.sentiment = result
+
+    # ---------- Sentiment summary (running aggregates on the session row) ----------
+    summary = await session_sentiment_summary(db, session_id)
+
+    # ---------- Gemini evaluation, cached per (session, last message id) ----------
+    # A backfill changed the annotations, so an evaluation cached before it is stale
+    evaluation_text = await evaluate_transcript(db, session, history, summary, reuse=not backfilled)
 
     # You can later parse out an "explanation" section if desired.
     explanation = (
@@ -232,42 +496,4 @@ Do NOT wrap the answer in code fences.
             }
         )
 
-    # ---------- Build sentiment_summary for charts ----------
-    total_messages = len(history)
-    user_messages = sum(1 for m in history if m.role == "user")
-    assistant_messages = sum(1 for m in history if m.role == "assistant")
-
-    user_with_sentiment = [
-        m for m in history if m.role == "user" and m.sentiment is not None
-    ]
-
-    counts_by_label: Counter[str] = Counter()
-    score_buckets: Dict[str, list[float]] = defaultdict(list)
-
-    for m in user_with_sentiment:
-        try:
-            label = m.sentiment.get("sentiment_label")
-            score = float(m.sentiment.get("sentiment_score", 0.0))
-        except Exception:
-            continue
-
-        if not label:
-            continue
-
-        counts_by_label[label] += 1
-        score_buckets[label].append(score)
-
-    avg_sentiment_score_by_label: Dict[str, float] = {}
-    for label, scores in score_buckets.items():
-        if scores:
-            avg_sentiment_score_by_label[label] = sum(scores) / len(scores)
-
-    sentiment_summary: Dict[str, Any] = {
-        "total_messages": total_messages,
-        "user_messages": user_messages,
-        "assistant_messages": assistant_messages,
-        "counts_by_label": dict(counts_by_label),
-        "avg_sentiment_score_by_label": avg_sentiment_score_by_label,
-    }
-
-    return evaluation_text, explanation, sentiment_timeline, sentiment_summary
+    return evaluation_text, explanation, sentiment_timeline, summary
@@ -1,6 +1,13 @@
 # This module contains CRUD operations for job postings.
-from sqlalchemy.orm import Session
+import base64
+import json
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query, Session
 from app.models.job import JobPosting
+from app.models.interview import InterviewQuestionBank
 from app.schemas.job import JobCreate, JobUpdate
 
 # Methods for CRUD operations
@@ -8,9 +15,76 @@ from app.schemas.job import JobCreate, JobUpdate
 def get_job(db: Session, job_id: int):
     return db.query(JobPosting).filter(JobPosting.id == job_id).first()
 
-# Get all jobs with pagination
-def get_jobs(db: Session, skip: int = 0, limit: int = 10):
-    return db.query(JobPosting).offset(skip).limit(limit).all()
+# Keyset cursor: opaque token for the (job_posting_date, id) of the last row of a page
+def encode_cursor(job: JobPosting) -> str:
+    key = {"d": job.job_posting_date.isoformat() if job.job_posting_date else None, "i": job.id}
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> tuple[Optional[date], int]:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return (date.fromisoformat(key["d"]) if key["d"] else None), int(key["i"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+# Apply the listing filters (each one is backed by an index, see models/job.py)
+def filter_jobs(
+    query: Query,
+    work_type: Optional[str] = None,
+    country: Optional[str] = None,
+    location: Optional[str] = None,
+    company: Optional[str] = None,
+    posted_from: Optional[date] = None,
+    posted_to: Optional[date] = None,
+) -> Query:
+    for column, value in (
+        (JobPosting.work_type, work_type),
+        (JobPosting.country, country),
+        (JobPosting.location, location),
+        (JobPosting.company, company),
+    ):
+        if value is not None:
+            query = query.filter(column == value)
+    if posted_from is not None:
+        query = query.filter(JobPosting.job_posting_date >= posted_from)
+    if posted_to is not None:
+        query = query.filter(JobPosting.job_posting_date <= posted_to)
+    return query
+
+# Queries for one page, newest first. Dated postings come first, ordered by
+# (job_posting_date, id) descending; postings without a date follow by id.
+# The two parts are separate queries because a row-value comparison never
+# matches NULL, and each one walks an index in order and stops at the limit.
+def page_queries(db: Session, limit: int = 10, cursor: Optional[str] = None, **filters) -> list[Query]:
+    after_date, after_id = decode_cursor(cursor) if cursor else (None, None)
+    base = filter_jobs(db.query(JobPosting), **filters)
+    queries = []
+
+    if after_id is None or after_date is not None:
+        dated = base.filter(JobPosting.job_posting_date.isnot(None))
+        if after_date is not None:
+            dated = dated.filter(tuple_(JobPosting.job_posting_date, JobPosting.id) < (after_date, after_id))
+        queries.append(dated.order_by(JobPosting.job_posting_date.desc(), JobPosting.id.desc()).limit(limit + 1))
+
+    # A posting-date range excludes undated postings anyway
+    if filters.get("posted_from") is None and filters.get("posted_to") is None:
+        undated = base.filter(JobPosting.job_posting_date.is_(None))
+        if after_id is not None and after_date is None:
+            undated = undated.filter(JobPosting.id < after_id)
+        queries.append(undated.order_by(JobPosting.id.desc()).limit(limit + 1))
+    return queries
+
+# Get one page of jobs with keyset pagination: (jobs, next cursor or None).
+# Raises ValueError for a malformed cursor.
+def get_jobs_page(db: Session, limit: int = 10, cursor: Optional[str] = None, **filters):
+    jobs = []
+    for query in page_queries(db, limit, cursor, **filters):
+        if len(jobs) > limit:
+            break
+        jobs += query.limit(limit + 1 - len(jobs)).all()
+    if len(jobs) <= limit:
+        return jobs, None
+    return jobs[:limit], encode_cursor(jobs[limit - 1])
 
 # Create a new job
 def create_job(db: Session, job_data: JobCreate):
@@ -36,6 +110,8 @@ def delete_job(db: Session, job_id: int):
     job = get_job(db, job_id)
     if not job:
         return None
+    # Remove the job's pre-generated interview questions with it
+    db.query(InterviewQuestionBank).filter(InterviewQuestionBank.job_id == job_id).delete()
     db.delete(job)
     db.commit()
     return job
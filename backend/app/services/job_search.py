@@ -0,0 +1,120 @@
+# app/services/job_search.py
+import html
+import os
+import re
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.job import JobPosting
+
+# ------------------------
+# Config
+# ------------------------
+# BM25 weight per indexed column: job_title, role, job_description, responsibilities, skills
+JOB_SEARCH_WEIGHTS = [float(w) for w in os.getenv("JOB_SEARCH_WEIGHTS", "10,6,1,2,4").split(",")]
+JOB_SEARCH_SNIPPET_TOKENS = int(os.getenv("JOB_SEARCH_SNIPPET_TOKENS", 24))
+# FTS5 scores every match before sorting, so a word found in a third of a
+# million postings costs about a second. Queries with more matches than this
+# are ranked among their newest (highest id) matches only; BM25 statistics
+# still come from the whole index, so scores stay comparable.
+JOB_SEARCH_MAX_CANDIDATES = int(os.getenv("JOB_SEARCH_MAX_CANDIDATES", 2000))
+HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE, ELLIPSIS = "<mark>", "</mark>", "…"
+# FTS5 marks matches with these private-use characters; the text is escaped
+# before they become HIGHLIGHT_OPEN / HIGHLIGHT_CLOSE (postings are scraped HTML-ish text)
+_OPEN_SENTINEL, _CLOSE_SENTINEL = "\ue000", "\ue001"
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+# ORDER BY rank with a LIMIT lets FTS5 sort inside the virtual table; the
+# subquery finds the id of the JOB_SEARCH_MAX_CANDIDATES-th newest match by
+# walking the doclist without scoring (0 when there are fewer matches)
+_SEARCH_SQL = text(
+    """
+    SELECT rowid,
+           rank,
+           highlight(job_postings_fts, 0, :open, :close) AS title_highlight,
+           snippet(job_postings_fts, -1, :open, :close, :ellipsis, :tokens) AS snippet
+    FROM job_postings_fts
+    WHERE job_postings_fts MATCH :query
+      AND rank MATCH :rank
+      AND rowid >= coalesce((
+          SELECT rowid FROM job_postings_fts
+          WHERE job_postings_fts MATCH :query
+          ORDER BY rowid DESC
+          LIMIT 1 OFFSET :window
+      ), 0)
+    ORDER BY rank
+    LIMIT :limit
+    """
+)
+
+
+def to_match_query(q: str, prefix: bool = False) -> str:
+    """
+    FTS5 query for free text: every word must match (implicit AND). Words
+    are quoted, so user input can never be parsed as FTS5 syntax ("c++",
+    "node.js", "-"). Stemming already matches other forms of whole words;
+    `prefix` also lets the last word match as a prefix, for search-as-you-type
+    (slower: FTS5 merges the doclists of every matching term).
+    """
+    terms = _TERM.findall(q)
+    if not terms:
+        return ""
+    quoted = [f'"{t}"' for t in terms]
+    if prefix:
+        quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _marked_html(text: str | None) -> str | None:
+    """Escape posting text, then turn the FTS5 sentinels into highlight tags."""
+    if text is None:
+        return None
+    # A stray private-use character in a posting can at worst add an unbalanced <mark>
+    escaped = html.escape(text)
+    return escaped.replace(_OPEN_SENTINEL, HIGHLIGHT_OPEN).replace(_CLOSE_SENTINEL, HIGHLIGHT_CLOSE)
+
+
+def search_jobs(db: Session, q: str, limit: int = 20, prefix: bool = False) -> List[Dict[str, Any]]:
+    """
+    Best-matching postings for `q`, best first: {"job", "score", "title_highlight", "snippet"}.
+    `score` is BM25 (higher is better); the highlight and snippet are
+    HTML-escaped text with matches wrapped in HIGHLIGHT_OPEN / HIGHLIGHT_CLOSE.
+    """
+    query = to_match_query(q, prefix)
+    if not query:
+        return []
+    rows = db.execute(
+        _SEARCH_SQL,
+        {
+            "query": query,
+            "rank": f"bm25({', '.join(str(w) for w in JOB_SEARCH_WEIGHTS)})",
+            "open": _OPEN_SENTINEL,
+            "close": _CLOSE_SENTINEL,
+            "ellipsis": ELLIPSIS,
+            "tokens": JOB_SEARCH_SNIPPET_TOKENS,
+            "window": max(JOB_SEARCH_MAX_CANDIDATES, limit) - 1,
+            "limit": limit,
+        },
+    ).all()
+    if not rows:
+        return []
+
+    jobs = {job.id: job for job in db.query(JobPosting).filter(JobPosting.id.in_([r.rowid for r in rows]))}
+    return [
+        {
+            "job": jobs[r.rowid],
+            "score": -r.rank,  # FTS5 ranks ascending (more negative = better)
+            "title_highlight": _marked_html(r.title_highlight),
+            "snippet": _marked_html(r.snippet),
+        }
+        for r in rows
+        if r.rowid in jobs
+    ]
+
+
+def optimize_search_index(db: Session) -> None:
+    """Merge the index b-trees into one (after bulk loads); queries then read fewer pages."""
+    db.execute(text("INSERT INTO job_postings_fts (job_postings_fts) VALUES ('optimize')"))
@@ -1,10 +1,356 @@
 # app/services/llm.py
-import google.generativeai as genai
+import asyncio
+import bisect
 import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import google.generativeai as genai
+from dotenv import load_dotenv
 
+load_dotenv()
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-MODEL = genai.GenerativeModel("gemini-2.5-flash")
 
-async def ask_gemini(prompt: str) -> str:
-    resp = MODEL.generate_content(prompt)
-    return resp.text if resp and resp.text else ""
+# ------------------------
+# Config
+# ------------------------
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))           # whole process
+LLM_MAX_CONCURRENCY_PER_USER = int(os.getenv("LLM_MAX_CONCURRENCY_PER_USER", 2))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", 30))        # one attempt
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", 60))      # all attempts
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 3))
+LLM_RETRY_BASE_SECONDS = 0.5
+LLM_RETRY_MAX_SECONDS = 8.0
+
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
+
+
+def _transient_errors() -> tuple[type[BaseException], ...]:
+    errors: list[type[BaseException]] = [TimeoutError, FutureTimeoutError, ConnectionError]
+    try:
+        from google.api_core import exceptions as gexc
+        errors += [
+            gexc.ResourceExhausted,      # 429 / quota
+            gexc.TooManyRequests,
+            gexc.ServiceUnavailable,     # 503
+            gexc.InternalServerError,    # 500
+            gexc.DeadlineExceeded,       # 504
+        ]
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+TRANSIENT_ERRORS = _transient_errors()
+
+
+class LLMTimeoutError(TimeoutError):
+    """Raised when a call exhausts its deadline."""
+
+
+class GeminiClient:
+    """
+    Gemini client that never blocks the event loop.
+
+    - Calls run on a dedicated thread pool whose size is the global
+      concurrency limit, shared by async (interview) and sync (resume
+      matcher) callers. Async callers wait for a slot on a semaphore of
+      the same size instead of queueing inside the pool.
+    - Async callers may pass a user key to cap concurrent calls per user,
+      so one user's burst cannot take every slot.
+    - Each attempt has a timeout, counted from when a worker starts the
+      call (waiting for a slot only counts against the deadline); the whole
+      call has a deadline, and transient errors are retried with
+      full-jitter exponential backoff.
+    - Latency is recorded in a fixed-bucket histogram (see stats()).
+    """
+
+    def __init__(
+        self,
+        default_model: str = GEMINI_MODEL,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_per_user: int = LLM_MAX_CONCURRENCY_PER_USER,
+    ):
+        self.default_model = default_model
+        self.max_per_user = max_per_user
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="gemini")
+        self._slots = asyncio.Semaphore(max_concurrency)  # async callers; binds to the loop on first use
+        self._models: dict[str, genai.GenerativeModel] = {}
+        self._models_lock = threading.Lock()
+
+        self._user_slots: dict[str, asyncio.Semaphore] = {}
+        self._user_active: dict[str, int] = {}
+
+        self._stats_lock = threading.Lock()
+        self._buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._calls = 0
+        self._latency_sum = 0.0
+        self._retries = 0
+        self._errors = 0
+        self._timeouts = 0
+
+    # ---------- model / call ----------
+    def _model(self, name: str | None) -> genai.GenerativeModel:
+        name = name or self.default_model
+        with self._models_lock:
+            if name not in self._models:
+                self._models[name] = genai.GenerativeModel(name)
+            return self._models[name]
+
+    def _call(self, prompt: str, model: str | None, timeout: float) -> str:
+        resp = self._model(model).generate_content(
+            prompt, request_options={"timeout": timeout}
+        )
+        return resp.text if resp and resp.text else ""
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(LLM_RETRY_MAX_SECONDS, LLM_RETRY_BASE_SECONDS * 2 ** attempt))
+
+    def _submit(self, on_start, fn, *args) -> Future:
+        """Run fn on the pool, calling on_start() from the worker just before it."""
+        def run():
+            on_start()
+            return fn(*args)
+        return self._pool.submit(run)
+
+    async def _worker_started(self, started: asyncio.Event, deadline: float) -> None:
+        # A slot is free, but a sync caller may still hold the worker for a moment
+        if not started.is_set():
+            await asyncio.wait_for(started.wait(), max(0.0, deadline - time.monotonic()))
+
+    # ---------- async ----------
+    async def generate(self, prompt: str, model: str | None = None, user_key: str | None = None) -> str:
+        if user_key is None:
+            return await self._generate(prompt, model)
+
+        slot = self._user_slots.setdefault(user_key, asyncio.Semaphore(self.max_per_user))
+        self._user_active[user_key] = self._user_active.get(user_key, 0) + 1
+        try:
+            async with slot:
+                return await self._generate(prompt, model)
+        finally:
+            self._user_active[user_key] -= 1
+            if not self._user_active[user_key]:
+                self._user_active.pop(user_key, None)
+                self._user_slots.pop(user_key, None)
+
+    async def _generate(self, prompt: str, model: str | None) -> str:
+        deadline = time.monotonic() + LLM_DEADLINE_SECONDS
+        attempt = 0
+        while True:
+            async with self._slots:
+                timeout = min(LLM_TIMEOUT_SECONDS, deadline - time.monotonic())
+                if timeout <= 0:
+                    self._record_failure(timeout=True)
+                    raise LLMTimeoutError("Gemini call exceeded its deadline")
+
+                loop = asyncio.get_running_loop()
+                started = asyncio.Event()
+                future = self._submit(lambda: loop.call_soon_threadsafe(started.set), self._call, prompt, model, timeout)
+                try:
+                    await self._worker_started(started, deadline)
+                    start = time.perf_counter()
+                    text = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+                    self._record(time.perf_counter() - start)
+                    return text
+                except TRANSIENT_ERRORS + (asyncio.TimeoutError,) as e:
+                    future.cancel()  # drop it if it never left the queue
+                    if attempt >= LLM_MAX_RETRIES:
+                        self._record_failure(timeout=isinstance(e, (asyncio.TimeoutError, TimeoutError)))
+                        raise
+                    delay = min(self._backoff(attempt), max(0.0, deadline - time.monotonic()))
+                    error = type(e).__name__
+                except Exception:
+                    self._record_failure()
+                    raise
+            # Back off without holding a slot
+            print(f"[LLM] Transient error ({error}); retry {attempt + 1} in {delay:.2f}s")
+            self._record_retry()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    # ---------- streaming ----------
+    async def stream(self, prompt: str, model: str | None = None, user_key: str | None = None):
+        """
+        Async generator of text chunks as Gemini produces them.
+
+        The blocking SDK iterator runs on the shared pool and hands chunks
+        to the loop through a queue. Transient errors are retried only
+        before the first chunk; after that a failure ends the stream.
+        """
+        if user_key is None:
+            async for chunk in self._stream(prompt, model):
+                yield chunk
+            return
+
+        slot = self._user_slots.setdefault(user_key, asyncio.Semaphore(self.max_per_user))
+        self._user_active[user_key] = self._user_active.get(user_key, 0) + 1
+        try:
+            async with slot:
+                async for chunk in self._stream(prompt, model):
+                    yield chunk
+        finally:
+            self._user_active[user_key] -= 1
+            if not self._user_active[user_key]:
+                self._user_active.pop(user_key, None)
+                self._user_slots.pop(user_key, None)
+
+    async def _stream(self, prompt: str, model: str | None):
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + LLM_DEADLINE_SECONDS
+        attempt = 0
+        while True:
+            queue: asyncio.Queue = asyncio.Queue()
+            cancelled = threading.Event()
+            done = object()
+
+            def produce(timeout: float):
+                try:
+                    resp = self._model(model).generate_content(
+                        prompt, stream=True, request_options={"timeout": timeout}
+                    )
+                    for chunk in resp:
+                        if cancelled.is_set():
+                            break
+                        text = getattr(chunk, "text", "") or ""
+                        if text:
+                            loop.call_soon_threadsafe(queue.put_nowait, text)
+                    loop.call_soon_threadsafe(queue.put_nowait, done)
+                except BaseException as e:
+                    loop.call_soon_threadsafe(queue.put_nowait, e)
+
+            await self._slots.acquire()
+            timeout = min(LLM_TIMEOUT_SECONDS, deadline - time.monotonic())
+            if timeout <= 0:
+                self._slots.release()
+                self._record_failure(timeout=True)
+                raise LLMTimeoutError("Gemini call exceeded its deadline")
+
+            started = asyncio.Event()
+            try:
+                future = self._submit(lambda: loop.call_soon_threadsafe(started.set), produce, timeout)
+            except BaseException:
+                self._slots.release()
+                raise
+            # The slot follows the producer, not the consumer: chunks buffer in the
+            # queue, so a slow SSE client never holds a process-wide slot
+            future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._slots.release))
+            emitted = False
+            try:
+                await self._worker_started(started, deadline)
+                start = time.perf_counter()
+                while True:
+                    # Each chunk (including the first) must arrive within the attempt timeout
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                    if item is done:
+                        self._record(time.perf_counter() - start)
+                        return
+                    if isinstance(item, BaseException):
+                        raise item
+                    emitted = True
+                    yield item
+            except TRANSIENT_ERRORS + (asyncio.TimeoutError,) as e:
+                cancelled.set()
+                future.cancel()
+                if emitted or attempt >= LLM_MAX_RETRIES:
+                    self._record_failure(timeout=isinstance(e, (asyncio.TimeoutError, TimeoutError)))
+                    raise
+                delay = min(self._backoff(attempt), max(0.0, deadline - time.monotonic()))
+                error = type(e).__name__
+            except (GeneratorExit, asyncio.CancelledError):
+                # Client went away: stop pulling chunks from the SDK
+                cancelled.set()
+                future.cancel()
+                raise
+            except Exception:
+                cancelled.set()
+                future.cancel()
+                self._record_failure()
+                raise
+            print(f"[LLM] Transient stream error ({error}); retry {attempt + 1} in {delay:.2f}s")
+            self._record_retry()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    # ---------- sync (for code already running in a worker thread) ----------
+    def generate_sync(self, prompt: str, model: str | None = None) -> str:
+        deadline = time.monotonic() + LLM_DEADLINE_SECONDS
+        attempt = 0
+        while True:
+            timeout = min(LLM_TIMEOUT_SECONDS, deadline - time.monotonic())
+            if timeout <= 0:
+                self._record_failure(timeout=True)
+                raise LLMTimeoutError("Gemini call exceeded its deadline")
+
+            started = threading.Event()
+            future = self._submit(started.set, self._call, prompt, model, timeout)
+            try:
+                # Waiting for a free worker only counts against the deadline
+                if not started.wait(max(0.0, deadline - time.monotonic())):
+                    raise FutureTimeoutError()
+                start = time.perf_counter()
+                text = future.result(timeout=timeout)
+                self._record(time.perf_counter() - start)
+                return text
+            except TRANSIENT_ERRORS as e:
+                future.cancel()
+                if attempt >= LLM_MAX_RETRIES:
+                    self._record_failure(timeout=isinstance(e, TimeoutError))
+                    raise
+                delay = min(self._backoff(attempt), max(0.0, deadline - time.monotonic()))
+                print(f"[LLM] Transient error ({type(e).__name__}); retry {attempt + 1} in {delay:.2f}s")
+                self._record_retry()
+                time.sleep(delay)
+                attempt += 1
+            except Exception:
+                self._record_failure()
+                raise
+
+    # ---------- metrics ----------
+    def _record(self, latency: float) -> None:
+        with self._stats_lock:
+            self._calls += 1
+            self._latency_sum += latency
+            self._buckets[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def _record_retry(self) -> None:
+        with self._stats_lock:
+            self._retries += 1
+
+    def _record_failure(self, timeout: bool = False) -> None:
+        with self._stats_lock:
+            self._errors += 1
+            if timeout:
+                self._timeouts += 1
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            labels = [f"le_{b}s" for b in LATENCY_BUCKETS] + ["le_inf"]
+            cumulative, running = {}, 0
+            for label, count in zip(labels, self._buckets):
+                running += count
+                cumulative[label] = running
+            return {
+                "calls": self._calls,
+                "avg_latency_s": round(self._latency_sum / self._calls, 3) if self._calls else 0.0,
+                "latency_histogram": cumulative,
+                "retries": self._retries,
+                "errors": self._errors,
+                "timeouts": self._timeouts,
+                "active_users": len(self._user_active),
+            }
+
+
+gemini = GeminiClient()
+
+
+async def ask_gemini(prompt: str, user_key: str | None = None) -> str:
+    return await gemini.generate(prompt, user_key=user_key)
+
+
+def stream_gemini(prompt: str, user_key: str | None = None):
+    """Async iterator of reply chunks; see GeminiClient.stream."""
+    return gemini.stream(prompt, user_key=user_key)
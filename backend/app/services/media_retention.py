@@ -0,0 +1,178 @@
+# app/services/media_retention.py
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.models.interview import InterviewMessage, InterviewQuestionBank, InterviewSession
+
+# Same layout as app/services/audio.py, resolved here so the CLI does not
+# have to load Whisper/TTS just to clean up files.
+BASE_DIR = Path(__file__).resolve().parents[2]
+AUDIO_DIR = BASE_DIR / "media" / "audio"
+
+# ------------------------
+# Config
+# ------------------------
+MEDIA_MAX_AGE_DAYS = float(os.getenv("MEDIA_MAX_AGE_DAYS", 30))
+MEDIA_MAX_BYTES = int(os.getenv("MEDIA_MAX_BYTES", 2 * 1024 * 1024 * 1024))  # 2 GB
+MEDIA_GC_INTERVAL_SECONDS = int(os.getenv("MEDIA_GC_INTERVAL_SECONDS", 3600))
+# Files younger than this are never treated as orphans: their tts_url may not be committed yet
+ORPHAN_GRACE_SECONDS = 3600
+
+
+def _scan(audio_dir: Path) -> list[tuple[Path, int, float]]:
+    """(path, size, last_used) for every file; last_used = newest of atime/mtime."""
+    files = []
+    for path in audio_dir.iterdir():
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        if path.is_file():
+            files.append((path, st.st_size, max(st.st_atime, st.st_mtime)))
+    return files
+
+
+def _references(db: Session) -> dict[str, datetime]:
+    """filename -> newest session (or question bank) created_at that still points at it."""
+    rows = (
+        db.query(InterviewMessage.tts_url, InterviewSession.created_at)
+        .join(InterviewSession, InterviewSession.session_id == InterviewMessage.session_id)
+        .filter(InterviewMessage.tts_url != None)
+        .all()
+    )
+    # Question bank greetings are pre-rendered before any message uses them
+    for openings, created_at in db.query(InterviewQuestionBank.openings, InterviewQuestionBank.created_at):
+        rows += [(o.get("tts_url"), created_at) for o in openings or [] if isinstance(o, dict) and o.get("tts_url")]
+
+    refs: dict[str, datetime] = {}
+    for tts_url, created_at in rows:
+        name = os.path.basename(tts_url)
+        created_at = created_at or datetime.min
+        if name not in refs or created_at > refs[name]:
+            refs[name] = created_at
+    return refs
+
+
+def _clear_bank_urls(db: Session, urls: set[str]) -> int:
+    """Null deleted files in question bank openings; the next session using one re-renders it."""
+    cleared = 0
+    for bank in db.query(InterviewQuestionBank):
+        openings = [dict(o) for o in bank.openings or []]
+        dead = [o for o in openings if o.get("tts_url") in urls]
+        for o in dead:
+            o["tts_url"] = None
+        if dead:
+            bank.openings = openings  # JSON columns only notice reassignment
+            cleared += len(dead)
+    return cleared
+
+
+def collect_garbage(
+    db: Session,
+    audio_dir: Path = AUDIO_DIR,
+    max_age_days: float = MEDIA_MAX_AGE_DAYS,
+    max_bytes: int = MEDIA_MAX_BYTES,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Enforce the retention policy on the audio directory.
+
+    1. Leftover temp files and unreferenced files past the grace period go.
+    2. Files whose newest referencing session is older than max_age_days go.
+    3. If the rest still exceeds max_bytes, least-recently-used files go.
+
+    Messages and question bank openings pointing at deleted files get their
+    tts_url cleared; the audio endpoints (and the next session using the
+    opening) re-render them on demand.
+    """
+    if not audio_dir.exists():
+        return {"scanned": 0, "deleted": 0, "freed_bytes": 0, "remaining_bytes": 0, "cleared_urls": 0}
+
+    now = time.time()
+    age_cutoff = datetime.utcnow() - timedelta(days=max_age_days)
+    refs = _references(db)
+    files = _scan(audio_dir)
+
+    doomed: dict[Path, str] = {}
+    keep: list[tuple[Path, int, float]] = []
+    for path, size, last_used in files:
+        name = path.name
+        young = now - last_used < ORPHAN_GRACE_SECONDS
+        if name.startswith("."):
+            if not young:
+                doomed[path] = "stale temp"
+        elif name not in refs:
+            if not young:
+                doomed[path] = "orphan"
+        elif refs[name] < age_cutoff:
+            doomed[path] = "expired"
+        else:
+            keep.append((path, size, last_used))
+
+    total = sum(size for _, size, _ in keep)
+    for path, size, _ in sorted(keep, key=lambda f: f[2]):  # oldest use first
+        if total <= max_bytes:
+            break
+        doomed[path] = "quota"
+        total -= size
+
+    freed = 0
+    deleted_names = []
+    sizes = {path: size for path, size, _ in files}
+    for path, reason in doomed.items():
+        if not dry_run:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+        freed += sizes.get(path, 0)
+        deleted_names.append(path.name)
+        print(f"[Media GC] {'would delete' if dry_run else 'deleted'} {path.name} ({reason})")
+
+    cleared = 0
+    if deleted_names and not dry_run:
+        urls = [f"/media/audio/{name}" for name in deleted_names if not name.startswith(".")]
+        for start in range(0, len(urls), 500):  # stay under SQLite's variable limit
+            result = db.execute(
+                update(InterviewMessage)
+                .where(InterviewMessage.tts_url.in_(urls[start:start + 500]))
+                .values(tts_url=None)
+            )
+            cleared += result.rowcount or 0
+        cleared += _clear_bank_urls(db, set(urls))
+        db.commit()
+
+    report = {
+        "scanned": len(files),
+        "deleted": len(deleted_names),
+        "freed_bytes": freed,
+        "remaining_bytes": total,
+        "cleared_urls": cleared,
+    }
+    print(f"[Media GC] {report}")
+    return report
+
+
+def run_collect_garbage(dry_run: bool = False) -> dict:
+    db = SessionLocal()
+    try:
+        return collect_garbage(db, dry_run=dry_run)
+    finally:
+        db.close()
+
+
+async def periodic_media_gc(interval: int = MEDIA_GC_INTERVAL_SECONDS) -> None:
+    """Background task: run the collector every `interval` seconds off the event loop."""
+    while True:
+        try:
+            await asyncio.to_thread(run_collect_garbage)
+        except Exception as e:
+            print(f"[Media GC] Error: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,160 @@
+# app/services/memory.py
+import asyncio
+import os
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.db.database import AsyncSessionLocal
+from app.models.interview import InterviewMessage, InterviewSession
+from app.services.llm import gemini
+from app.services.unit_of_work import commit_unit
+
+# ------------------------
+# Config
+# ------------------------
+MEMORY_RECENT_TURNS = int(os.getenv("MEMORY_RECENT_TURNS", 4))        # kept verbatim (user + assistant pairs)
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", 1500))     # summary + recent turns
+MEMORY_SUMMARY_TOKENS = int(os.getenv("MEMORY_SUMMARY_TOKENS", 300))
+# Fold only once this many messages have left the verbatim window, so the
+# summarizer runs every few turns rather than on every one
+MEMORY_SUMMARY_BATCH = int(os.getenv("MEMORY_SUMMARY_BATCH", 4))
+# Unfolded messages older than the window are shown clipped, at least this long each
+MEMORY_PENDING_MIN_TOKENS = int(os.getenv("MEMORY_PENDING_MIN_TOKENS", 40))
+MEMORY_LLM_MODEL = os.getenv("MEMORY_LLM_MODEL") or None              # None = default Gemini model
+
+RECENT_MESSAGES = 2 * MEMORY_RECENT_TURNS
+CHARS_PER_TOKEN = 4  # rough English average; close enough for a budget
+
+# session_id -> running summary task (at most one per session)
+_summary_tasks: Dict[str, asyncio.Task] = {}
+
+
+def estimate_tokens(text: str | None) -> int:
+    return (len(text or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _clip(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    return text if len(text) <= max_chars else text[:max_chars].rstrip() + " …"
+
+
+def unsummarized_messages(db: Session, session: InterviewSession) -> List[InterviewMessage]:
+    """Messages not yet folded into the summary, oldest first."""
+    q = db.query(InterviewMessage).filter(InterviewMessage.session_id == session.session_id)
+    if session.summarized_through_id is not None:
+        q = q.filter(InterviewMessage.id > session.summarized_through_id)
+    return q.order_by(InterviewMessage.id.asc()).all()
+
+
+def build_context(session: InterviewSession, messages: List[InterviewMessage], budget: int = MEMORY_TOKEN_BUDGET) -> str:
+    """
+    Prompt-ready conversation context within `budget` tokens.
+
+    `messages` are the unsummarized ones (see unsummarized_messages). The
+    summary comes first, then as many of the newest messages as fit (at most
+    MEMORY_RECENT_TURNS turns), newest always included. Older messages the
+    summarizer has not folded yet (it waits for MEMORY_SUMMARY_BATCH of them,
+    or failed) share the remaining budget, each clipped, so no turn drops
+    out of both the summary and the prompt.
+    """
+    summary = _clip(session.memory_summary or "", MEMORY_SUMMARY_TOKENS)
+    remaining = budget - estimate_tokens(summary)
+
+    recent: List[str] = []
+    for m in reversed(messages[-RECENT_MESSAGES:]):
+        line = f"{m.role}: {m.content or ''}"
+        cost = estimate_tokens(line)
+        if cost > remaining:
+            if not recent:  # one huge message: keep its head rather than nothing
+                recent.append(_clip(line, max(remaining, 1)))
+                remaining = 0
+            break
+        recent.append(line)
+        remaining -= cost
+    recent.reverse()
+
+    # Window messages squeezed out above count as pending too
+    pending = messages[:max(len(messages) - len(recent), 0)]
+    earlier: List[str] = []
+    if pending:
+        share = remaining // len(pending)
+        if share < MEMORY_PENDING_MIN_TOKENS:
+            # Too many to show all: keep the newest at a readable length
+            keep = remaining // MEMORY_PENDING_MIN_TOKENS
+            pending = pending[len(pending) - keep:] if keep else []
+            share = MEMORY_PENDING_MIN_TOKENS
+        skipped = len(messages) - len(recent) - len(pending)
+        if skipped:
+            earlier.append(f"({skipped} earlier messages omitted)")
+        earlier += [_clip(f"{m.role}: {m.content or ''}", share) for m in pending]
+
+    parts = []
+    if summary:
+        parts.append(f"Summary of earlier conversation:\n{summary}")
+    if earlier:
+        parts.append("Earlier messages (not yet summarized):\n" + "\n".join(earlier))
+    parts.append("Recent messages:\n" + "\n".join(recent))
+    return "\n\n".join(parts)
+
+
+def _summary_prompt(session: InterviewSession, previous: str, messages: List[InterviewMessage]) -> str:
+    per_message = max(MEMORY_TOKEN_BUDGET // max(len(messages), 1), 50)
+    lines = "\n".join(_clip(f"{m.role}: {m.content or ''}", per_message) for m in messages)
+    return f"""
+You maintain the running memory of a mock interview for {session.job_title} at {session.company}.
+
+Current summary:
+{previous or "(empty)"}
+
+New messages to fold in:
+{lines}
+
+Rewrite the summary so it covers everything above.
+Keep the questions asked, the candidate's key claims, examples and weak spots.
+Use at most {MEMORY_SUMMARY_TOKENS * 3 // 4} words of plain text.
+"""
+
+
+async def _update_summary(session_id: str) -> None:
+    async with AsyncSessionLocal() as db:
+        session = await db.get(InterviewSession, session_id)
+        if not session:
+            return
+        messages = await db.run_sync(unsummarized_messages, session)
+        fold = messages[:-RECENT_MESSAGES] if len(messages) > RECENT_MESSAGES else []
+        if len(fold) < MEMORY_SUMMARY_BATCH:
+            return
+        prompt = _summary_prompt(session, session.memory_summary or "", fold)
+        through_id = fold[-1].id
+
+    try:
+        summary = await gemini.generate(prompt, model=MEMORY_LLM_MODEL, user_key=session_id)
+        if not summary.strip():
+            return
+
+        def unit(udb: Session) -> None:
+            row = udb.query(InterviewSession).filter_by(session_id=session_id).first()
+            if row is not None:
+                row.memory_summary = _clip(summary.strip(), MEMORY_SUMMARY_TOKENS)
+                row.summarized_through_id = through_id
+
+        await commit_unit(session_id, unit)
+    except Exception as e:
+        print(f"[Memory] Error updating summary for session {session_id}: {e}")
+
+
+def schedule_summary_update(session_id: str) -> None:
+    """Fold old turns into the session summary in the background (no-op if one is running)."""
+    running = _summary_tasks.get(session_id)
+    if running is not None and not running.done():
+        return
+
+    task = asyncio.create_task(_update_summary(session_id))
+    _summary_tasks[session_id] = task
+
+    def _done(t: asyncio.Task) -> None:
+        if _summary_tasks.get(session_id) is t:
+            _summary_tasks.pop(session_id, None)
+
+    task.add_done_callback(_done)
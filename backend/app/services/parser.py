@@ -1,24 +1,17 @@
-import docx
 import re
 
+from app.services.documents import extract_pdf_text, extract_document_text
+
 known_skills = [
     "python", "java", "react", "django", "sql", "git", "docker", "fastapi",
     "machine learning", "data analysis", "html", "css", "linux", "aws"
 ]
 
 def extract_text_from_pdf(file_bytes: bytes) -> str:
-    import fitz
-    text = ""
-    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
-        for page in doc:
-            text += page.get_text()
-    return text
+    return extract_pdf_text(file_bytes)
 
 def extract_text_from_docx(file_bytes: bytes) -> str:
-    with open("temp.docx", "wb") as f:
-        f.write(file_bytes)
-    doc = docx.Document("temp.docx")
-    return "\n".join(p.text for p in doc.paragraphs)
+    return extract_document_text(file_bytes, "document.docx")
 
 def parse_skills(text: str) -> list:
     text = text.lower()
@@ -0,0 +1,170 @@
+# app/services/question_bank.py
+import asyncio
+import hashlib
+import json
+import os
+import random
+from typing import Any, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.db.database import AsyncSessionLocal
+from app.models.interview import InterviewQuestionBank
+from app.models.job import JobPosting
+from app.services.audio import AUDIO_DIR
+from app.services.llm import ask_gemini
+from app.services.tts_jobs import render_cached_audio
+
+# ------------------------
+# Config
+# ------------------------
+QUESTION_BANK_OPENINGS = int(os.getenv("QUESTION_BANK_OPENINGS", 3))      # greetings, each with pre-rendered audio
+QUESTION_BANK_FOLLOW_UPS = int(os.getenv("QUESTION_BANK_FOLLOW_UPS", 10))  # suggested to the reply prompt
+QUESTION_BANK_AUDIO = os.getenv("QUESTION_BANK_AUDIO", "1") == "1"        # pre-render opening TTS
+QUESTION_BANK_PROMPT_FOLLOW_UPS = 5
+
+# job_id -> running build task (at most one per job)
+_build_tasks: Dict[int, asyncio.Task] = {}
+
+
+def job_digest(job: JobPosting) -> str:
+    """Fingerprint of the job fields the questions are written from."""
+    fields = [
+        job.job_title, job.role, job.company, job.experience,
+        job.job_description, job.responsibilities, job.skills,
+    ]
+    return hashlib.sha256(json.dumps(fields, default=str).encode("utf-8")).hexdigest()
+
+
+def fresh_bank(db: Session, job_id: int | None) -> InterviewQuestionBank | None:
+    """The job's bank, or None if there is none or the job changed since it was built."""
+    if job_id is None:
+        return None
+    bank = db.get(InterviewQuestionBank, job_id)
+    if bank is None or not bank.openings:
+        return None
+    job = db.get(JobPosting, job_id)
+    if job is None or bank.job_digest != job_digest(job):
+        return None
+    return bank
+
+
+def _audio_ready(opening: Dict[str, Any]) -> bool:
+    url = opening.get("tts_url")
+    return bool(url) and (AUDIO_DIR / os.path.basename(url)).exists()
+
+
+def pick_opening(bank: InterviewQuestionBank) -> str:
+    """
+    A random opening, preferring ones whose audio is still on disk. Audio the
+    media GC or the TTS cache removed is re-rendered when the greeting is
+    queued for TTS, under the same cache URL.
+    """
+    ready = [o for o in bank.openings if _audio_ready(o)]
+    return random.choice(ready or bank.openings)["text"]
+
+
+def follow_up_hints(bank: InterviewQuestionBank | None) -> List[str]:
+    if bank is None or not bank.follow_ups:
+        return []
+    return random.sample(bank.follow_ups, min(QUESTION_BANK_PROMPT_FOLLOW_UPS, len(bank.follow_ups)))
+
+
+def _bank_prompt(job: JobPosting) -> str:
+    return f"""
+You are preparing a mock interview for this job posting:
+
+- Job: {job.job_title} ({job.role}) at {job.company}
+- Experience: {job.experience}
+- Skills: {(job.skills or [])[:15]}
+- Responsibilities: {(job.responsibilities or "")[:800]}
+- Description: {(job.job_description or "")[:800]}
+
+Return ONLY a JSON object with two keys:
+- "openings": {QUESTION_BANK_OPENINGS} different short, friendly greetings, each ending with
+  the first interview question. Do not use the candidate's name.
+- "follow_ups": {QUESTION_BANK_FOLLOW_UPS} follow-up interview questions specific to this job.
+"""
+
+
+def _parse_bank(text: str) -> tuple[List[str], List[str]]:
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        text = text[text.find("{"):]
+    data = json.loads(text[: text.rfind("}") + 1])
+    openings = [q.strip() for q in data.get("openings", []) if isinstance(q, str) and q.strip()]
+    follow_ups = [q.strip() for q in data.get("follow_ups", []) if isinstance(q, str) and q.strip()]
+    return openings[:QUESTION_BANK_OPENINGS], follow_ups[:QUESTION_BANK_FOLLOW_UPS]
+
+
+async def build_bank(job_id: int, with_audio: bool = QUESTION_BANK_AUDIO) -> bool:
+    """
+    Generate (or regenerate) the job's question bank and pre-render the
+    openings into the TTS cache, so start_session's greeting audio is a
+    cache hit. Returns False if the job is gone or Gemini's answer is unusable.
+    """
+    async with AsyncSessionLocal() as db:
+        job = await db.get(JobPosting, job_id)
+        if job is None:
+            return False
+        prompt, digest = _bank_prompt(job), job_digest(job)
+
+    try:
+        openings, follow_ups = _parse_bank(await ask_gemini(prompt, user_key=f"bank:{job_id}"))
+    except ValueError as e:  # includes JSONDecodeError
+        print(f"[QuestionBank] Unusable bank for job {job_id}: {e}")
+        return False
+    if not openings:
+        print(f"[QuestionBank] No openings generated for job {job_id}")
+        return False
+
+    rendered: List[Dict[str, Any]] = []
+    for text in openings:
+        url = None
+        if with_audio:
+            try:
+                url = await asyncio.to_thread(render_cached_audio, text)
+            except Exception as e:
+                print(f"[QuestionBank] Audio failed for job {job_id}: {e}")
+        rendered.append({"text": text, "tts_url": url})
+
+    async with AsyncSessionLocal() as db:
+        bank = await db.get(InterviewQuestionBank, job_id)
+        if bank is None:
+            bank = InterviewQuestionBank(job_id=job_id)
+            db.add(bank)
+        bank.job_digest = digest
+        bank.openings = rendered
+        bank.follow_ups = follow_ups
+        await db.commit()
+
+    print(f"[QuestionBank] Built bank for job {job_id}: {len(rendered)} openings, {len(follow_ups)} follow-ups")
+    return True
+
+
+async def _build_safely(job_id: int) -> None:
+    try:
+        await build_bank(job_id)
+    except Exception as e:
+        print(f"[QuestionBank] Error building bank for job {job_id}: {e}")
+
+
+def schedule_bank_build(job_id: int) -> None:
+    """Build the job's bank in the background unless a build is already running."""
+    running = _build_tasks.get(job_id)
+    if running is not None and not running.done():
+        return
+    task = asyncio.create_task(_build_safely(job_id))
+    _build_tasks[job_id] = task
+    task.add_done_callback(lambda t: _build_tasks.pop(job_id, None) if _build_tasks.get(job_id) is t else None)
+
+
+async def refresh_bank(job_id: int) -> None:
+    """After a job edit: rebuild its bank if it has one that is now stale."""
+    async with AsyncSessionLocal() as db:
+        exists = await db.get(InterviewQuestionBank, job_id) is not None
+        stale = exists and await db.run_sync(fresh_bank, job_id) is None
+    if stale:
+        await _build_safely(job_id)
+
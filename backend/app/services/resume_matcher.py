@@ -4,26 +4,28 @@ import json
 import re
 import os
 import numpy as np
-from sentence_transformers import SentenceTransformer, util
 from sqlalchemy.orm import Session
 from keybert import KeyBERT
-from app.db.database import SessionLocal
+from app.db.database import ReadSessionLocal
 from app.models.job import JobPosting
 from dotenv import load_dotenv
-import google.generativeai as genai
 import ollama
 from app.services.extract_skills import extract_skills
+from app.services.documents import extract_pdf_text, extract_document_text
+from app.services.llm import gemini
+from app.services.embeddings import get_embedding_model, encode_text, as_keybert_backend
 from wordcloud import WordCloud
 
 # Load environment variables
 load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+
+RESUME_LLM_MODEL = "gemini-2.0-flash"
 
 CODE_FENCE_PATTERN = re.compile(r"^```[a-zA-Z0-9_+\-]*\s*|\s*```$", re.MULTILINE)
 
 # Models
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
-kw_model = KeyBERT(embedding_model)
+embedding_model = get_embedding_model()  # torch or ONNX, see EMBEDDING_BACKEND
+kw_model = KeyBERT(as_keybert_backend(embedding_model))
 
 def strip_code_fences(text: str) -> str:
     """
@@ -50,12 +52,8 @@ def strip_code_fences(text: str) -> str:
     return text.strip()
 
 def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
-    import fitz
-    text = ""
-    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-        for page in doc:
-            text += page.get_text()
-    return text.strip()
+    # Budgeted, cached extraction lives in app/services/documents.py
+    return extract_pdf_text(pdf_bytes)
 
 def extract_resume_profile(text: str) -> dict:
     prompt = f"""
@@ -82,9 +80,7 @@ Resume:
 {text}
 """
     try:
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        response = model.generate_content(prompt)
-        content = strip_code_fences(response.text or "")
+        content = strip_code_fences(gemini.generate_sync(prompt, model=RESUME_LLM_MODEL))
         return json.loads(content)
     except Exception as e:
         print(f"❌ Resume profile extraction failed: {e}")
@@ -108,10 +104,9 @@ Rules:
 Resume:
 {text}
 """
+    raw = ""
     try:
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        response = model.generate_content(prompt)
-        raw = (response.text or "").strip()
+        raw = gemini.generate_sync(prompt, model=RESUME_LLM_MODEL).strip()
 
         # 1) Strip any code fences if Gemini ignored instructions
         cleaned = strip_code_fences(raw)
@@ -169,7 +164,7 @@ Resume:
 
     except Exception as e:
         print("❌ Gemini skill extraction failed:", e)
-        print("Raw Gemini output was:\n", response.text if 'response' in locals() else "No response")
+        print("Raw Gemini output was:\n", raw or "No response")
         return []
 
 def extract_keywords_for_wordcloud(text: str, top_n: int = 25):
@@ -215,25 +210,25 @@ Return up to 15 best matches as valid JSON list. Use this format:
 Return ONLY the JSON array. No explanation or markdown.
 """
     try:
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        response = model.generate_content(prompt)
-        content = strip_code_fences(response.text or "")
+        content = strip_code_fences(gemini.generate_sync(prompt, model=RESUME_LLM_MODEL))
         return json.loads(content)
     except Exception as e:
         print("❌ Gemini rerank failed:", e)
         return []
 
 def get_top_job_matches(resume_skills: list[str], resume_profile: dict, top_n: int = 10):
-    db: Session = SessionLocal()
+    db: Session = ReadSessionLocal()
     jobs = db.query(JobPosting).filter(JobPosting.embedding != None).yield_per(100)
 
-    resume_embedding = embedding_model.encode(", ".join(resume_skills), device="cpu", convert_to_tensor=True)
+    resume_embedding = encode_text(", ".join(resume_skills))
+    resume_norm = np.linalg.norm(resume_embedding) or 1.0
     scored_jobs = []
 
     for job in jobs:
         try:
             job_embedding = np.array(job.embedding, dtype=np.float32)
-            score = util.cos_sim(resume_embedding, job_embedding).item()
+            job_norm = np.linalg.norm(job_embedding) or 1.0
+            score = float(np.dot(resume_embedding, job_embedding) / (resume_norm * job_norm))
             if score > 0.3:
                 scored_jobs.append((score, job))
         except Exception as e:
@@ -300,7 +295,7 @@ def parse_salary(text):
         return None
 
 def get_salary_progression_trend(job_title: str):
-    db = SessionLocal()
+    db = ReadSessionLocal()
     jobs = db.query(JobPosting).filter(JobPosting.job_title == job_title).all()
     trends = {}
 
@@ -330,7 +325,7 @@ def get_salary_progression_trend(job_title: str):
     return {k: sum(v)/len(v) for k, v in trends.items()}
 
 def get_salary_location_trend(job_title: str):
-    db = SessionLocal()
+    db = ReadSessionLocal()
     jobs = db.query(JobPosting).filter(JobPosting.job_title == job_title).all()
     trends = {}
 
@@ -387,9 +382,9 @@ def show_skills_wordcloud(skill_freq):
     ).generate_from_frequencies(skill_freq)
     wordcloud.to_file("wordcloud.png")
 
-def process_resume_and_match_jobs(pdf_bytes: bytes) -> dict:
+def process_resume_and_match_jobs(resume_bytes: bytes, filename: str = "resume.pdf") -> dict:
     try:
-        resume_text = extract_text_from_pdf_bytes(pdf_bytes)
+        resume_text = extract_document_text(resume_bytes, filename)
         resume_skills = extract_skills_with_gemini(resume_text)
         resume_profile = extract_resume_profile(resume_text)
         matches = get_top_job_matches(resume_skills, resume_profile)
@@ -0,0 +1,149 @@
+# app/services/sentiment_stats.py
+from typing import Any, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.models.interview import InterviewMessage, InterviewSession
+
+# Running aggregates kept in InterviewSession.sentiment_stats (JSON):
+#   messages_by_role      {"user": n, "assistant": n}
+#   counts_by_label       {"POSITIVE": n, ...}   user messages with sentiment
+#   score_sums_by_label   {"POSITIVE": sum(sentiment_score), ...}
+#   emotion_sums          {"joy": sum(score), ...}
+#   scored_messages       n
+#
+# Every writer goes through unit_of_work.commit_unit, which applies units one
+# at a time (event loop in direct mode, one buffer thread in write-behind mode),
+# so read-modify-write on the JSON column cannot interleave.
+
+
+def empty_stats() -> Dict[str, Any]:
+    return {
+        "messages_by_role": {},
+        "counts_by_label": {},
+        "score_sums_by_label": {},
+        "emotion_sums": {},
+        "scored_messages": 0,
+    }
+
+
+def _copy(stats: Dict[str, Any] | None) -> Dict[str, Any]:
+    # JSON columns only notice reassignment, so always build a new dict
+    base = empty_stats()
+    for key, value in (stats or {}).items():
+        base[key] = dict(value) if isinstance(value, dict) else value
+    return base
+
+
+def _bump(bucket: Dict[str, float], key: str, delta: float) -> None:
+    value = bucket.get(key, 0) + delta
+    if abs(value) < 1e-9:
+        bucket.pop(key, None)
+    else:
+        bucket[key] = value
+
+
+def _apply_sentiment(stats: Dict[str, Any], sentiment: Dict[str, Any] | None, sign: int) -> None:
+    if not sentiment:
+        return
+    label = sentiment.get("sentiment_label")
+    if not label:
+        return
+    try:
+        score = float(sentiment.get("sentiment_score", 0.0))
+    except (TypeError, ValueError):
+        return
+
+    stats["scored_messages"] += sign
+    _bump(stats["counts_by_label"], label, sign)
+    _bump(stats["score_sums_by_label"], label, sign * score)
+    for emotion in sentiment.get("emotions") or []:
+        if isinstance(emotion, dict) and "label" in emotion and "score" in emotion:
+            _bump(stats["emotion_sums"], emotion["label"], sign * float(emotion["score"]))
+
+
+def ensure_stats(db: Session, session: InterviewSession) -> None:
+    """Sessions created before aggregates existed get them rebuilt on first write."""
+    if session.sentiment_stats is None:
+        session.sentiment_stats = rebuild_stats(db, session.session_id)
+
+
+def verify_stats(db: Session, session_id: str) -> tuple[bool, Dict[str, Any]]:
+    """
+    Consistency check: compare the stored aggregates with a rebuild.
+
+    Returns (was_consistent, rebuilt). The caller decides whether to write
+    `rebuilt` back (see interview_service.repair_sentiment_stats).
+    """
+    session = db.query(InterviewSession).filter_by(session_id=session_id).first()
+    rebuilt = rebuild_stats(db, session_id)
+    return stats_match(session.sentiment_stats if session else None, rebuilt), rebuilt
+
+
+def record_messages(session: InterviewSession, messages: List[InterviewMessage]) -> None:
+    """Count newly added messages (and any sentiment they already carry)."""
+    stats = _copy(session.sentiment_stats)
+    for m in messages:
+        _bump(stats["messages_by_role"], m.role, 1)
+        if m.role == "user":
+            _apply_sentiment(stats, m.sentiment, +1)
+    session.sentiment_stats = stats
+
+
+def record_sentiment(session: InterviewSession, msg: InterviewMessage, sentiment: Dict[str, Any]) -> None:
+    """Set msg.sentiment and move the aggregates from its old value to the new one."""
+    stats = _copy(session.sentiment_stats)
+    if msg.role == "user":
+        _apply_sentiment(stats, msg.sentiment, -1)
+        _apply_sentiment(stats, sentiment, +1)
+    msg.sentiment = sentiment
+    session.sentiment_stats = stats
+
+
+def rebuild_stats(db: Session, session_id: str) -> Dict[str, Any]:
+    """Recompute the aggregates from the transcript (source of truth)."""
+    stats = empty_stats()
+    rows = (
+        db.query(InterviewMessage.role, InterviewMessage.sentiment)
+        .filter(InterviewMessage.session_id == session_id)
+        .all()
+    )
+    for role, sentiment in rows:
+        _bump(stats["messages_by_role"], role, 1)
+        if role == "user":
+            _apply_sentiment(stats, sentiment, +1)
+    return stats
+
+
+def stats_match(a: Dict[str, Any] | None, b: Dict[str, Any] | None) -> bool:
+    a, b = _copy(a), _copy(b)
+    if a["scored_messages"] != b["scored_messages"]:
+        return False
+    for key in ("messages_by_role", "counts_by_label", "score_sums_by_label", "emotion_sums"):
+        if set(a[key]) != set(b[key]):
+            return False
+        if any(abs(a[key][k] - b[key][k]) > 1e-6 for k in a[key]):
+            return False
+    return True
+
+
+def summary_from_stats(stats: Dict[str, Any] | None) -> Dict[str, Any]:
+    """sentiment_summary payload (see schemas.interview.SentimentSummary) in O(labels)."""
+    stats = _copy(stats)
+    by_role = stats["messages_by_role"]
+    counts = stats["counts_by_label"]
+    scored = stats["scored_messages"]
+    return {
+        "total_messages": int(sum(by_role.values())),
+        "user_messages": int(by_role.get("user", 0)),
+        "assistant_messages": int(by_role.get("assistant", 0)),
+        "counts_by_label": {label: int(n) for label, n in counts.items()},
+        "avg_sentiment_score_by_label": {
+            label: stats["score_sums_by_label"].get(label, 0.0) / n
+            for label, n in counts.items()
+            if n
+        },
+        "avg_emotion_scores": {
+            label: total / scored for label, total in stats["emotion_sums"].items()
+        } if scored else {},
+    }
@@ -0,0 +1,134 @@
+# app/services/streaming_asr.py
+import os
+
+import numpy as np
+
+from app.services.audio import (
+    MAX_AUDIO_SECONDS,
+    WHISPER_SAMPLE_RATE,
+    transcribe_pcm,
+    transcribe_segments,
+)
+from app.services.inference import INTERACTIVE, asr_pool
+
+# ------------------------
+# Config
+# ------------------------
+STREAM_PARTIAL_EVERY_MS = int(os.getenv("STREAM_PARTIAL_EVERY_MS", 1000))  # new audio between partials
+STREAM_WINDOW_SECONDS = float(os.getenv("STREAM_WINDOW_SECONDS", 12))     # longest window re-decoded per partial
+STREAM_EOU_SILENCE_MS = int(os.getenv("STREAM_EOU_SILENCE_MS", 800))      # trailing silence that ends a turn
+STREAM_SPEECH_RMS = float(os.getenv("STREAM_SPEECH_RMS", 0.01))           # frame RMS (float PCM) counted as speech
+ENERGY_FRAME_MS = 30
+
+
+def pcm16_to_float(data: bytes, sample_rate: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """Little-endian int16 mono -> 16 kHz float32 (linear resampling if needed)."""
+    samples = np.frombuffer(data[: len(data) - len(data) % 2], dtype="<i2").astype(np.float32) / 32768.0
+    if sample_rate != WHISPER_SAMPLE_RATE and len(samples):
+        n_out = int(round(len(samples) * WHISPER_SAMPLE_RATE / sample_rate))
+        samples = np.interp(
+            np.linspace(0, len(samples) - 1, n_out), np.arange(len(samples)), samples
+        ).astype(np.float32)
+    return samples
+
+
+class StreamingTranscriber:
+    """
+    Incremental Whisper over one live utterance.
+
+    Audio is kept as a list of chunks, so a frame costs only its own size.
+    Every STREAM_PARTIAL_EVERY_MS of new
+    audio, partial() re-decodes the uncommitted window in the ASR worker.
+    Once the window passes STREAM_WINDOW_SECONDS, every segment but the last
+    is committed and the window slides past it, dropping the committed audio,
+    so each pass costs at most one window no matter how long the candidate talks.
+
+    End of utterance is plain energy detection: speech followed by
+    STREAM_EOU_SILENCE_MS of quiet, or MAX_AUDIO_SECONDS of audio.
+    """
+
+    def __init__(self, sample_rate: int = WHISPER_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self._frame = WHISPER_SAMPLE_RATE * ENERGY_FRAME_MS // 1000
+        self.reset()
+
+    def reset(self) -> None:
+        # Positions are in samples since the start of the utterance
+        self._chunks: list[np.ndarray] = []
+        self._base = 0                  # position of the first kept sample
+        self._length = 0                # samples received
+        self._offset = 0                # start of the uncommitted window
+        self._committed: list[str] = []
+        self._last_partial_at = 0       # audio length at the last partial
+        self._unclassified = np.zeros(0, dtype=np.float32)  # tail shorter than an energy frame
+        self._heard_speech = False
+        self._silence = 0               # trailing silence (samples)
+
+    # ---------- audio in ----------
+    def feed(self, data: bytes) -> None:
+        samples = pcm16_to_float(data, self.sample_rate)
+        if not len(samples):
+            return
+        self._chunks.append(samples)
+        self._length += len(samples)
+
+        pending = np.concatenate([self._unclassified, samples]) if len(self._unclassified) else samples
+        whole = len(pending) - len(pending) % self._frame
+        frames = pending[:whole].reshape(-1, self._frame)
+        for rms in np.sqrt(np.mean(frames * frames, axis=1)):
+            if rms >= STREAM_SPEECH_RMS:
+                self._heard_speech = True
+                self._silence = 0
+            else:
+                self._silence += self._frame
+        self._unclassified = pending[whole:]
+
+    def _window(self) -> np.ndarray:
+        """The uncommitted audio as one array; committed audio before it is dropped."""
+        if not self._chunks:
+            return np.zeros(0, dtype=np.float32)
+        audio = self._chunks[0] if len(self._chunks) == 1 else np.concatenate(self._chunks)
+        window = audio[self._offset - self._base:]
+        # Never written in place, so the caller's view stays stable while feed() appends
+        self._chunks, self._base = [window], self._offset
+        return window
+
+    @property
+    def seconds(self) -> float:
+        return self._length / WHISPER_SAMPLE_RATE
+
+    def partial_due(self) -> bool:
+        new = self._length - self._last_partial_at
+        return self._heard_speech and new * 1000 >= STREAM_PARTIAL_EVERY_MS * WHISPER_SAMPLE_RATE
+
+    def end_of_utterance(self) -> bool:
+        if self.seconds >= MAX_AUDIO_SECONDS:
+            return True
+        return self._heard_speech and self._silence * 1000 >= STREAM_EOU_SILENCE_MS * WHISPER_SAMPLE_RATE
+
+    # ---------- transcripts out ----------
+    async def partial(self) -> str:
+        """Best current transcript of the utterance so far (committed + tentative tail)."""
+        self._last_partial_at = self._length
+        offset = self._offset
+        window = self._window()
+
+        # Greedy, no VAD: partials are throwaway and must keep up with speech
+        segments = await asr_pool.run(transcribe_segments, window, 1, False, priority=INTERACTIVE)
+
+        if len(window) > STREAM_WINDOW_SECONDS * WHISPER_SAMPLE_RATE and len(segments) > 1:
+            # Older segments are stable now; commit them and slide the window
+            self._committed.extend(text for _, _, text in segments[:-1] if text)
+            self._offset = offset + int(segments[-2][1] * WHISPER_SAMPLE_RATE)
+            segments = segments[-1:]
+
+        return " ".join(self._committed + [text for _, _, text in segments if text])
+
+    async def finish(self) -> str:
+        """Final transcript of the utterance; resets for the next one."""
+        # Reset before decoding, so audio fed meanwhile starts the next utterance
+        window, committed = self._window(), self._committed
+        self.reset()
+        tail = await asr_pool.run(transcribe_pcm, window, priority=INTERACTIVE) if len(window) else ""
+        text = " ".join(committed + ([tail] if tail else []))
+        return text.strip()
@@ -0,0 +1,139 @@
+# app/services/tts_cache.py
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# ------------------------
+# Config
+# ------------------------
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", 1024 * 1024 * 1024))  # 1 GB
+CACHE_PREFIX = "tts_"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different replies share one clip."""
+    return _WHITESPACE.sub(" ", text or "").strip()
+
+
+def cache_key(model: str, voice: str, text: str) -> str:
+    payload = "\x1f".join((model, voice, normalize_text(text)))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    One audio file per unique (model, voice, normalized text).
+
+    Files live flat in the audio directory as `tts_<sha256>.<ext>`, so the
+    existing /media mount serves them. An in-memory LRU index (rebuilt from
+    file mtimes on startup) bounds the total size; hits bump recency.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = TTS_CACHE_MAX_BYTES, ext: str = "wav"):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ext = ext
+
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # key -> bytes, oldest first
+        self._total = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load_index()
+
+    # ---------- paths ----------
+    def filename(self, key: str) -> str:
+        return f"{CACHE_PREFIX}{key}.{self.ext}"
+
+    def path(self, key: str) -> Path:
+        return self.directory / self.filename(key)
+
+    def url(self, key: str) -> str:
+        return f"/media/audio/{self.filename(key)}"
+
+    # ---------- index ----------
+    def _load_index(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for f in self.directory.glob(f"{CACHE_PREFIX}*.{self.ext}"):
+            try:
+                st = f.stat()
+            except FileNotFoundError:
+                continue
+            key = f.name[len(CACHE_PREFIX):-(len(self.ext) + 1)]
+            entries.append((st.st_mtime, key, st.st_size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total += size
+
+    def lookup(self, key: str) -> str | None:
+        """Return the URL on a hit (and mark it recently used), else None."""
+        with self._lock:
+            known = key in self._index
+        path = self.path(key)
+
+        if known and path.exists():
+            with self._lock:
+                self.hits += 1
+                self._index.move_to_end(key)
+            try:
+                os.utime(path)  # persist recency across restarts
+            except OSError:
+                pass
+            return self.url(key)
+
+        with self._lock:
+            self.misses += 1
+            if known:  # deleted behind our back
+                self._total -= self._index.pop(key, 0)
+        return None
+
+    def store(self, key: str) -> None:
+        """Register a freshly rendered file and evict LRU entries over budget."""
+        try:
+            size = self.path(key).stat().st_size
+        except FileNotFoundError:
+            return
+
+        evicted = []
+        with self._lock:
+            self._total -= self._index.pop(key, 0)
+            self._index[key] = size
+            self._total += size
+            while self._total > self.max_bytes and len(self._index) > 1:
+                old_key, old_size = self._index.popitem(last=False)
+                self._total -= old_size
+                self.evictions += 1
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            try:
+                self.path(old_key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            self._total -= self._index.pop(key, 0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,286 @@
+# app/services/tts_jobs.py
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+
+from app.db.database import SessionLocal
+from app.models.interview import InterviewMessage
+from app.services.audio import (
+    AUDIO_DIR,
+    TTS_MODEL_NAME,
+    TTS_VOICE,
+    audio_output_ext,
+    render_audio,
+    split_sentences,
+    streaming_wav_header,
+    synthesize_pcm,
+    tts_sample_rate,
+)
+from app.services.inference import BULK, INTERACTIVE, tts_pool
+from app.services.tts_cache import TTSCache, cache_key
+
+# ------------------------
+# Config
+# ------------------------
+# Threads that orchestrate background renders; synthesis itself runs in the TTS
+# worker process(es), one sentence per request (see app/services/inference.py)
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", 1))
+TTS_MAX_PENDING = int(os.getenv("TTS_MAX_PENDING", 32))
+TTS_STATUS_HISTORY = 2048  # finished jobs remembered for status lookups
+
+AUDIO_PENDING = "pending"
+AUDIO_READY = "ready"
+AUDIO_FAILED = "failed"
+
+_executor = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+_slots = threading.BoundedSemaphore(TTS_MAX_PENDING)
+
+# message_id -> Future resolving to the final URL (or raising)
+_jobs: "OrderedDict[int, Future]" = OrderedDict()
+_jobs_lock = threading.Lock()
+
+# cache key -> (render Future, message ids waiting on it, its sentences); identical replies render once
+_inflight: dict[str, tuple[Future, list[int], "_SharedRender"]] = {}
+
+tts_cache = TTSCache(AUDIO_DIR, ext=audio_output_ext())
+
+
+def _clear_tts_url(message_ids: list[int]) -> None:
+    db = SessionLocal()
+    try:
+        for msg in db.query(InterviewMessage).filter(InterviewMessage.id.in_(message_ids)):
+            msg.tts_url = None
+        db.commit()
+    finally:
+        db.close()
+
+
+_sample_rate: int | None = None
+
+
+def _tts_sample_rate() -> int:
+    # Asked once from a worker so the API process never loads the model
+    global _sample_rate
+    if _sample_rate is None:
+        _sample_rate = tts_pool.call(tts_sample_rate, priority=INTERACTIVE)
+    return _sample_rate
+
+
+class _SharedRender:
+    """
+    One reply's sentences, each synthesized once and shared by the background
+    render and any live stream of the same text. Whoever needs a sentence
+    first submits it; a stream asking at INTERACTIVE priority takes over a
+    sentence still queued at BULK.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.sentences = split_sentences(text)
+        self._pcm: list[Future | None] = [None] * len(self.sentences)
+        self._priority = [BULK] * len(self.sentences)
+        self._lock = threading.Lock()
+
+    def sentence(self, index: int, priority: int) -> Future:
+        """Future of the index-th sentence's PCM. May be cancelled by another user; ask again then."""
+        with self._lock:
+            future = self._pcm[index]
+            if future is not None and priority < self._priority[index] and future.cancel():
+                future = None  # still queued at a lower priority: resubmit ahead of it
+            if future is None or future.cancelled():
+                future = tts_pool.submit(synthesize_pcm, self.sentences[index], priority=priority)
+                self._pcm[index], self._priority[index] = future, priority
+            return future
+
+    def synthesizer(self):
+        """synthesize callback for render_audio: the sentences in order, at BULK priority."""
+        position = iter(range(len(self.sentences)))
+
+        def synthesize(_sentence: str) -> bytes:
+            index = next(position)
+            while True:
+                try:
+                    return self.sentence(index, BULK).result()
+                except CancelledError:
+                    continue  # moved up for a stream, or dropped by one that disconnected
+        return synthesize
+
+
+def _synthesize_bulk(sentence: str) -> bytes:
+    # Background renders queue sentence by sentence at low priority, so a live
+    # stream's next sentence overtakes them at every sentence boundary
+    return tts_pool.call(synthesize_pcm, sentence, priority=BULK)
+
+
+def _run_job(key: str, shared: _SharedRender) -> str:
+    try:
+        path = tts_cache.path(key)
+        print(f"[TTS] Synthesizing audio to: {path}")
+        render_audio(shared.text, path, synthesize=shared.synthesizer(), sample_rate=_tts_sample_rate())
+        tts_cache.store(key)
+        with _jobs_lock:
+            _inflight.pop(key, None)
+        return tts_cache.url(key)
+    except Exception as e:
+        with _jobs_lock:
+            # Popped with the snapshot, so no message can attach to the failed job after it
+            waiting = list(_inflight.pop(key, (None, [], None))[1])
+        print(f"[TTS] Error generating audio for messages {waiting}: {e}")
+        _clear_tts_url(waiting)
+        raise
+    finally:
+        _slots.release()
+
+
+def _track(message_id: int, future: Future) -> None:
+    # Caller holds _jobs_lock
+    _jobs[message_id] = future
+    while len(_jobs) > TTS_STATUS_HISTORY:
+        oldest_id, oldest = next(iter(_jobs.items()))
+        if not oldest.done():
+            break
+        _jobs.pop(oldest_id)
+
+
+def reply_audio_url(text: str | None) -> str | None:
+    """URL a reply's audio is (or will be) served from; deterministic, so it can be committed before queueing."""
+    if not text or not text.strip():
+        return None
+    return tts_cache.url(cache_key(TTS_MODEL_NAME, TTS_VOICE, text))
+
+
+def enqueue_reply_audio(session_id: str, message_id: int, text: str) -> str | None:
+    """
+    Queue TTS for an already-committed assistant message.
+
+    Returns the URL the audio will be served from once ready, or None when the
+    text is empty or the queue is full (the reply is then text-only). Replies
+    already in the cache return their URL immediately with no synthesis.
+    """
+    if not text or not text.strip():
+        return None
+
+    key = cache_key(TTS_MODEL_NAME, TTS_VOICE, text)
+    url = tts_cache.lookup(key)
+    if url:
+        done: Future = Future()
+        done.set_result(url)
+        with _jobs_lock:
+            _track(message_id, done)
+        return url
+
+    with _jobs_lock:
+        inflight = _inflight.get(key)
+        if inflight is not None:
+            # Same utterance is already rendering for another message
+            inflight[1].append(message_id)
+            _track(message_id, inflight[0])
+            return tts_cache.url(key)
+
+        if not _slots.acquire(blocking=False):
+            print(f"[TTS] Queue full ({TTS_MAX_PENDING} pending); skipping audio for message {message_id}")
+            return None
+
+        shared = _SharedRender(text)
+        future = _executor.submit(_run_job, key, shared)
+        _inflight[key] = (future, [message_id], shared)
+        _track(message_id, future)
+
+    return tts_cache.url(key)
+
+
+def render_cached_audio(text: str) -> str | None:
+    """
+    Blocking: render `text` into the TTS cache unless it is already there and
+    return its URL. For pre-rendering (question banks) off the event loop.
+    """
+    if not text or not text.strip():
+        return None
+
+    key = cache_key(TTS_MODEL_NAME, TTS_VOICE, text)
+    url = tts_cache.lookup(key)
+    if url:
+        return url
+
+    render_audio(text, tts_cache.path(key), synthesize=_synthesize_bulk, sample_rate=_tts_sample_rate())
+    tts_cache.store(key)
+    return tts_cache.url(key)
+
+
+def get_audio_status(message_id: int, tts_url: str | None) -> str:
+    """pending / ready / failed for an assistant message's audio."""
+    with _jobs_lock:
+        future = _jobs.get(message_id)
+
+    if future is not None:
+        if not future.done():
+            return AUDIO_PENDING
+        if future.exception():
+            return AUDIO_FAILED
+
+    # Finished, or not tracked by this process (older message or restart):
+    # trust the disk, since retention or cache eviction may have removed the file
+    if tts_url and (AUDIO_DIR / os.path.basename(tts_url)).exists():
+        return AUDIO_READY
+    return AUDIO_FAILED
+
+
+async def wait_for_audio(message_id: int, tts_url: str | None, timeout: float) -> str:
+    """Long-poll helper: wait up to `timeout` seconds for the audio to finish."""
+    with _jobs_lock:
+        future = _jobs.get(message_id)
+
+    if future is not None and not future.done() and timeout > 0:
+        try:
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            pass
+        except Exception:
+            pass  # reported as failed below
+
+    return get_audio_status(message_id, tts_url)
+
+
+async def _streamed_sentence(shared: _SharedRender, index: int) -> bytes:
+    while True:
+        future = shared.sentence(index, INTERACTIVE)
+        # wait() rather than awaiting the future: another stream may cancel it
+        await asyncio.wait([asyncio.wrap_future(future)])
+        if not future.cancelled():
+            return future.result()
+
+
+async def stream_reply_audio(text: str):
+    """
+    Yield a WAV stream for `text`, one sentence at a time.
+
+    The next sentence is rendered while the current one is being sent, so
+    playback can start after the first sentence instead of the whole reply.
+    While the reply's background render runs, both share its sentences, so
+    the text is synthesized once.
+    """
+    with _jobs_lock:
+        inflight = _inflight.get(cache_key(TTS_MODEL_NAME, TTS_VOICE, text))
+    shared = inflight[2] if inflight is not None else _SharedRender(text)
+
+    yield streaming_wav_header(await asyncio.to_thread(_tts_sample_rate))
+    if not shared.sentences:
+        return
+
+    pending = None
+    try:
+        pending = shared.sentence(0, INTERACTIVE)
+        for idx in range(len(shared.sentences)):
+            pcm = await _streamed_sentence(shared, idx)
+            if idx + 1 < len(shared.sentences):
+                pending = shared.sentence(idx + 1, INTERACTIVE)
+            yield pcm
+    except Exception as e:
+        print(f"[TTS] Streaming synthesis failed: {e}")
+    finally:
+        # Client gone: don't let its next sentence jump ahead of BULK work. The
+        # background render (if any) resubmits it at BULK when it gets there.
+        if pending is not None:
+            pending.cancel()
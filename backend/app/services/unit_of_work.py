@@ -0,0 +1,151 @@
+# app/services/unit_of_work.py
+import asyncio
+import os
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db.database import AsyncWriteSessionLocal, WriteSessionLocal
+from app.services.batching import MicroBatcher
+
+# ------------------------
+# Config
+# ------------------------
+INTERVIEW_WRITE_BEHIND = os.getenv("INTERVIEW_WRITE_BEHIND", "0") == "1"
+WRITE_BEHIND_INTERVAL_MS = float(os.getenv("WRITE_BEHIND_INTERVAL_MS", 20))  # longest a write waits
+WRITE_BEHIND_MAX_BATCH = int(os.getenv("WRITE_BEHIND_MAX_BATCH", 64))
+
+# A unit stages changes on the session it is given (add / flush / update)
+# and returns whatever the caller needs back; it must not commit.
+Unit = Callable[[Session], Any]
+
+
+def _new_session() -> Session:
+    # Write engine: BEGIN IMMEDIATE, one pooled connection per process.
+    # Loaded attributes stay readable after commit, so callers need no refresh()
+    return WriteSessionLocal(expire_on_commit=False)
+
+
+def _apply_one(unit: Unit) -> Any:
+    db = _new_session()
+    try:
+        result = unit(db)
+        db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def _apply_one_async(unit: Unit) -> Any:
+    # Same as _apply_one on the aiosqlite write engine: the unit runs on the
+    # sync Session behind the AsyncSession, and I/O no longer blocks the loop
+    async with AsyncWriteSessionLocal() as db:
+        try:
+            result = await db.run_sync(unit)
+            await db.commit()
+            return result
+        except Exception:
+            await db.rollback()
+            raise
+
+
+class WriteBehindBuffer:
+    """
+    Group commit for interview writes.
+
+    Units from every session queue on a MicroBatcher; its worker applies all
+    units collected within WRITE_BEHIND_INTERVAL_MS in one DB session and
+    commits once, so concurrent turns share a single SQLite fsync. If the
+    shared commit fails, each unit is retried in its own transaction so one
+    bad write cannot sink the others.
+
+    Read-your-writes: run() resolves only after the unit is committed, and
+    barrier(session_id) waits for anything still buffered for that session,
+    so readers call it before querying.
+    """
+
+    def __init__(self, interval_ms: float = WRITE_BEHIND_INTERVAL_MS, max_batch: int = WRITE_BEHIND_MAX_BATCH):
+        self._batcher: MicroBatcher[Unit, Tuple[bool, Any]] = MicroBatcher(
+            self._apply,
+            max_batch_size=max_batch,
+            max_wait_ms=interval_ms,
+            latency_slo_ms=interval_ms,
+            name="write-behind",
+        )
+        # session_id -> futures not yet committed (touched only from the event loop)
+        self._pending: Dict[str, set[asyncio.Future]] = defaultdict(set)
+        self.fallbacks = 0
+
+    def _apply(self, units: List[Unit]) -> List[Tuple[bool, Any]]:
+        db = _new_session()
+        try:
+            results = [unit(db) for unit in units]
+            db.commit()
+            return [(True, r) for r in results]
+        except Exception as e:
+            db.rollback()
+            print(f"[DB] Group commit of {len(units)} units failed ({e}); retrying one by one")
+            self.fallbacks += 1
+        finally:
+            db.close()
+
+        outcomes = []
+        for unit in units:
+            try:
+                outcomes.append((True, _apply_one(unit)))
+            except Exception as e:
+                outcomes.append((False, e))
+        return outcomes
+
+    async def run(self, session_id: str, unit: Unit) -> Any:
+        future = asyncio.wrap_future(self._batcher.submit(unit))
+        pending = self._pending[session_id]
+        pending.add(future)
+
+        def _done(f: asyncio.Future) -> None:
+            # Tracked until committed, even if the caller stops waiting
+            pending.discard(f)
+            if not pending and self._pending.get(session_id) is pending:
+                self._pending.pop(session_id, None)
+
+        future.add_done_callback(_done)
+        ok, value = await asyncio.shield(future)
+        if not ok:
+            raise value
+        return value
+
+    async def barrier(self, session_id: str) -> None:
+        pending = list(self._pending.get(session_id, ()))
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> dict:
+        stats = self._batcher.stats()
+        stats["fallbacks"] = self.fallbacks
+        return stats
+
+
+write_behind = WriteBehindBuffer() if INTERVIEW_WRITE_BEHIND else None
+
+
+async def commit_unit(session_id: str, unit: Unit) -> Any:
+    """
+    Apply `unit` and commit it exactly once.
+
+    Goes through the write-behind buffer when INTERVIEW_WRITE_BEHIND=1,
+    otherwise commits right away in a short-lived async session. Either way
+    the result is committed by the time this returns.
+    """
+    if write_behind is not None:
+        return await write_behind.run(session_id, unit)
+    return await _apply_one_async(unit)
+
+
+async def wait_for_writes(session_id: str) -> None:
+    """Read-your-writes barrier: returns once no write for this session is buffered."""
+    if write_behind is not None:
+        await write_behind.barrier(session_id)
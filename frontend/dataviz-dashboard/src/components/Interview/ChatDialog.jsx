@@ -27,6 +27,7 @@ import {
   startInterviewSession,
   sendInterviewMessage,
   evaluateInterview,
+  waitForReplyAudio,
 } from "../../utils/interviewApi";
 import EvaluationPanel from "./EvaluationPanel"; 
 import ReactMarkdown from "react-markdown";
@@ -41,16 +42,31 @@ function formatDuration(ms) {
   return `${minutes}:${seconds.toString().padStart(2, "0")}`;
 }
 
+// Helper: which URL the assistant audio player should use.
+// Keeps the stream URL once chosen so playback isn't reloaded when the WAV lands.
+function audioPathFor(m) {
+  if (m.ttsStatus === "failed") return null;
+  if (m.streamUrl) return m.streamUrl;
+  return m.ttsStatus === "pending" ? null : m.ttsUrl;
+}
+
 // Helper: map backend Message -> local shape
 function mapBackendMessage(m) {
   if (!m) return null;
   return {
+    id: m.id ?? null,
     role: m.role || "assistant",
     content: m.content || "",
     modality: m.modality || "text",
     sentiment: m.sentiment || null,
     timestamp: Date.now(),
     ttsUrl: m.tts_url ?? null,
+    ttsStatus: m.tts_status ?? null, // "pending" until the backend finishes the WAV
+    // while the WAV renders, play the sentence-by-sentence stream instead
+    streamUrl:
+      m.tts_status === "pending" && m.id != null
+        ? `/interview/audio/${m.id}/stream`
+        : null,
   };
 }
 
@@ -250,6 +266,39 @@ export default function ChatDialog({
     };
   }, [open, job, jobTitle, resumeSkills, resumeProfile]);
 
+  // long-poll TTS status for assistant replies whose audio is still rendering
+  useEffect(() => {
+    const pendingIds = messages
+      .filter((m) => m.role === "assistant" && m.id != null && m.ttsStatus === "pending")
+      .map((m) => m.id);
+    if (!pendingIds.length) return;
+
+    let cancelled = false;
+    pendingIds.forEach(async (messageId) => {
+      let status = "pending";
+      let ttsUrl = null;
+      while (!cancelled && status === "pending") {
+        try {
+          const res = await waitForReplyAudio({ messageId });
+          status = res.status;
+          ttsUrl = res.tts_url ?? null;
+        } catch {
+          status = "failed";
+        }
+      }
+      if (cancelled) return;
+      setMessages((prev) =>
+        prev.map((m) =>
+          m.id === messageId ? { ...m, ttsStatus: status, ttsUrl } : m
+        )
+      );
+    });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [messages]);
+
   // auto-play assistant TTS audio when a new assistant message arrives
   // auto-play assistant TTS audio when a NEW assistant message arrives
   /*useEffect(() => {
@@ -772,11 +821,11 @@ const lastAutoPlayedIndexRef = useRef(-1);
                           )}
 
                           {/* assistant TTS audio player */}
-                          {m.role === "assistant" && m.ttsUrl && (
+                          {m.role === "assistant" && audioPathFor(m) && (
                             <Box sx={{ mt: 0.5 }}>
                               <audio
                                 controls
-                                src={`${BASE_URL}${m.ttsUrl}`}
+                                src={`${BASE_URL}${audioPathFor(m)}`}
                                 style={{ width: "100%" }}
                                 ref={(el) => {
                                   if (!el) return;
@@ -34,11 +34,15 @@ export async function startInterviewSession(startPayload) {
 /**
  * Send a message in an interview session.
  * Matches /interview/message, multipart/form-data.
- * Returns ChatResponse: { session_id, reply, chat_history }.
+ * Returns ChatResponse: { session_id, reply, chat_history, last_message_id }.
+ * chat_history only holds messages after sinceMessageId (or this turn's).
  */
-export async function sendInterviewMessage({ sessionId, content, file }) {
+export async function sendInterviewMessage({ sessionId, content, file, sinceMessageId }) {
   const formData = new FormData();
   formData.append("session_id", sessionId);
+  if (sinceMessageId !== undefined && sinceMessageId !== null) {
+    formData.append("since_message_id", String(sinceMessageId));
+  }
   if (content !== undefined && content !== null && content !== "") {
     formData.append("text", content);
   }
@@ -54,6 +58,72 @@ export async function sendInterviewMessage({ sessionId, content, file }) {
   return handleJsonResponse(res);
 }
 
+/**
+ * Send a message and receive the reply as it is generated.
+ * Matches POST /interview/message/stream (server-sent events).
+ * onEvent(event, data) is called for "user", "token", "done" and "error".
+ */
+export async function streamInterviewMessage({ sessionId, content, file, onEvent }) {
+  const formData = new FormData();
+  formData.append("session_id", sessionId);
+  if (content !== undefined && content !== null && content !== "") {
+    formData.append("text", content);
+  }
+  if (file) {
+    formData.append("file", file);
+  }
+
+  const res = await fetch(`${BASE_URL}/interview/message/stream`, {
+    method: "POST",
+    headers: { Accept: "text/event-stream" },
+    body: formData,
+  });
+  if (!res.ok) {
+    const text = await res.text();
+    throw new Error(`HTTP ${res.status}: ${text}`);
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let sep;
+    while ((sep = buffer.indexOf("\n\n")) !== -1) {
+      const frame = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+
+      let event = "message";
+      let data = "";
+      for (const line of frame.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      }
+      if (data) onEvent?.(event, JSON.parse(data));
+    }
+  }
+}
+
+/**
+ * Page through a session's stored messages, newest page first.
+ * Matches GET /interview/sessions/{session_id}/messages.
+ * Returns MessagePage: { session_id, messages, has_more, next_before_id }.
+ */
+export async function getInterviewHistory({ sessionId, beforeId, limit = 50 }) {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (beforeId !== undefined && beforeId !== null) {
+    params.set("before_id", String(beforeId));
+  }
+  const res = await fetch(
+    `${BASE_URL}/interview/sessions/${sessionId}/messages?${params}`,
+    { headers: { Accept: "application/json" } }
+  );
+  return handleJsonResponse(res);
+}
+
 export async function evaluateInterview({ sessionId }) {
   const body = new URLSearchParams();
   body.set("session_id", sessionId);
@@ -70,5 +140,18 @@ export async function evaluateInterview({ sessionId }) {
   return handleJsonResponse(res);
 }
 
+/**
+ * Long-poll the TTS status of an assistant message.
+ * Matches GET /interview/audio/{message_id}?wait=<seconds>.
+ * Returns AudioStatusResponse: { message_id, status, tts_url }.
+ */
+export async function waitForReplyAudio({ messageId, wait = 20 }) {
+  const res = await fetch(
+    `${BASE_URL}/interview/audio/${messageId}?wait=${wait}`,
+    { headers: { Accept: "application/json" } }
+  );
+  return handleJsonResponse(res);
+}
+
 // There is NO GET /interview/reply endpoint in the backend,
 // so we don't export getInterviewReply.